@@ -25,10 +25,58 @@ def create_app():
     jwt.init_app(app)
     CORS(app, origins=['https://auxyn-rebranded1234.vercel.app/'])
 
+    # gzip/deflate for large JSON and NDJSON responses
+    from app.utils.compression import compression
+    compression.init_app(app)
+
     # Import models
     from app.models import user, startup, rating, follow
     from app.models import user_preferences, investor_profile, startup_profile
-    from app.models import match, match_insight
+    from app.models import match, match_insight, match_job, match_counter
+
+    # Background match-generation workers
+    from app.services.job_service import match_jobs
+    match_jobs.init_app(app)
+
+    # Scoring algorithms (hot-reloaded from SCORING_CONFIG_PATH)
+    from app.services.scoring_registry import scoring_registry
+    scoring_registry.init_app(app)
+
+    # Pair score cache
+    from app.services.score_cache import score_cache
+    score_cache.init_app(app)
+
+    # Per-user match counter rollups
+    from app.services.match_counters import match_counters
+    match_counters.init_app(app)
+
+    # Startup rating and follower aggregates
+    from app.services.startup_stats import startup_stats
+    startup_stats.init_app(app)
+
+    # Time-decayed trending startups leaderboard
+    from app.services.startup_trending import startup_trending
+    startup_trending.init_app(app)
+
+    # Startup directory paging and cached totals
+    from app.services.startup_directory import startup_directory
+    startup_directory.init_app(app)
+
+    # Per-user dashboard response cache
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+
+    # Batched match view writes
+    from app.services.view_buffer import view_buffer
+    view_buffer.init_app(app)
+
+    # Profile full-text search (FTS5, or an in-memory index without it)
+    from app.services.profile_search import profile_search
+    profile_search.init_app(app)
+
+    # Candidate pruning indexes
+    from app.services.candidate_index import candidate_indexes
+    candidate_indexes.init_app(app)
 
     # Register routes
     from app.routes.auth import auth_bp
@@ -38,6 +86,8 @@ def create_app():
     from app.routes.profile import profile_bp
     from app.routes.matching import matching_bp
     from app.routes.insights import insights_bp
+    from app.routes.metrics import metrics_bp
+    from app.routes.search import search_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(startup_bp, url_prefix='/api/startups')
@@ -46,6 +96,12 @@ def create_app():
     app.register_blueprint(profile_bp, url_prefix='/api/users')
     app.register_blueprint(matching_bp, url_prefix='/api/matches')
     app.register_blueprint(insights_bp, url_prefix='/api/matches')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
 
     # JWT error handlers
     @jwt.expired_token_loader
@@ -0,0 +1,12 @@
+# app/commands/__init__.py
+def register_commands(app):
+    """Attach the project's CLI command groups to the app"""
+    from app.commands.match import match_cli
+    from app.commands.search import search_cli
+    from app.commands.seed import seed_cli
+    from app.commands.startup import startup_cli
+
+    app.cli.add_command(match_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(seed_cli)
+    app.cli.add_command(startup_cli)
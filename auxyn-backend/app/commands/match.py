@@ -0,0 +1,54 @@
+# app/commands/match.py
+import click
+from flask.cli import AppGroup
+from app import db
+from app.services.batch_matching import PlatformMatchRun
+from app.services.match_counters import match_counters
+
+match_cli = AppGroup('match', help='Match generation commands.')
+
+
+@match_cli.command('run-all')
+@click.option('--limit', default=10, show_default=True, help='Matches to generate per user.')
+@click.option('--workers', type=int, default=None, help='Worker processes (defaults to CPU count).')
+@click.option('--partition-size', default=200, show_default=True, help='Users per worker task.')
+@click.option('--batch-size', default=1000, show_default=True, help='Matches written per transaction.')
+@click.option('--force', is_flag=True, help='Ignore each user\'s match_frequency window.')
+@click.option('--dry-run', is_flag=True, help='Score and report throughput without writing matches.')
+def run_all(limit, workers, partition_size, batch_size, force, dry_run):
+    """Generate matches for every user opted into auto matching."""
+    run = PlatformMatchRun(
+        limit=limit,
+        workers=workers,
+        partition_size=partition_size,
+        batch_size=batch_size,
+        force=force,
+        dry_run=dry_run,
+        echo=click.echo
+    )
+    summaries = run.run()
+
+    pairs = sum(s['pairs_scored'] for s in summaries)
+    elapsed = sum(s['elapsed_seconds'] for s in summaries)
+    written = sum(s['matches_written'] for s in summaries)
+    rate = round(pairs / elapsed) if elapsed > 0 else 0
+    click.echo(f"Total: {pairs:,} pairs scored in {elapsed:.2f}s ({rate:,} pairs/s), {written} matches written")
+
+
+@match_cli.command('reconcile-counters')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the counters.')
+@click.option('--show', default=20, show_default=True, help='Drifted values to print.')
+def reconcile_counters(dry_run, show):
+    """Rebuild match_counters from the matches table and report drift."""
+    report = match_counters.reconcile(fix=not dry_run)
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    for item in report['drift'][:show]:
+        click.echo(f"user {item['user_id']} {item['field']}: stored {item['stored']}, expected {item['expected']}")
+    if len(report['drift']) > show:
+        click.echo(f"... {len(report['drift']) - show} more")
+    action = 'checked' if dry_run else 'rebuilt'
+    click.echo(f"Counters {action} for {report['users']} users; {report['drifted_users']} had drifted")
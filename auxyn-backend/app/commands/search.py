@@ -0,0 +1,20 @@
+# app/commands/search.py
+import click
+import time
+from flask.cli import AppGroup
+from app import db
+from app.services.profile_search import profile_search
+
+search_cli = AppGroup('search', help='Profile search index commands.')
+
+
+@search_cli.command('rebuild')
+def rebuild():
+    """Reindex every startup and investor profile."""
+    started = time.perf_counter()
+    counts = profile_search.rebuild()
+    db.session.commit()
+    click.echo(
+        f"Indexed {counts['startup']} startup and {counts['investor']} investor profiles "
+        f"with the {profile_search.backend_name} backend in {time.perf_counter() - started:.1f}s"
+    )
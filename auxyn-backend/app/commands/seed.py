@@ -0,0 +1,28 @@
+# app/commands/seed.py
+import click
+from flask.cli import AppGroup
+from app.services.seed_data import seed_marketplace, SEED_PASSWORD
+
+seed_cli = AppGroup('seed', help='Synthetic data commands.')
+
+
+@seed_cli.command('marketplace')
+@click.option('--users', default=1000, show_default=True, help='Users to create.')
+@click.option('--seed', default=42, show_default=True, help='Random seed; the same seed gives the same data.')
+@click.option('--investor-share', default=0.25, show_default=True, help='Fraction of users who are investors.')
+@click.option('--matches-per-investor', default=8, show_default=True, help='Scored matches created per investor.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows per INSERT batch.')
+def seed_marketplace_command(users, seed, investor_share, matches_per_investor, batch_size):
+    """Bulk-insert a reproducible synthetic marketplace."""
+    summary = seed_marketplace(
+        users,
+        seed=seed,
+        investor_share=investor_share,
+        matches_per_investor=matches_per_investor,
+        batch_size=batch_size
+    )
+    click.echo(
+        f"Seeded {summary['users']} users ({summary['investors']} investors, "
+        f"{summary['startups']} startups) and {summary['matches']} matches with seed {seed}"
+    )
+    click.echo(f"Seeded users log in with password '{SEED_PASSWORD}'")
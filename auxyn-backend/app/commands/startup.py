@@ -0,0 +1,40 @@
+# app/commands/startup.py
+import click
+import time
+from flask.cli import AppGroup
+from app import db
+from app.services.startup_stats import startup_stats
+from app.services.startup_trending import startup_trending
+
+startup_cli = AppGroup('startup', help='Startup directory commands.')
+
+
+@startup_cli.command('reconcile-stats')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the aggregates.')
+@click.option('--show', default=20, show_default=True, help='Drifted values to print.')
+def reconcile_stats(dry_run, show):
+    """Recompute startup rating and follower aggregates and report drift."""
+    report = startup_stats.reconcile(fix=not dry_run)
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    for item in report['drift'][:show]:
+        click.echo(f"startup {item['startup_id']} {item['field']}: stored {item['stored']}, expected {item['expected']}")
+    if len(report['drift']) > show:
+        click.echo(f"... {len(report['drift']) - show} more")
+    action = 'checked' if dry_run else 'reconciled'
+    click.echo(f"Aggregates {action} for {report['startups']} startups; {report['drifted_startups']} had drifted")
+
+
+@startup_cli.command('rebuild-trending')
+def rebuild_trending():
+    """Recompute trending scores from every follow and rating."""
+    started = time.perf_counter()
+    report = startup_trending.rebuild()
+    db.session.commit()
+    click.echo(
+        f"Scored {report['startups']} startups from {report['events']} follows and ratings "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
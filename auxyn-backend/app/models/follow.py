@@ -6,5 +6,8 @@ class Follow(db.Model):
     startup_id = db.Column(db.Integer, db.ForeignKey('startup.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     
-    # Ensure unique combination of user_id and startup_id
-    __table_args__ = (db.UniqueConstraint('user_id', 'startup_id', name='unique_user_startup_follow'),) 
\ No newline at end of file
+    # Ensure unique combination of user_id and startup_id; followers are counted per startup
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'startup_id', name='unique_user_startup_follow'),
+        db.Index('ix_follow_startup_id', 'startup_id'),
+    )
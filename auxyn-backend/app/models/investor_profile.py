@@ -1,4 +1,6 @@
 from app import db
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from datetime import datetime
 import json
 
@@ -6,7 +8,7 @@ class InvestorProfile(db.Model):
     __tablename__ = 'investor_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     
     # Basic info
     name = db.Column(db.String(100), nullable=False)
@@ -45,6 +47,9 @@ class InvestorProfile(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Row version, bumped on every update (keys the score cache); see _bump_version
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
     # Relationships
     user = db.relationship('User', backref=db.backref('investor_profile', uselist=False))
     
@@ -107,4 +112,11 @@ class InvestorProfile(db.Model):
             'website_url': self.website_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        } 
\ No newline at end of file
+        } 
+
+
+@event.listens_for(InvestorProfile, 'before_update')
+def _bump_version(mapper, connection, target):
+    # A relative increment, not an optimistic lock: concurrent updates both apply
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = InvestorProfile.version + 1
@@ -50,6 +50,17 @@ class Match(db.Model):
     investor = db.relationship('User', foreign_keys=[investor_id], backref='investor_matches')
     startup = db.relationship('User', foreign_keys=[startup_id], backref='startup_matches')
     
+    # Match lists page by (compatibility_score DESC, id DESC) per participant,
+    # optionally within one status; recency checks range over created_at
+    __table_args__ = (
+        db.Index('ix_matches_investor_score', 'investor_id', 'compatibility_score', 'id'),
+        db.Index('ix_matches_startup_score', 'startup_id', 'compatibility_score', 'id'),
+        db.Index('ix_matches_investor_status_score', 'investor_id', 'status', 'compatibility_score', 'id'),
+        db.Index('ix_matches_startup_status_score', 'startup_id', 'status', 'compatibility_score', 'id'),
+        db.Index('ix_matches_investor_created', 'investor_id', 'created_at'),
+        db.Index('ix_matches_startup_created', 'startup_id', 'created_at'),
+    )
+    
     # Property methods for JSON fields
     @property
     def match_reasons_list(self):
@@ -76,31 +87,35 @@ class Match(db.Model):
     def compatibility_percentage(self):
         return round(self.compatibility_score * 100, 1)
     
-    def mark_viewed_by_investor(self):
+    def mark_viewed_by_investor(self, commit=True):
         self.investor_viewed_at = datetime.utcnow()
         self.last_interaction_at = datetime.utcnow()
         if self.status == 'pending':
             self.status = 'viewed'
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
-    def mark_viewed_by_startup(self):
+    def mark_viewed_by_startup(self, commit=True):
         self.startup_viewed_at = datetime.utcnow()
         self.last_interaction_at = datetime.utcnow()
         if self.status == 'pending':
             self.status = 'viewed'
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
-    def set_investor_interest(self, interest):
+    def set_investor_interest(self, interest, commit=True):
         self.investor_interest = interest
         self.last_interaction_at = datetime.utcnow()
         self._update_match_status()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
-    def set_startup_interest(self, interest):
+    def set_startup_interest(self, interest, commit=True):
         self.startup_interest = interest
         self.last_interaction_at = datetime.utcnow()
         self._update_match_status()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     def _update_match_status(self):
         if self.is_mutual_match:
@@ -0,0 +1,30 @@
+from app import db
+from datetime import datetime
+
+class MatchCounter(db.Model):
+    """Rollup of one user's matches, kept in step with match state changes"""
+    __tablename__ = 'match_counters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+
+    # Match counts from this user's side of each match
+    total = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    viewed = db.Column(db.Integer, nullable=False, default=0)
+    interested = db.Column(db.Integer, nullable=False, default=0)  # Own interest
+    not_interested = db.Column(db.Integer, nullable=False, default=0)  # Own interest
+    mutual = db.Column(db.Integer, nullable=False, default=0)
+    investor_interested = db.Column(db.Integer, nullable=False, default=0)
+    high_quality = db.Column(db.Integer, nullable=False, default=0)  # compatibility_score >= 0.8
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class MatchReasonCounter(db.Model):
+    """Investor matches counted by their leading match reason ('' when none)"""
+    __tablename__ = 'match_reason_counters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    reason = db.Column(db.String(200), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
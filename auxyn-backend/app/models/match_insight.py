@@ -7,7 +7,7 @@ class MatchInsight(db.Model):
     __tablename__ = 'match_insights'
     
     id = db.Column(db.Integer, primary_key=True)
-    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'), nullable=False)
+    match_id = db.Column(db.Integer, db.ForeignKey('matches.id'), nullable=False, index=True)
     
     # Detailed scoring explanation
     overall_explanation = db.Column(db.Text)  # High-level explanation of the match
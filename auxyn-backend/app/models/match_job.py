@@ -0,0 +1,74 @@
+from app import db
+from datetime import datetime
+import json
+
+class MatchJob(db.Model):
+    __tablename__ = 'match_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    # Job request
+    match_limit = db.Column(db.Integer, default=10)
+
+    # Job state
+    status = db.Column(db.String(20), default='queued')  # queued, running, completed, failed
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.Text)
+
+    # Progress tracking
+    candidates_scanned = db.Column(db.Integer, default=0)
+    candidates_total = db.Column(db.Integer)
+    elapsed_ms = db.Column(db.Float)
+    match_ids = db.Column(db.Text)  # JSON array of generated match ids
+
+    # Worker bookkeeping
+    worker_id = db.Column(db.String(100))  # host:pid:thread of the claiming worker
+    heartbeat_at = db.Column(db.DateTime)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    user = db.relationship('User', backref='match_jobs')
+
+    # Recovery looks up running jobs by heartbeat age
+    __table_args__ = (db.Index('ix_match_jobs_status_heartbeat', 'status', 'heartbeat_at'),)
+
+    @property
+    def match_ids_list(self):
+        return json.loads(self.match_ids) if self.match_ids else []
+
+    @match_ids_list.setter
+    def match_ids_list(self, value):
+        self.match_ids = json.dumps(value) if value else None
+
+    @property
+    def progress(self):
+        if self.status == 'completed':
+            return 1.0
+        if not self.candidates_total:
+            return 0.0
+        return round(min(self.candidates_scanned / self.candidates_total, 1.0), 3)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'status': self.status,
+            'limit': self.match_limit,
+            'attempts': self.attempts,
+            'progress': self.progress,
+            'candidates_scanned': self.candidates_scanned,
+            'candidates_total': self.candidates_total,
+            'elapsed_ms': self.elapsed_ms,
+            'match_ids': self.match_ids_list,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
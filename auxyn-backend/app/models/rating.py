@@ -1,4 +1,5 @@
 from app import db
+from datetime import datetime
 
 class Rating(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -6,4 +7,10 @@ class Rating(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
     review_text = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp()) 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Ratings are looked up per (startup, user) and listed per startup newest first
+    __table_args__ = (
+        db.Index('ix_rating_startup_user', 'startup_id', 'user_id'),
+        db.Index('ix_rating_startup_created', 'startup_id', 'created_at', 'id'),
+    )
@@ -1,8 +1,54 @@
 from app import db
+from datetime import datetime
 
 class Startup(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     category = db.Column(db.String(50))
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp()) 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Rating and follower aggregates, kept in step with Rating and Follow writes
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    follower_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_avg = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    
+    # Rating histogram (stars_1 .. stars_5) and the Bayesian average ranked on
+    stars_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    stars_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_bayes = db.Column(db.Float, nullable=False, server_default='3')
+    
+    # Directory sorts, each alone and within a category, walked as (key, id) ranges
+    __table_args__ = (
+        db.Index('ix_startup_rating', 'rating_avg', 'id'),
+        db.Index('ix_startup_followers', 'follower_count', 'id'),
+        db.Index('ix_startup_created', 'created_at', 'id'),
+        db.Index('ix_startup_top', 'rating_bayes', 'id'),
+        db.Index('ix_startup_category_rating', 'category', 'rating_avg', 'id'),
+        db.Index('ix_startup_category_followers', 'category', 'follower_count', 'id'),
+        db.Index('ix_startup_category_created', 'category', 'created_at', 'id'),
+        db.Index('ix_startup_category_top', 'category', 'rating_bayes', 'id'),
+    )
+    
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+    
+    @property
+    def rating_histogram(self):
+        return {str(stars): getattr(self, f'stars_{stars}') for stars in range(1, 6)}
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'category': self.category,
+            'rating': round(self.average_rating, 1),
+            'bayesian_rating': round(self.rating_bayes, 2) if self.rating_bayes is not None else None,
+            'followers': self.follower_count
+        }
@@ -1,5 +1,7 @@
 # app/models/startup_profile.py
 from app import db
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from datetime import datetime
 import json
 
@@ -7,7 +9,7 @@ class StartupProfile(db.Model):
     __tablename__ = 'startup_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     startup_id = db.Column(db.Integer, db.ForeignKey('startup.id'), nullable=True)
     
     # Basic company info
@@ -70,6 +72,9 @@ class StartupProfile(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Row version, bumped on every update (keys the score cache); see _bump_version
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
     # Relationships
     user = db.relationship('User', backref=db.backref('startup_profile', uselist=False))
     startup = db.relationship('Startup', backref=db.backref('profile', uselist=False))
@@ -180,4 +185,11 @@ class StartupProfile(db.Model):
             'twitter_url': self.twitter_url,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        } 
\ No newline at end of file
+        } 
+
+
+@event.listens_for(StartupProfile, 'before_update')
+def _bump_version(mapper, connection, target):
+    # A relative increment, not an optimistic lock: concurrent updates both apply
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = StartupProfile.version + 1
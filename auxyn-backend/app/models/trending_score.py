@@ -0,0 +1,13 @@
+from app import db
+
+class TrendingScore(db.Model):
+    """Time-decayed trending score of one startup, kept in log space"""
+    __tablename__ = 'trending_scores'
+
+    startup_id = db.Column(db.Integer, db.ForeignKey('startup.id'), primary_key=True)
+
+    # log(sum of event weight * e^(decay * seconds from the trending epoch)); see app.services.startup_trending
+    score_log = db.Column(db.Float, nullable=False)
+
+    # The leaderboard reads this index from the top
+    __table_args__ = (db.Index('ix_trending_scores_score', 'score_log', 'startup_id'),)
@@ -79,7 +79,7 @@ def get_followers(startup_id):
         # Check if startup exists
         startup = Startup.query.get_or_404(startup_id)
         
-        follower_count = Follow.query.filter_by(startup_id=startup_id).count()
+        follower_count = startup.follower_count
         
         logger.info(f"Retrieved follower count for startup {startup_id}: {follower_count}")
         return jsonify({
@@ -5,7 +5,12 @@ from app import db
 from app.models.user import User
 from app.models.match import Match
 from app.models.match_insight import MatchInsight
+from app.services.matching_service import MatchingService
+from app.services.response_cache import response_cache
+from app.utils.auth import current_user_type
+from app.utils.conditional import conditional_response, row_etag
 from app.utils.logger import handle_errors, log_request_info, logger
+from datetime import datetime
 
 insights_bp = Blueprint('insights', __name__)
 
@@ -17,26 +22,30 @@ def before_request():
 @jwt_required()
 @handle_errors
 def get_match_insights(match_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        # Get the match and verify authorization
-        match = Match.query.get_or_404(match_id)
-        user = User.query.get(user_id)
+        # Get the match participants and the insight's validators
+        owner = Match.investor_id if current_user_type(user_id) == 'investor' else Match.startup_id
+        row = db.session.query(
+            owner.label('owner_id'), MatchInsight.id, MatchInsight.updated_at
+        ).outerjoin(MatchInsight, MatchInsight.match_id == Match.id).filter(Match.id == match_id).first()
+        
+        if row is None:
+            return jsonify({'error': 'Match not found'}), 404
         
         # Check if user is part of this match
-        if user.user_type == 'investor' and match.investor_id != user_id:
-            return jsonify({'error': 'Unauthorized'}), 403
-        elif user.user_type == 'startup' and match.startup_id != user_id:
+        if row.owner_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get match insights
-        insights = MatchInsight.query.filter_by(match_id=match_id).first()
-        
-        if not insights:
+        if row.id is None:
             return jsonify({'error': 'Match insights not found'}), 404
         
-        return jsonify(insights.to_dict())
+        return conditional_response(
+            row_etag('match_insight', row.id, row.updated_at),
+            row.updated_at,
+            lambda: jsonify(db.session.get(MatchInsight, row.id).to_dict())
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving match insights: {str(e)}")
@@ -45,14 +54,13 @@ def get_match_insights(match_id):
 @insights_bp.route('/dashboard/match-analytics', methods=['GET'])
 @jwt_required()
 @handle_errors
+@response_cache.cached('match_analytics')
 def get_match_analytics():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        user = User.query.get(user_id)
-        
         # Get analytics based on user type
-        if user.user_type == 'investor':
+        if current_user_type(user_id) == 'investor':
             analytics = _get_investor_analytics(user_id)
         else:
             analytics = _get_startup_analytics(user_id)
@@ -66,34 +74,15 @@ def get_match_analytics():
 def _get_investor_analytics(investor_id):
     """Get analytics for an investor"""
     
-    # Basic match statistics
-    total_matches = Match.query.filter_by(investor_id=investor_id).count()
-    pending_matches = Match.query.filter_by(investor_id=investor_id, status='pending').count()
-    viewed_matches = Match.query.filter_by(investor_id=investor_id, status='viewed').count()
-    interested_matches = Match.query.filter_by(investor_id=investor_id, investor_interest='interested').count()
-    mutual_matches = Match.query.filter_by(
-        investor_id=investor_id,
-        investor_interest='interested',
-        startup_interest='interested'
-    ).count()
-    
-    # Match quality metrics
-    avg_compatibility = db.session.query(db.func.avg(Match.compatibility_score))\
-        .filter_by(investor_id=investor_id).scalar() or 0
-    
-    high_quality_matches = Match.query.filter_by(investor_id=investor_id)\
-        .filter(Match.compatibility_score >= 0.8).count()
-    
-    # Industry breakdown
-    industry_breakdown = db.session.query(
-        db.func.json_extract(Match.match_reasons, '$[0]').label('reason'),
-        db.func.count().label('count')
-    ).filter_by(investor_id=investor_id).group_by('reason').all()
+    # Match statistics and the industry breakdown from the counter rows
+    counts = MatchingService.match_statistics(investor_id, reason_breakdown=True)
+    total_matches = counts['total']
+    interested_matches = counts['interested']
+    mutual_matches = counts['mutual']
+    avg_compatibility = counts['avg_score']
     
     # Response rate
-    total_responses = interested_matches + Match.query.filter_by(
-        investor_id=investor_id, investor_interest='not_interested'
-    ).count()
+    total_responses = interested_matches + counts['not_interested']
     response_rate = (total_responses / total_matches * 100) if total_matches > 0 else 0
     
     # Success rate (mutual matches / interested matches)
@@ -102,19 +91,19 @@ def _get_investor_analytics(investor_id):
     return {
         'overview': {
             'total_matches': total_matches,
-            'pending_matches': pending_matches,
-            'viewed_matches': viewed_matches,
+            'pending_matches': counts['pending'],
+            'viewed_matches': counts['viewed'],
             'interested_matches': interested_matches,
             'mutual_matches': mutual_matches,
             'avg_compatibility': round(avg_compatibility * 100, 1),
-            'high_quality_matches': high_quality_matches,
+            'high_quality_matches': counts['high_quality'],
             'response_rate': round(response_rate, 1),
             'success_rate': round(success_rate, 1)
         },
         'trends': {
             'industry_breakdown': [
                 {'industry': item[0], 'count': item[1]} 
-                for item in industry_breakdown
+                for item in counts['reasons']
             ]
         },
         'insights': _generate_investor_insights(investor_id, {
@@ -128,33 +117,18 @@ def _get_investor_analytics(investor_id):
 def _get_startup_analytics(startup_id):
     """Get analytics for a startup"""
     
-    # Basic match statistics
-    total_matches = Match.query.filter_by(startup_id=startup_id).count()
-    pending_matches = Match.query.filter_by(startup_id=startup_id, status='pending').count()
-    viewed_matches = Match.query.filter_by(startup_id=startup_id, status='viewed').count()
-    interested_matches = Match.query.filter_by(startup_id=startup_id, startup_interest='interested').count()
-    mutual_matches = Match.query.filter_by(
-        startup_id=startup_id,
-        investor_interest='interested',
-        startup_interest='interested'
-    ).count()
-    
-    # Match quality metrics
-    avg_compatibility = db.session.query(db.func.avg(Match.compatibility_score))\
-        .filter_by(startup_id=startup_id).scalar() or 0
-    
-    high_quality_matches = Match.query.filter_by(startup_id=startup_id)\
-        .filter(Match.compatibility_score >= 0.8).count()
+    # Match statistics from the counter row
+    counts = MatchingService.match_statistics(startup_id)
+    total_matches = counts['total']
+    interested_matches = counts['interested']
+    mutual_matches = counts['mutual']
+    avg_compatibility = counts['avg_score']
     
     # Investor interest analysis
-    investor_interest_count = Match.query.filter_by(
-        startup_id=startup_id, investor_interest='interested'
-    ).count()
+    investor_interest_count = counts['investor_interested']
     
     # Response rate
-    total_responses = interested_matches + Match.query.filter_by(
-        startup_id=startup_id, startup_interest='not_interested'
-    ).count()
+    total_responses = interested_matches + counts['not_interested']
     response_rate = (total_responses / total_matches * 100) if total_matches > 0 else 0
     
     # Attraction rate (investor interest / total matches)
@@ -163,13 +137,13 @@ def _get_startup_analytics(startup_id):
     return {
         'overview': {
             'total_matches': total_matches,
-            'pending_matches': pending_matches,
-            'viewed_matches': viewed_matches,
+            'pending_matches': counts['pending'],
+            'viewed_matches': counts['viewed'],
             'interested_matches': interested_matches,
             'mutual_matches': mutual_matches,
             'investor_interest_count': investor_interest_count,
             'avg_compatibility': round(avg_compatibility * 100, 1),
-            'high_quality_matches': high_quality_matches,
+            'high_quality_matches': counts['high_quality'],
             'response_rate': round(response_rate, 1),
             'attraction_rate': round(attraction_rate, 1)
         },
@@ -265,21 +239,20 @@ def _generate_startup_insights(startup_id, stats):
 @insights_bp.route('/dashboard/recommendations', methods=['GET'])
 @jwt_required()
 @handle_errors
+@response_cache.cached('recommendations')
 def get_recommendations():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        user = User.query.get(user_id)
-        
         # Get personalized recommendations
-        if user.user_type == 'investor':
+        if current_user_type(user_id) == 'investor':
             recommendations = _get_investor_recommendations(user_id)
         else:
             recommendations = _get_startup_recommendations(user_id)
         
         return jsonify({
             'recommendations': recommendations,
-            'generated_at': db.func.now()
+            'generated_at': datetime.utcnow().isoformat()
         })
         
     except Exception as e:
@@ -4,11 +4,28 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User
 from app.models.match import Match
+from app.models.match_job import MatchJob
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
 from app.services.matching_service import MatchingService
+from app.services.job_service import match_jobs
+from app.services.scoring_registry import scoring_registry
+from app.services.response_cache import response_cache
+from app.services.view_buffer import view_buffer
+from app.utils.auth import current_user_type
+from app.utils.conditional import conditional_response, row_etag
+from app.utils.streaming import ndjson_response, wants_ndjson
 from app.utils.logger import handle_errors, log_request_info, logger
+from datetime import datetime
 
 matching_bp = Blueprint('matching', __name__)
 
+MAX_PAGE_SIZE = 100
+MAX_BULK_ITEMS = 500
+MAX_GENERATE_LIMIT = 100
+CONFIDENCE_LEVELS = ('low', 'medium', 'high')
+INTEREST_STATES = ('interested', 'not_interested', 'pending')
+
 @matching_bp.before_request
 def before_request():
     log_request_info()
@@ -17,7 +34,7 @@ def before_request():
 @jwt_required()
 @handle_errors
 def get_matches(user_id):
-    current_user_id = get_jwt_identity()
+    current_user_id = int(get_jwt_identity())
     
     # Users can only see their own matches
     if current_user_id != user_id:
@@ -26,78 +43,116 @@ def get_matches(user_id):
     try:
         # Get query parameters
         status_filter = request.args.get('status')
-        limit = int(request.args.get('limit', 50))
-        
-        matches = MatchingService.get_matches_for_user(
-            user_id, 
-            status_filter=status_filter, 
-            limit=limit
-        )
-        
-        # Include additional profile data for each match
-        matches_data = []
-        for match in matches:
-            match_dict = match.to_dict()
-            
-            # Add partner profile info (basic details only)
-            user = User.query.get(current_user_id)
-            if user.user_type == 'investor':
-                # Get startup info
-                partner_user = User.query.get(match.startup_id)
-                if partner_user and hasattr(partner_user, 'startup_profile'):
-                    startup_profile = partner_user.startup_profile
-                    if startup_profile:
-                        match_dict['partner_profile'] = {
-                            'company_name': startup_profile.company_name,
-                            'tagline': startup_profile.tagline,
-                            'industry': startup_profile.industry,
-                            'company_stage': startup_profile.company_stage,
-                            'funding_needed': startup_profile.funding_needed,
-                            'funding_stage': startup_profile.funding_stage,
-                            'headquarters': startup_profile.headquarters,
-                            'logo_url': startup_profile.logo_url
-                        }
-            else:
-                # Get investor info
-                partner_user = User.query.get(match.investor_id)
-                if partner_user and hasattr(partner_user, 'investor_profile'):
-                    investor_profile = partner_user.investor_profile
-                    if investor_profile:
-                        match_dict['partner_profile'] = {
-                            'name': investor_profile.name,
-                            'title': investor_profile.title,
-                            'company': investor_profile.company,
-                            'bio': investor_profile.bio,
-                            'location': investor_profile.location,
-                            'preferred_industries': investor_profile.preferred_industries_list,
-                            'min_investment': investor_profile.min_investment,
-                            'max_investment': investor_profile.max_investment
-                        }
+        try:
+            filters = _match_list_filters(request.args)
+            user_type = current_user_type(current_user_id)
+            if wants_ndjson():
+                # Every remaining match, one line each, read in batches
+                matches = MatchingService.iter_matches(
+                    user_id,
+                    cursor=request.args.get('cursor'),
+                    status_filter=status_filter,
+                    filters=filters,
+                    with_partner_cards=True
+                )
+                return ndjson_response(_match_with_partner(match, user_type) for match in matches)
             
-            matches_data.append(match_dict)
+            limit = min(max(int(request.args.get('limit', 50)), 1), MAX_PAGE_SIZE)
+            matches, next_cursor = MatchingService.get_match_page(
+                user_id,
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                status_filter=status_filter,
+                filters=filters,
+                with_partner_cards=True
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Include basic partner profile details, loaded with the matches
+        matches_data = [_match_with_partner(match, user_type) for match in matches]
         
         logger.info(f"Retrieved {len(matches_data)} matches for user {user_id}")
         
         return jsonify({
             'matches': matches_data,
-            'count': len(matches_data)
+            'count': len(matches_data),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         })
         
     except Exception as e:
         logger.error(f"Error retrieving matches for user {user_id}: {str(e)}")
         raise
 
+def _match_list_filters(args):
+    """Parse the optional match list filters, raising ValueError on bad input"""
+    filters = {}
+    
+    confidence = args.get('confidence')
+    if confidence:
+        if confidence not in CONFIDENCE_LEVELS:
+            raise ValueError('Invalid confidence value')
+        filters['confidence'] = confidence
+    
+    interest = args.get('interest')
+    if interest:
+        if interest not in INTEREST_STATES:
+            raise ValueError('Invalid interest value')
+        filters['interest'] = interest
+    
+    if args.get('min_score'):
+        try:
+            filters['min_score'] = float(args['min_score'])
+        except ValueError:
+            raise ValueError('Invalid min_score value')
+    
+    for name in ('created_after', 'created_before'):
+        if args.get(name):
+            try:
+                filters[name] = datetime.fromisoformat(args[name])
+            except ValueError:
+                raise ValueError(f'Invalid {name} value, expected an ISO 8601 date')
+    
+    return filters
+
+def _match_with_partner(match, user_type):
+    """Match list entry with the partner's profile card"""
+    match_dict = match.to_dict()
+    
+    if user_type == 'investor':
+        partner_user = match.startup
+        partner_profile = partner_user.startup_profile if partner_user else None
+        fields = MatchingService.STARTUP_CARD_FIELDS
+    else:
+        partner_user = match.investor
+        partner_profile = partner_user.investor_profile if partner_user else None
+        fields = MatchingService.INVESTOR_CARD_FIELDS
+    
+    if partner_profile:
+        match_dict['partner_profile'] = _partner_card(partner_profile, fields)
+    
+    return match_dict
+
+def _partner_card(profile, fields):
+    card = {field: getattr(profile, field) for field in fields}
+    if 'preferred_industries' in card:
+        card['preferred_industries'] = profile.preferred_industries_list
+    return card
+
 @matching_bp.route('/generate', methods=['POST'])
 @jwt_required()
 @handle_errors
 def generate_matches():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     data = request.get_json() or {}
     
     try:
         # Get optional parameters
         limit = data.get('limit', 10)
         force_regenerate = data.get('force_regenerate', False)
+        if isinstance(limit, bool) or not isinstance(limit, int) or not (1 <= limit <= MAX_GENERATE_LIMIT):
+            return jsonify({'error': f'limit must be an integer between 1 and {MAX_GENERATE_LIMIT}'}), 400
         
         # Check if user has recent matches (unless force regenerate)
         if not force_regenerate:
@@ -116,31 +171,82 @@ def generate_matches():
                     'recent_matches_count': recent_matches
                 }), 400
         
-        # Generate new matches
-        matches = MatchingService.generate_matches_for_user(user_id, limit)
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 400
+        if user.user_type not in ('investor', 'startup'):
+            return jsonify({'error': 'Invalid user type'}), 400
         
-        matches_data = [match.to_dict() for match in matches]
+        # Generation runs on the worker pool; clients poll the job
+        job = match_jobs.enqueue(user_id, limit)
         
-        logger.info(f"Generated {len(matches)} new matches for user {user_id}")
+        logger.info(f"Queued match generation job {job.id} for user {user_id}")
         
         return jsonify({
-            'message': f'Generated {len(matches)} new matches',
-            'matches': matches_data,
-            'count': len(matches)
-        }), 201
+            'message': 'Match generation queued',
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/api/matches/jobs/{job.id}'
+        }), 202
         
-    except ValueError as e:
-        logger.warning(f"Invalid request for match generation: {str(e)}")
-        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error generating matches for user {user_id}: {str(e)}")
         raise
 
+@matching_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+@handle_errors
+def get_match_job(job_id):
+    user_id = int(get_jwt_identity())
+    
+    # Resume jobs orphaned by a crashed worker or restart
+    match_jobs.recover()
+    
+    job = MatchJob.query.get_or_404(job_id)
+    if job.user_id != user_id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    return jsonify(job.to_dict())
+
+@matching_bp.route('/preview/<int:partner_id>', methods=['GET'])
+@jwt_required()
+@handle_errors
+def preview_match(partner_id):
+    user_id = int(get_jwt_identity())
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    if user.user_type == 'investor':
+        investor_id, startup_id = user_id, partner_id
+    elif user.user_type == 'startup':
+        investor_id, startup_id = partner_id, user_id
+    else:
+        return jsonify({'error': 'Invalid user type'}), 400
+    
+    investor_profile = InvestorProfile.query.filter_by(user_id=investor_id).first()
+    startup_profile = StartupProfile.query.filter_by(user_id=startup_id).first()
+    if not investor_profile or not startup_profile:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    algorithm = scoring_registry.active()
+    match_score = MatchingService.score_pair(investor_profile, startup_profile, algorithm)
+    
+    return jsonify({
+        'investor_id': investor_id,
+        'startup_id': startup_id,
+        'compatibility_score': match_score['overall_score'],
+        'confidence_level': MatchingService._determine_confidence_level(match_score['overall_score']),
+        'match_reasons': MatchingService._generate_match_reasons(match_score),
+        'score_breakdown': {key: value for key, value in match_score.items() if key != 'overall_score'},
+        'algorithm_version': algorithm.version
+    })
+
 @matching_bp.route('/<int:match_id>/interest', methods=['PUT'])
 @jwt_required()
 @handle_errors
 def update_match_interest(match_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     data = request.get_json()
     
     if 'interest' not in data:
@@ -171,23 +277,20 @@ def update_match_interest(match_id):
 @jwt_required()
 @handle_errors
 def mark_match_viewed(match_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
         match = Match.query.get_or_404(match_id)
-        user = User.query.get(user_id)
+        user_type = current_user_type(user_id)
         
         # Check authorization
-        if user.user_type == 'investor' and match.investor_id != user_id:
+        if user_type == 'investor' and match.investor_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
-        elif user.user_type == 'startup' and match.startup_id != user_id:
+        elif user_type == 'startup' and match.startup_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Mark as viewed
-        if user.user_type == 'investor':
-            match.mark_viewed_by_investor()
-        else:
-            match.mark_viewed_by_startup()
+        # Mark as viewed (buffered unless VIEW_BUFFER_ENABLED is off)
+        view_buffer.mark_viewed(match, user_type)
         
         logger.info(f"Match {match_id} marked as viewed by user {user_id}")
         
@@ -200,40 +303,78 @@ def mark_match_viewed(match_id):
         logger.error(f"Error marking match as viewed: {str(e)}")
         raise
 
-@matching_bp.route('/<int:match_id>', methods=['GET'])
+@matching_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@handle_errors
+def bulk_update_matches():
+    """Interest changes and views for many matches in one request and one commit"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'items must be a non-empty list'}), 400
+    if len(items) > MAX_BULK_ITEMS:
+        return jsonify({'error': f'At most {MAX_BULK_ITEMS} items per request'}), 400
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({'error': 'Each item must be an object'}), 400
+    
+    try:
+        results = MatchingService.apply_match_updates(user_id, current_user_type(user_id), items)
+        updated = sum(1 for result in results if result['ok'])
+        
+        logger.info(f"Bulk updated {updated} of {len(results)} matches for user {user_id}")
+        
+        return jsonify({
+            'results': results,
+            'updated': updated,
+            'failed': len(results) - updated
+        })
+        
+    except Exception as e:
+        logger.error(f"Error bulk updating matches: {str(e)}")
+        raise
+
+@matching_bp.route('/<int:match_id>/details', methods=['GET'])
 @jwt_required()
 @handle_errors
 def get_match_details(match_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        match = Match.query.get_or_404(match_id)
-        user = User.query.get(user_id)
+        if current_user_type(user_id) == 'investor':
+            owner, partner, partner_model = Match.investor_id, Match.startup_id, StartupProfile
+        else:
+            owner, partner, partner_model = Match.startup_id, Match.investor_id, InvestorProfile
+        
+        # Validators only: the match's updated_at and the partner profile's version
+        row = db.session.query(
+            owner.label('owner_id'),
+            Match.updated_at,
+            partner_model.id.label('profile_id'),
+            partner_model.version.label('profile_version'),
+            partner_model.updated_at.label('profile_updated_at')
+        ).outerjoin(partner_model, partner_model.user_id == partner).filter(Match.id == match_id).first()
+        
+        if row is None:
+            return jsonify({'error': 'Match not found'}), 404
         
         # Check authorization
-        if user.user_type == 'investor' and match.investor_id != user_id:
-            return jsonify({'error': 'Unauthorized'}), 403
-        elif user.user_type == 'startup' and match.startup_id != user_id:
+        if row.owner_id != user_id:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        # Get detailed match info including partner profile
-        match_dict = match.to_dict(include_sensitive=True)
+        def match_details():
+            # Get detailed match info including partner profile
+            match_dict = db.session.get(Match, match_id).to_dict(include_sensitive=True)
+            if row.profile_id is not None:
+                match_dict['partner_profile'] = db.session.get(partner_model, row.profile_id).to_dict()
+            return jsonify(match_dict)
         
-        # Add partner profile details
-        if user.user_type == 'investor':
-            partner_user = User.query.get(match.startup_id)
-            if partner_user and hasattr(partner_user, 'startup_profile'):
-                startup_profile = partner_user.startup_profile
-                if startup_profile:
-                    match_dict['partner_profile'] = startup_profile.to_dict()
-        else:
-            partner_user = User.query.get(match.investor_id)
-            if partner_user and hasattr(partner_user, 'investor_profile'):
-                investor_profile = partner_user.investor_profile
-                if investor_profile:
-                    match_dict['partner_profile'] = investor_profile.to_dict()
-        
-        return jsonify(match_dict)
+        return conditional_response(
+            row_etag('match', match_id, row.updated_at, row.profile_id, row.profile_version),
+            max(filter(None, (row.updated_at, row.profile_updated_at)), default=None),
+            match_details
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving match details: {str(e)}")
@@ -242,40 +383,23 @@ def get_match_details(match_id):
 @matching_bp.route('/stats', methods=['GET'])
 @jwt_required()
 @handle_errors
+@response_cache.cached('stats')
 def get_matching_stats():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     
     try:
-        user = User.query.get(user_id)
-        
-        # Get match statistics
-        if user.user_type == 'investor':
-            total_matches = Match.query.filter_by(investor_id=user_id).count()
-            pending_matches = Match.query.filter_by(investor_id=user_id, status='pending').count()
-            interested_matches = Match.query.filter_by(investor_id=user_id, investor_interest='interested').count()
-            mutual_matches = Match.query.filter_by(
-                investor_id=user_id, 
-                investor_interest='interested',
-                startup_interest='interested'
-            ).count()
-        else:
-            total_matches = Match.query.filter_by(startup_id=user_id).count()
-            pending_matches = Match.query.filter_by(startup_id=user_id, status='pending').count()
-            interested_matches = Match.query.filter_by(startup_id=user_id, startup_interest='interested').count()
-            mutual_matches = Match.query.filter_by(
-                startup_id=user_id,
-                investor_interest='interested',
-                startup_interest='interested'
-            ).count()
+        # Get match statistics from the user's counter row
+        counts = MatchingService.match_statistics(user_id)
         
         # Calculate match rate
-        match_rate = (mutual_matches / total_matches * 100) if total_matches > 0 else 0
+        total_matches = counts['total']
+        match_rate = (counts['mutual'] / total_matches * 100) if total_matches > 0 else 0
         
         stats = {
             'total_matches': total_matches,
-            'pending_matches': pending_matches,
-            'interested_matches': interested_matches,
-            'mutual_matches': mutual_matches,
+            'pending_matches': counts['pending'],
+            'interested_matches': counts['interested'],
+            'mutual_matches': counts['mutual'],
             'match_rate': round(match_rate, 1)
         }
         
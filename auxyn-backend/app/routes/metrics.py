@@ -0,0 +1,31 @@
+# app/routes/metrics.py
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from app.services.score_cache import score_cache
+from app.services.response_cache import response_cache
+from app.services.view_buffer import view_buffer
+from app.utils.logger import handle_errors, log_request_info
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.before_request
+def before_request():
+    log_request_info()
+
+@metrics_bp.route('/score-cache', methods=['GET'])
+@jwt_required()
+@handle_errors
+def get_score_cache_metrics():
+    return jsonify(score_cache.stats())
+
+@metrics_bp.route('/response-cache', methods=['GET'])
+@jwt_required()
+@handle_errors
+def get_response_cache_metrics():
+    return jsonify(response_cache.stats())
+
+@metrics_bp.route('/view-buffer', methods=['GET'])
+@jwt_required()
+@handle_errors
+def get_view_buffer_metrics():
+    return jsonify(view_buffer.stats())
@@ -6,6 +6,9 @@ from app.models.user import User
 from app.models.user_preferences import UserPreferences
 from app.models.investor_profile import InvestorProfile
 from app.models.startup_profile import StartupProfile
+from app.services.matching_service import MatchingService
+from app.utils.auth import current_user_type
+from app.utils.conditional import conditional_response, is_conditional, row_etag
 from app.utils.logger import handle_errors, log_request_info, logger
 from datetime import datetime
 
@@ -15,6 +18,23 @@ profile_bp = Blueprint('profile', __name__)
 def before_request():
     log_request_info()
 
+def _profile_response(model, user_id, not_found):
+    """Profile JSON validated by the profile's row version"""
+    profile = None
+    if is_conditional():
+        row = db.session.query(model.id, model.version, model.updated_at).filter_by(user_id=user_id).first()
+    else:
+        row = profile = model.query.filter_by(user_id=user_id).first()
+    
+    if row is None:
+        return jsonify({'error': not_found}), 404
+    
+    return conditional_response(
+        row_etag(model.__tablename__, row.id, row.version),
+        row.updated_at,
+        lambda: jsonify((profile or db.session.get(model, row.id)).to_dict())
+    )
+
 # User Preferences Routes
 @profile_bp.route('/preferences', methods=['GET'])
 @jwt_required()
@@ -73,18 +93,12 @@ def update_user_preferences():
 @jwt_required()
 @handle_errors
 def get_investor_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = int(get_jwt_identity())
     
-    if user.user_type != 'investor':
+    if current_user_type(user_id) != 'investor':
         return jsonify({'error': 'User is not an investor'}), 403
     
-    profile = InvestorProfile.query.filter_by(user_id=user_id).first()
-    
-    if not profile:
-        return jsonify({'error': 'Investor profile not found'}), 404
-    
-    return jsonify(profile.to_dict())
+    return _profile_response(InvestorProfile, user_id, 'Investor profile not found')
 
 @profile_bp.route('/investor', methods=['POST'])
 @jwt_required()
@@ -161,7 +175,7 @@ def create_investor_profile():
 @jwt_required()
 @handle_errors
 def update_investor_profile():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
     
     if user.user_type != 'investor':
@@ -172,6 +186,7 @@ def update_investor_profile():
         return jsonify({'error': 'Investor profile not found'}), 404
     
     data = request.get_json()
+    matching_before = MatchingService.matching_snapshot(profile)
     
     try:
         # Update scalar fields
@@ -197,13 +212,22 @@ def update_investor_profile():
         if 'expertise_areas' in data:
             profile.expertise_areas_list = data['expertise_areas']
         
+        # Keep existing match scores in step with the fields that feed them
+        changed_fields = MatchingService.changed_matching_fields(matching_before, profile)
+        rescored = 0
+        if changed_fields:
+            rescored = MatchingService.rescore_matches_for_profile(profile, commit=False)
+        
         db.session.commit()
         
         logger.info(f"Updated investor profile for user {user_id}")
+        if changed_fields:
+            logger.info(f"Matching fields changed ({', '.join(changed_fields)}), rescored {rescored} matches")
         
         return jsonify({
             'message': 'Investor profile updated successfully',
-            'profile': profile.to_dict()
+            'profile': profile.to_dict(),
+            'rescored_matches': rescored
         })
         
     except Exception as e:
@@ -216,18 +240,12 @@ def update_investor_profile():
 @jwt_required()
 @handle_errors
 def get_startup_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user_id = int(get_jwt_identity())
     
-    if user.user_type != 'startup':
+    if current_user_type(user_id) != 'startup':
         return jsonify({'error': 'User is not a startup'}), 403
     
-    profile = StartupProfile.query.filter_by(user_id=user_id).first()
-    
-    if not profile:
-        return jsonify({'error': 'Startup profile not found'}), 404
-    
-    return jsonify(profile.to_dict())
+    return _profile_response(StartupProfile, user_id, 'Startup profile not found')
 
 @profile_bp.route('/startup', methods=['POST'])
 @jwt_required()
@@ -323,7 +341,7 @@ def create_startup_profile():
 @jwt_required()
 @handle_errors
 def update_startup_profile():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     user = User.query.get(user_id)
     
     if user.user_type != 'startup':
@@ -334,6 +352,7 @@ def update_startup_profile():
         return jsonify({'error': 'Startup profile not found'}), 404
     
     data = request.get_json()
+    matching_before = MatchingService.matching_snapshot(profile)
     
     try:
         # Update scalar fields
@@ -372,13 +391,22 @@ def update_startup_profile():
         if 'press_coverage' in data:
             profile.press_coverage_list = data['press_coverage']
         
+        # Keep existing match scores in step with the fields that feed them
+        changed_fields = MatchingService.changed_matching_fields(matching_before, profile)
+        rescored = 0
+        if changed_fields:
+            rescored = MatchingService.rescore_matches_for_profile(profile, commit=False)
+        
         db.session.commit()
         
         logger.info(f"Updated startup profile for user {user_id}")
+        if changed_fields:
+            logger.info(f"Matching fields changed ({', '.join(changed_fields)}), rescored {rescored} matches")
         
         return jsonify({
             'message': 'Startup profile updated successfully',
-            'profile': profile.to_dict()
+            'profile': profile.to_dict(),
+            'rescored_matches': rescored
         })
         
     except Exception as e:
@@ -1,13 +1,16 @@
 # app/routes/rating.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.rating import Rating
 from app.models.startup import Startup
+from app.services.startup_reviews import StartupReviews
 from app.utils.logger import handle_errors, log_request_info, logger
 
 rating_bp = Blueprint('rating', __name__)
 
+MAX_PAGE_SIZE = 100
+
 @rating_bp.before_request
 def before_request():
     log_request_info()
@@ -63,31 +66,30 @@ def rate_startup(startup_id):
 @handle_errors
 def get_startup_ratings(startup_id):
     try:
-        # Check if startup exists
-        Startup.query.get_or_404(startup_id)
-        
-        ratings = Rating.query.filter_by(startup_id=startup_id).all()
-        
-        result = []
-        for rating in ratings:
-            result.append({
-                'id': rating.id,
-                'rating': rating.rating,
-                'review_text': rating.review_text,
-                'user_id': rating.user_id,
-                'created_at': rating.created_at.isoformat() if rating.created_at else None
-            })
+        # Summary figures come from the startup row's histogram and aggregates
+        startup = Startup.query.get_or_404(startup_id)
         
-        # Calculate average rating
-        avg_rating = sum([r.rating for r in ratings]) / len(ratings) if ratings else 0
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+            ratings, next_cursor = StartupReviews.page(
+                startup_id,
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                full_text=request.args.get('full_text', '').lower() in ('1', 'true', 'yes'),
+                excerpt_length=current_app.config.get('REVIEW_EXCERPT_LENGTH', 280)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        logger.info(f"Retrieved {len(result)} ratings for startup {startup_id}")
+        logger.info(f"Retrieved {len(ratings)} ratings for startup {startup_id}")
         return jsonify({
-            'ratings': result,
-            'average_rating': round(avg_rating, 1),
-            'total_ratings': len(ratings)
+            'ratings': ratings,
+            'count': len(ratings),
+            **StartupReviews.summary(startup),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         })
         
     except Exception as e:
         logger.error(f"Error getting ratings for startup {startup_id}: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
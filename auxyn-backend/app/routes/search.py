@@ -0,0 +1,45 @@
+# app/routes/search.py
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.services.profile_search import profile_search
+from app.utils.logger import handle_errors, log_request_info, logger
+
+search_bp = Blueprint('search', __name__)
+
+MAX_PAGE_SIZE = 50
+
+@search_bp.before_request
+def before_request():
+    log_request_info()
+
+@search_bp.route('', methods=['GET'])
+@jwt_required()
+@handle_errors
+def search_profiles():
+    query = request.args.get('q', '')
+
+    try:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+            page = max(int(request.args.get('page', 1)), 1)
+            results, total = profile_search.search(
+                query,
+                kind=request.args.get('type') or None,
+                limit=limit,
+                offset=(page - 1) * limit
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        logger.info(f"Search for '{query}' returned {len(results)} of {total} profiles")
+        return jsonify({
+            'results': results,
+            'count': len(results),
+            'total': total,
+            'page': page,
+            'has_more': page * limit < total
+        })
+
+    except Exception as e:
+        logger.error(f"Error searching profiles for '{query}': {str(e)}")
+        raise
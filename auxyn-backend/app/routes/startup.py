@@ -3,12 +3,16 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.startup import Startup
-from app.models.rating import Rating
-from app.models.follow import Follow
+from app.services.startup_directory import startup_directory, DEFAULT_SORT
+from app.services.startup_trending import startup_trending
 from app.utils.logger import handle_errors, log_request_info, logger
+from app.utils.streaming import ndjson_response, wants_ndjson
 
 startup_bp = Blueprint('startup', __name__)
 
+MAX_PAGE_SIZE = 100
+STREAM_BATCH_SIZE = 100
+
 @startup_bp.before_request
 def before_request():
     log_request_info()
@@ -18,33 +22,65 @@ def before_request():
 @handle_errors
 def get_startups():
     try:
-        startups = Startup.query.all()
-        result = []
-        
-        for startup in startups:
-            # Calculate average rating
-            ratings = Rating.query.filter_by(startup_id=startup.id).all()
-            avg_rating = sum([r.rating for r in ratings]) / len(ratings) if ratings else 0
-            
-            # Get follower count
-            follower_count = Follow.query.filter_by(startup_id=startup.id).count()
+        # Ratings and followers are read from the startup's aggregate columns
+        category = request.args.get('category') or None
+        sort = request.args.get('sort', DEFAULT_SORT)
+        cursor = request.args.get('cursor')
+        try:
+            if wants_ndjson():
+                # Every remaining startup, one line each, read in batches
+                startups = startup_directory.iter_startups(
+                    cursor=cursor, category=category, sort=sort, batch_size=STREAM_BATCH_SIZE
+                )
+                return ndjson_response(startup.to_dict() for startup in startups)
             
-            result.append({
-                'id': startup.id,
-                'name': startup.name,
-                'description': startup.description,
-                'category': startup.category,
-                'rating': round(avg_rating, 1),
-                'followers': follower_count
-            })
+            limit = min(max(int(request.args.get('limit', 50)), 1), MAX_PAGE_SIZE)
+            startups, next_cursor = startup_directory.page(
+                limit=limit, cursor=cursor, category=category, sort=sort
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
+        result = [startup.to_dict() for startup in startups]
         logger.info(f"Retrieved {len(result)} startups")
-        return jsonify(result)
+        return jsonify({
+            'startups': result,
+            'count': len(result),
+            'total': startup_directory.total(category),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        })
         
     except Exception as e:
         logger.error(f"Error retrieving startups: {str(e)}")
         raise
 
+@startup_bp.route('/trending', methods=['GET'])
+@jwt_required()
+@handle_errors
+def get_trending_startups():
+    try:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        # Read from the top of the trending score index; no follow or rating scan
+        result = [
+            {**startup.to_dict(), 'trending_score': round(score, 4)}
+            for startup, score in startup_trending.top(limit)
+        ]
+        logger.info(f"Retrieved {len(result)} trending startups")
+        return jsonify({
+            'startups': result,
+            'count': len(result),
+            'half_life_hours': startup_trending.half_life_hours
+        })
+        
+    except Exception as e:
+        logger.error(f"Error retrieving trending startups: {str(e)}")
+        raise
+
 @startup_bp.route('/<int:startup_id>', methods=['GET'])
 @jwt_required()
 @handle_errors
@@ -52,22 +88,8 @@ def get_startup(startup_id):
     startup = Startup.query.get_or_404(startup_id)
     
     try:
-        # Calculate average rating
-        ratings = Rating.query.filter_by(startup_id=startup.id).all()
-        avg_rating = sum([r.rating for r in ratings]) / len(ratings) if ratings else 0
-        
-        # Get follower count
-        follower_count = Follow.query.filter_by(startup_id=startup.id).count()
-        
         logger.info(f"Retrieved startup details for ID: {startup_id}")
-        return jsonify({
-            'id': startup.id,
-            'name': startup.name,
-            'description': startup.description,
-            'category': startup.category,
-            'rating': round(avg_rating, 1),
-            'followers': follower_count
-        })
+        return jsonify(startup.to_dict())
         
     except Exception as e:
         logger.error(f"Error retrieving startup {startup_id}: {str(e)}")
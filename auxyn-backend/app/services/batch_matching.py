@@ -0,0 +1,281 @@
+# app/services/batch_matching.py
+"""Platform-wide batch matching.
+
+Computes matches for every user who opted into auto matching, in both
+directions. The opposite side of the marketplace is loaded once into a
+read-only column snapshot and shared with a multiprocessing pool (inherited
+copy-on-write under fork, sent once per worker otherwise); source profiles are
+partitioned across the workers, and the parent process writes the results back
+in batches.
+"""
+from app import db
+from app.models.user import User
+from app.models.user_preferences import UserPreferences
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.models.match import Match
+from app.services.batch_scoring import StartupColumns, InvestorColumns, score_row, rank_candidates
+from app.services.matching_service import MatchingService
+from app.services.scoring_registry import scoring_registry
+from collections import namedtuple, defaultdict
+from datetime import datetime, timedelta
+import multiprocessing
+import logging
+import json
+import os
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Lightweight, picklable stand-ins for the profile models
+InvestorRow = namedtuple('InvestorRow', [
+    'id', 'user_id', 'preferred_industries_list', 'min_investment', 'max_investment',
+    'investment_stage_list', 'geographic_preference_list'
+])
+StartupRow = namedtuple('StartupRow', [
+    'id', 'user_id', 'industry', 'funding_needed', 'funding_stage', 'headquarters', 'market_size'
+])
+
+MATCH_FREQUENCY_DAYS = {
+    'daily': 1,
+    'weekly': 7,
+    'monthly': 30
+}
+
+# Candidate snapshot for the current worker process
+_snapshot = None
+
+
+def _json_list(value):
+    return json.loads(value) if value else []
+
+
+def load_investor_rows(user_ids=None):
+    """Load investor profiles as InvestorRow tuples, optionally for a user id subquery"""
+    query = db.session.query(
+        InvestorProfile.id,
+        InvestorProfile.user_id,
+        InvestorProfile.preferred_industries,
+        InvestorProfile.min_investment,
+        InvestorProfile.max_investment,
+        InvestorProfile.investment_stage,
+        InvestorProfile.geographic_preference
+    )
+    if user_ids is not None:
+        query = query.filter(InvestorProfile.user_id.in_(user_ids))
+    return [
+        InvestorRow(
+            row.id, row.user_id, _json_list(row.preferred_industries),
+            row.min_investment, row.max_investment,
+            _json_list(row.investment_stage), _json_list(row.geographic_preference)
+        )
+        for row in query.order_by(InvestorProfile.id)
+    ]
+
+
+def load_startup_rows(user_ids=None):
+    """Load startup profiles as StartupRow tuples, optionally for a user id subquery"""
+    query = db.session.query(
+        StartupProfile.id,
+        StartupProfile.user_id,
+        StartupProfile.industry,
+        StartupProfile.funding_needed,
+        StartupProfile.funding_stage,
+        StartupProfile.headquarters,
+        StartupProfile.market_size
+    )
+    if user_ids is not None:
+        query = query.filter(StartupProfile.user_id.in_(user_ids))
+    return [StartupRow(*row) for row in query.order_by(StartupProfile.id)]
+
+
+def due_user_ids(user_type, force=False, as_of=None):
+    """Subquery of users opted into auto matching whose match_frequency window has passed
+
+    Users without a preferences row get the model defaults (opted in, daily).
+    Windows are measured at ``as_of`` (default now), and matches created from
+    then on are ignored, so a run's own writes don't make its users look
+    recently matched.
+    """
+    query = db.session.query(User.id).outerjoin(
+        UserPreferences, UserPreferences.user_id == User.id
+    ).filter(
+        User.user_type == user_type,
+        db.or_(UserPreferences.auto_matching.is_(None), UserPreferences.auto_matching.is_(True))
+    )
+
+    if not force:
+        role_column = Match.investor_id if user_type == 'investor' else Match.startup_id
+        now = as_of or datetime.utcnow()
+        last_matched = db.session.query(
+            role_column.label('user_id'),
+            db.func.max(Match.created_at).label('last_created_at')
+        ).filter(Match.created_at < now).group_by(role_column).subquery()
+
+        frequency = db.func.coalesce(UserPreferences.match_frequency, 'daily')
+        cutoff = db.case(
+            *[(frequency == name, now - timedelta(days=days)) for name, days in MATCH_FREQUENCY_DAYS.items()],
+            else_=now - timedelta(days=MATCH_FREQUENCY_DAYS['daily'])
+        )
+        query = query.outerjoin(last_matched, last_matched.c.user_id == User.id).filter(
+            db.or_(last_matched.c.last_created_at.is_(None), last_matched.c.last_created_at < cutoff)
+        )
+
+    return query
+
+
+def _existing_partners(user_type, user_ids):
+    """Map each source user id (from a subquery) to the partners it is already matched with"""
+    if user_type == 'investor':
+        source, partner = Match.investor_id, Match.startup_id
+    else:
+        source, partner = Match.startup_id, Match.investor_id
+
+    partners = defaultdict(list)
+    for source_id, partner_id in db.session.query(source, partner).filter(source.in_(user_ids)):
+        partners[source_id].append(partner_id)
+    return partners
+
+
+def _init_worker(snapshot):
+    global _snapshot
+    if snapshot is not None:
+        _snapshot = snapshot
+
+
+def _score_partition(task):
+    """Worker: top-K candidates for each source profile in the partition"""
+    sources, excluded, limit, threshold, algorithm = task
+    candidates = _snapshot
+    results = []
+
+    for source in sources:
+        scores = candidates.score(source, algorithm)
+        overall = scores['overall_score']
+
+        eligible = overall > threshold
+        partner_ids = excluded.get(source.user_id)
+        if partner_ids:
+            eligible &= ~np.isin(candidates.user_ids, partner_ids)
+
+        top = rank_candidates(overall, candidates.ids, np.flatnonzero(eligible), limit)
+        results.append((source, [(int(idx), score_row(scores, idx)) for idx in top]))
+
+    return results, len(sources) * len(candidates)
+
+
+class PlatformMatchRun:
+    """One platform-wide matching pass over all due users"""
+
+    def __init__(self, limit=10, workers=None, partition_size=200, batch_size=1000,
+                 force=False, dry_run=False, echo=None):
+        self.limit = limit
+        self.workers = workers or os.cpu_count() or 1
+        self.partition_size = partition_size
+        self.batch_size = batch_size
+        self.force = force
+        self.dry_run = dry_run
+        self.echo = echo or logger.info
+        self.started_at = None
+
+    def run(self):
+        """Match investors to startups, then startups to investors
+
+        Both directions pick their due users as of the start of the run, so
+        startups matched by the investor pass still get their own pass.
+        """
+        self.started_at = datetime.utcnow()
+        return [self._run_direction('investor'), self._run_direction('startup')]
+
+    def _run_direction(self, user_type):
+        global _snapshot
+        started = time.perf_counter()
+
+        # The candidate side is every profile on the other side of the marketplace
+        due = due_user_ids(user_type, self.force, as_of=self.started_at)
+        if user_type == 'investor':
+            sources = load_investor_rows(due)
+            candidates = StartupColumns(load_startup_rows())
+        else:
+            sources = load_startup_rows(due)
+            candidates = InvestorColumns(load_investor_rows())
+
+        # Includes pairs written by the investor pass, so no pair is stored twice
+        excluded = _existing_partners(user_type, due)
+        algorithm = scoring_registry.active()
+        tasks = []
+        for start in range(0, len(sources), self.partition_size):
+            partition = sources[start:start + self.partition_size]
+            tasks.append((
+                partition,
+                {s.user_id: excluded[s.user_id] for s in partition if s.user_id in excluded},
+                self.limit,
+                MatchingService.MATCH_THRESHOLD,
+                algorithm
+            ))
+
+        pairs_scored = 0
+        written = 0
+        pending = []
+
+        if self.workers == 1 or len(tasks) <= 1:
+            _snapshot = candidates
+            partition_results = map(_score_partition, tasks)
+            pool = None
+        else:
+            # Forked workers inherit the snapshot; spawned ones receive it once
+            context = multiprocessing.get_context()
+            inherit = context.get_start_method() == 'fork'
+            if inherit:
+                _snapshot = candidates
+            db.engine.dispose(close=False)
+            pool = context.Pool(
+                processes=self.workers,
+                initializer=_init_worker,
+                initargs=(None if inherit else candidates,)
+            )
+            partition_results = pool.imap_unordered(_score_partition, tasks)
+
+        try:
+            for results, scored in partition_results:
+                pairs_scored += scored
+                for source, top in results:
+                    for idx, match_score in top:
+                        candidate = candidates.profiles[idx]
+                        if user_type == 'investor':
+                            pending.append((source, candidate, match_score))
+                        else:
+                            pending.append((candidate, source, match_score))
+                if len(pending) >= self.batch_size:
+                    written += self._write(pending, algorithm.version)
+                    pending = []
+            written += self._write(pending, algorithm.version)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            _snapshot = None
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            'direction': f"{user_type}s",
+            'sources': len(sources),
+            'candidates': len(candidates),
+            'pairs_scored': pairs_scored,
+            'matches_written': written,
+            'elapsed_seconds': round(elapsed, 3),
+            'pairs_per_second': round(pairs_scored / elapsed) if elapsed > 0 else 0
+        }
+        self.echo(
+            f"{summary['direction']}: {summary['sources']} users x {summary['candidates']} candidates, "
+            f"{pairs_scored:,} pairs scored in {elapsed:.2f}s "
+            f"({summary['pairs_per_second']:,} pairs/s), {written} matches written"
+        )
+        return summary
+
+    def _write(self, scored_pairs, algorithm_version):
+        if not scored_pairs or self.dry_run:
+            return 0
+        MatchingService._persist_matches(scored_pairs, algorithm_version=algorithm_version)
+        return len(scored_pairs)
@@ -0,0 +1,332 @@
+# app/services/batch_scoring.py
+"""Vectorized compatibility scoring.
+
+Scores one profile against N candidates in a single NumPy pass. The candidate
+side is encoded once into integer code columns (industry, stage, region and
+market-size vocabularies) and numeric funding columns, so the per-pair work in
+MatchingService._calculate_compatibility_score is reduced to table lookups and
+array comparisons. Weights and lookup tables come from the scoring algorithm
+(see scoring_registry); components without a vectorized implementation fall
+back to the registered per-pair scorer. Results are identical to the per-pair
+path.
+"""
+import numpy as np
+from app.services.scoring_registry import scoring_registry, stage_distance_score
+
+
+def _encode(values):
+    """Encode scalar values as vocabulary codes; missing (falsy) values map to -1"""
+    vocab = {}
+    codes = np.fromiter(
+        (vocab.setdefault(value, len(vocab)) if value else -1 for value in values),
+        dtype=np.intp,
+        count=len(values)
+    )
+    return list(vocab), codes
+
+
+def _encode_lists(lists):
+    """Encode list values as flat (row, code) pairs over a shared vocabulary"""
+    vocab = {}
+    rows = []
+    codes = []
+    for row, items in enumerate(lists):
+        for item in items:
+            rows.append(row)
+            codes.append(vocab.setdefault(item, len(vocab)))
+    return list(vocab), np.array(rows, dtype=np.intp), np.array(codes, dtype=np.intp)
+
+
+def _lookup(vocab, codes, score_for, missing_score):
+    """Map codes to scores through a per-vocabulary table (index -1 is missing)"""
+    table = np.empty(len(vocab) + 1, dtype=np.float64)
+    for code, value in enumerate(vocab):
+        table[code] = score_for(value)
+    table[-1] = missing_score
+    return table[codes]
+
+
+def _rows_with(size, rows, codes, vocab_mask):
+    """Boolean mask of rows holding at least one item flagged in vocab_mask"""
+    hits = np.zeros(size, dtype=bool)
+    if len(codes):
+        hits[rows[vocab_mask[codes]]] = True
+    return hits
+
+
+def _score_components(columns, profile, algorithm, vectorized, per_pair):
+    """Component score arrays plus the weighted overall, in accumulation order
+
+    ``vectorized`` maps component names to column implementations; any other
+    registered component is scored pair by pair with ``per_pair``.
+    """
+    algorithm = algorithm or scoring_registry.active()
+    tables = algorithm.tables
+    scores = {}
+    overall = 0
+    for name, weight in algorithm.weights:
+        if name in vectorized:
+            values = vectorized[name](profile, tables)
+        else:
+            values = np.fromiter(
+                (per_pair(algorithm, name, profile, candidate) for candidate in columns.profiles),
+                dtype=np.float64,
+                count=len(columns)
+            )
+        scores[name] = values
+        overall = overall + values * weight
+    return {'overall_score': overall, **scores}
+
+
+def score_row(scores, index):
+    """Extract one candidate's scores in the per-pair result format"""
+    return {key: float(values[index]) for key, values in scores.items()}
+
+
+def rank_candidates(overall, ids, eligible, limit):
+    """Order eligible candidate indices best first (score, then lowest id)"""
+    return eligible[np.lexsort((ids[eligible], -overall[eligible]))[:limit]]
+
+
+class StartupColumns:
+    """Startup profiles encoded for scoring against a single investor"""
+
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+        self.ids = np.array([p.id for p in self.profiles], dtype=np.int64)
+        self.user_ids = np.array([p.user_id for p in self.profiles], dtype=np.int64)
+        self.industry_vocab, self.industry = _encode([p.industry for p in self.profiles])
+        self.funding = np.array([p.funding_needed or 0 for p in self.profiles], dtype=np.float64)
+        self.stage_vocab, self.stage = _encode([p.funding_stage for p in self.profiles])
+        self.region_vocab, self.region = _encode([p.headquarters for p in self.profiles])
+        self.market_size_vocab, self.market_size = _encode([p.market_size for p in self.profiles])
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def score(self, investor_profile, algorithm=None):
+        """Score every encoded startup against investor_profile"""
+        return _score_components(self, investor_profile, algorithm, {
+            'industry_score': self._industry_scores,
+            'funding_score': self._funding_scores,
+            'geographic_score': self._geographic_scores,
+            'stage_score': self._stage_scores,
+            'market_size_score': self._market_size_scores
+        }, lambda algorithm, name, investor, startup: algorithm.component(name, investor, startup))
+
+    def _industry_scores(self, investor_profile, tables):
+        investor_industries = investor_profile.preferred_industries_list
+        if not investor_industries:
+            return np.full(len(self), 0.5)
+
+        investor_has_tech = any(ind in tables.tech_industries for ind in investor_industries)
+        investor_has_health = any(ind in tables.health_industries for ind in investor_industries)
+
+        def score_for(industry):
+            if industry in investor_industries:
+                return 1.0
+            if (investor_has_tech and industry.lower() in tables.tech_industries) or \
+               (investor_has_health and industry.lower() in tables.health_industries):
+                return 0.7
+            return 0.2
+
+        return _lookup(self.industry_vocab, self.industry, score_for, 0.5)
+
+    def _funding_scores(self, investor_profile, tables):
+        funding = self.funding
+        min_investment = investor_profile.min_investment or 0
+        max_investment = investor_profile.max_investment or float('inf')
+
+        scores = np.where(
+            funding < min_investment,
+            np.where(funding >= min_investment * 0.5, 0.7, 0.3),
+            np.where(
+                funding <= max_investment,
+                1.0,
+                np.where(funding <= max_investment * 1.5, 0.6, 0.2)
+            )
+        )
+        scores[funding == 0] = 0.5
+        return scores
+
+    def _geographic_scores(self, investor_profile, tables):
+        investor_locations = investor_profile.geographic_preference_list
+        if not investor_locations:
+            return np.full(len(self), 0.7)
+
+        investor_in_us = any(loc.lower() in tables.us_states for loc in investor_locations)
+
+        def score_for(location):
+            if location in investor_locations:
+                return 1.0
+            if investor_in_us and location.lower() in tables.us_states:
+                return 0.8
+            return 0.5
+
+        return _lookup(self.region_vocab, self.region, score_for, 0.7)
+
+    def _stage_scores(self, investor_profile, tables):
+        investor_stages = investor_profile.investment_stage_list
+        if not investor_stages:
+            return np.full(len(self), 0.6)
+
+        stage_order = tables.stage_order
+        investor_indices = [stage_order.index(stage) for stage in investor_stages if stage in stage_order]
+
+        def score_for(stage):
+            if stage in investor_stages:
+                return 1.0
+            if stage not in stage_order or not investor_indices:
+                return 0.4
+            return stage_distance_score(
+                min(abs(stage_order.index(stage) - idx) for idx in investor_indices)
+            )
+
+        return _lookup(self.stage_vocab, self.stage, score_for, 0.6)
+
+    def _market_size_scores(self, investor_profile, tables):
+        return _lookup(
+            self.market_size_vocab,
+            self.market_size,
+            lambda size: tables.market_size_scores.get(size, 0.5),
+            0.6
+        )
+
+
+class InvestorColumns:
+    """Investor profiles encoded for scoring against a single startup"""
+
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+        self.ids = np.array([p.id for p in self.profiles], dtype=np.int64)
+        self.user_ids = np.array([p.user_id for p in self.profiles], dtype=np.int64)
+
+        industries = [p.preferred_industries_list for p in self.profiles]
+        self.has_industries = np.array([bool(items) for items in industries], dtype=bool)
+        self.industry_vocab, self.industry_rows, self.industry = _encode_lists(industries)
+
+        self.min_investment = np.array(
+            [p.min_investment or 0 for p in self.profiles], dtype=np.float64
+        )
+        self.max_investment = np.array(
+            [p.max_investment or float('inf') for p in self.profiles], dtype=np.float64
+        )
+
+        stages = [p.investment_stage_list for p in self.profiles]
+        self.has_stages = np.array([bool(items) for items in stages], dtype=bool)
+        self.stage_vocab, self.stage_rows, self.stage = _encode_lists(stages)
+
+        regions = [p.geographic_preference_list for p in self.profiles]
+        self.has_regions = np.array([bool(items) for items in regions], dtype=bool)
+        self.region_vocab, self.region_rows, self.region = _encode_lists(regions)
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def score(self, startup_profile, algorithm=None):
+        """Score every encoded investor against startup_profile"""
+        return _score_components(self, startup_profile, algorithm, {
+            'industry_score': self._industry_scores,
+            'funding_score': self._funding_scores,
+            'geographic_score': self._geographic_scores,
+            'stage_score': self._stage_scores,
+            'market_size_score': self._market_size_scores
+        }, lambda algorithm, name, startup, investor: algorithm.component(name, investor, startup))
+
+    def _vocab_mask(self, vocab, predicate):
+        return np.array([predicate(value) for value in vocab], dtype=bool)
+
+    def _industry_scores(self, startup_profile, tables):
+        startup_industry = startup_profile.industry
+        size = len(self)
+        if not startup_industry:
+            return np.full(size, 0.5)
+
+        exact = _rows_with(size, self.industry_rows, self.industry,
+                           self._vocab_mask(self.industry_vocab, lambda ind: ind == startup_industry))
+
+        related = np.zeros(size, dtype=bool)
+        if startup_industry.lower() in tables.tech_industries:
+            related |= _rows_with(size, self.industry_rows, self.industry,
+                                  self._vocab_mask(self.industry_vocab, lambda ind: ind in tables.tech_industries))
+        if startup_industry.lower() in tables.health_industries:
+            related |= _rows_with(size, self.industry_rows, self.industry,
+                                  self._vocab_mask(self.industry_vocab, lambda ind: ind in tables.health_industries))
+
+        scores = np.where(exact, 1.0, np.where(related, 0.7, 0.2))
+        scores[~self.has_industries] = 0.5
+        return scores
+
+    def _funding_scores(self, startup_profile, tables):
+        funding_needed = startup_profile.funding_needed
+        if not funding_needed:
+            return np.full(len(self), 0.5)
+
+        min_investment = self.min_investment
+        max_investment = self.max_investment
+        return np.where(
+            funding_needed < min_investment,
+            np.where(funding_needed >= min_investment * 0.5, 0.7, 0.3),
+            np.where(
+                funding_needed <= max_investment,
+                1.0,
+                np.where(funding_needed <= max_investment * 1.5, 0.6, 0.2)
+            )
+        )
+
+    def _geographic_scores(self, startup_profile, tables):
+        startup_location = startup_profile.headquarters
+        size = len(self)
+        if not startup_location:
+            return np.full(size, 0.7)
+
+        exact = _rows_with(size, self.region_rows, self.region,
+                           self._vocab_mask(self.region_vocab, lambda loc: loc == startup_location))
+
+        if startup_location.lower() in tables.us_states:
+            same_country = _rows_with(size, self.region_rows, self.region,
+                                      self._vocab_mask(self.region_vocab, lambda loc: loc.lower() in tables.us_states))
+        else:
+            same_country = np.zeros(size, dtype=bool)
+
+        scores = np.where(exact, 1.0, np.where(same_country, 0.8, 0.5))
+        scores[~self.has_regions] = 0.7
+        return scores
+
+    def _stage_scores(self, startup_profile, tables):
+        startup_stage = startup_profile.funding_stage
+        size = len(self)
+        if not startup_stage:
+            return np.full(size, 0.6)
+
+        exact = _rows_with(size, self.stage_rows, self.stage,
+                           self._vocab_mask(self.stage_vocab, lambda stage: stage == startup_stage))
+
+        stage_order = tables.stage_order
+        if startup_stage in stage_order:
+            startup_idx = stage_order.index(startup_stage)
+            item_diff = np.array(
+                [abs(stage_order.index(stage) - startup_idx) if stage in stage_order else np.inf
+                 for stage in self.stage_vocab],
+                dtype=np.float64
+            )
+            min_diff = np.full(size, np.inf)
+            if len(self.stage):
+                np.minimum.at(min_diff, self.stage_rows, item_diff[self.stage])
+            scores = np.full(size, 0.4)
+            known = np.isfinite(min_diff)
+            # Score each distinct distance once with the per-pair scorer's own thresholds
+            distances, inverse = np.unique(min_diff[known].astype(np.int64), return_inverse=True)
+            scores[known] = np.array([stage_distance_score(d) for d in distances], dtype=np.float64)[inverse]
+        else:
+            scores = np.full(size, 0.4)
+
+        scores[exact] = 1.0
+        scores[~self.has_stages] = 0.6
+        return scores
+
+    def _market_size_scores(self, startup_profile, tables):
+        if not startup_profile.market_size:
+            return np.full(len(self), 0.6)
+        return np.full(len(self), tables.market_size_scores.get(startup_profile.market_size, 0.5))
+
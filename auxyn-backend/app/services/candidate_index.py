@@ -0,0 +1,252 @@
+# app/services/candidate_index.py
+"""In-memory inverted indexes for candidate pruning.
+
+Each side of the marketplace is indexed by the values that drive the
+industry, stage and geographic scores (startup industry / funding_stage /
+headquarters, investor preferred_industries / investment_stage /
+geographic_preference), mapping each value to the profile ids that hold it.
+Missing values are indexed under None.
+
+For a generating profile the index splits the opposite side into tiers with
+a provable upper bound on the overall score:
+
+* promising - industry or stage score can exceed 0.2; no useful bound
+* residual, good region - industry and stage score 0.2, any region
+* residual - industry and stage score 0.2, region score 0.5
+
+Generation scores the tiers in that order and skips a residual tier once
+the top-K heap is full and the tier's bound is below the K-th best score (or
+at or below the match threshold), so the result is identical to a full scan.
+
+Indexes are built lazily and kept current by ORM events on profile writes.
+A cheap signature query (row count, max id, sum of row versions) detects
+writes made by other processes, in which case the index is rebuilt.
+"""
+from app import db
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from collections import defaultdict
+from types import SimpleNamespace
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Best component scores a residual candidate can still reach
+_RESIDUAL_INDUSTRY = 0.2
+_RESIDUAL_STAGE = 0.2
+_BOUND_EPSILON = 1e-9  # Absorbs float rounding in the weighted sum
+
+
+def _scalar_keys(value):
+    return (value or None,)
+
+
+def _list_keys(value):
+    items = json.loads(value) if value else []
+    return tuple(set(items)) or (None,)
+
+
+class CandidateIndex:
+    """Value -> profile id postings for one profile model"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields  # index name -> (column name, key extractor)
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.postings = {name: defaultdict(set) for name in self.fields}
+            self.keys_by_id = {}
+            self.versions = {}
+            self.signature = None
+
+    @property
+    def built(self):
+        return self.signature is not None
+
+    def _keys_for(self, values):
+        return {
+            name: extract(values[column])
+            for name, (column, extract) in self.fields.items()
+        }
+
+    def _current_signature(self):
+        model = self.model
+        count, max_id, version_sum = db.session.query(
+            db.func.count(model.id), db.func.max(model.id), db.func.sum(model.version)
+        ).one()
+        return (count, max_id or 0, version_sum or 0)
+
+    def ensure_fresh(self):
+        """Rebuild if the table changed in ways the ORM events did not see"""
+        with self._lock:
+            signature = self._current_signature()
+            if signature != self.signature:
+                self._build(signature)
+
+    def _build(self, signature):
+        columns = [column for column, _ in self.fields.values()]
+        query = db.session.query(
+            self.model.id, self.model.version, *[getattr(self.model, column) for column in columns]
+        )
+
+        self.postings = {name: defaultdict(set) for name in self.fields}
+        self.keys_by_id = {}
+        self.versions = {}
+        for row in query:
+            self._add(row[0], row[1], self._keys_for(dict(zip(columns, row[2:]))))
+        self.signature = signature
+        logger.info(f"Built {self.model.__tablename__} candidate index over {len(self.keys_by_id)} profiles")
+
+    def _add(self, profile_id, version, keys):
+        self.keys_by_id[profile_id] = keys
+        self.versions[profile_id] = version or 0
+        for name, values in keys.items():
+            postings = self.postings[name]
+            for value in values:
+                postings[value].add(profile_id)
+
+    def _remove(self, profile_id):
+        keys = self.keys_by_id.pop(profile_id, None)
+        if keys is None:
+            return 0
+        for name, values in keys.items():
+            postings = self.postings[name]
+            for value in values:
+                ids = postings.get(value)
+                if ids is not None:
+                    ids.discard(profile_id)
+                    if not ids:
+                        del postings[value]
+        return self.versions.pop(profile_id)
+
+    def _profile_keys(self, profile):
+        return self._keys_for({column: getattr(profile, column) for column, _ in self.fields.values()})
+
+    # ORM event hooks; the signature tracks each row written so it stays valid
+    def on_insert(self, profile):
+        with self._lock:
+            if not self.built:
+                return
+            self._add(profile.id, profile.version, self._profile_keys(profile))
+            count, max_id, version_sum = self.signature
+            self.signature = (count + 1, max(max_id, profile.id), version_sum + (profile.version or 0))
+
+    def on_update(self, profile):
+        with self._lock:
+            if not self.built:
+                return
+            old_version = self._remove(profile.id)
+            self._add(profile.id, profile.version, self._profile_keys(profile))
+            count, max_id, version_sum = self.signature
+            self.signature = (count, max_id, version_sum - old_version + (profile.version or 0))
+
+    def on_delete(self, profile):
+        with self._lock:
+            if self.built:
+                # The max id may have dropped; the next check rebuilds
+                self._remove(profile.id)
+                self.signature = None
+
+    def ids_matching(self, name, predicate):
+        """Union of the postings whose value satisfies predicate"""
+        ids = set()
+        for value, postings in self.postings[name].items():
+            if predicate(value):
+                ids |= postings
+        return ids
+
+    def all_ids(self):
+        return set(self.keys_by_id)
+
+
+class CandidateIndexes:
+    """Startup and investor indexes plus tiered candidate selection"""
+
+    def __init__(self, app=None):
+        self.startups = CandidateIndex(StartupProfile, {
+            'industry': ('industry', _scalar_keys),
+            'stage': ('funding_stage', _scalar_keys),
+            'region': ('headquarters', _scalar_keys)
+        })
+        self.investors = CandidateIndex(InvestorProfile, {
+            'industry': ('preferred_industries', _list_keys),
+            'stage': ('investment_stage', _list_keys),
+            'region': ('geographic_preference', _list_keys)
+        })
+        self.enabled = False
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CANDIDATE_INDEX_ENABLED', True)
+        app.extensions['candidate_indexes'] = self
+        self.enabled = app.config['CANDIDATE_INDEX_ENABLED']
+        # Indexes describe one database; rebuild lazily for this app
+        self.startups.reset()
+        self.investors.reset()
+        if not self._listening:
+            for model, index in ((StartupProfile, self.startups), (InvestorProfile, self.investors)):
+                db.event.listen(model, 'after_insert', lambda mapper, conn, target, index=index: index.on_insert(target))
+                db.event.listen(model, 'after_update', lambda mapper, conn, target, index=index: index.on_update(target))
+                db.event.listen(model, 'after_delete', lambda mapper, conn, target, index=index: index.on_delete(target))
+            self._listening = True
+
+    def candidate_tiers(self, profile, algorithm):
+        """Split the opposite side into (ids, score upper bound) tiers
+
+        Returns None when indexing is disabled, meaning "scan everything".
+        Per-value scores and the bounds use ``algorithm``'s scorers and
+        weights; every component is assumed to score at most 1.0.
+        """
+        if not self.enabled:
+            return None
+
+        if isinstance(profile, InvestorProfile):
+            index = self.startups
+
+            def score(name, **startup_values):
+                return algorithm.component(name, profile, SimpleNamespace(**startup_values))
+
+            industry = lambda key: score('industry_score', industry=key)
+            stage = lambda key: score('stage_score', funding_stage=key)
+            region = lambda key: score('geographic_score', headquarters=key)
+        else:
+            index = self.investors
+
+            def score(name, **investor_values):
+                return algorithm.component(name, SimpleNamespace(**investor_values), profile)
+
+            industry = lambda key: score('industry_score', preferred_industries_list=[key] if key else [])
+            stage = lambda key: score('stage_score', investment_stage_list=[key] if key else [])
+            region = lambda key: score('geographic_score', geographic_preference_list=[key] if key else [])
+
+        with index._lock:
+            index.ensure_fresh()
+            # A list-valued profile scores at most its best single value
+            promising = index.ids_matching('industry', lambda key: industry(key) > _RESIDUAL_INDUSTRY)
+            promising |= index.ids_matching('stage', lambda key: stage(key) > _RESIDUAL_STAGE)
+            good_region = index.ids_matching('region', lambda key: region(key) > 0.5) - promising
+            residual = index.all_ids() - promising - good_region
+
+        def bound(region_score):
+            caps = {
+                'industry_score': _RESIDUAL_INDUSTRY,
+                'stage_score': _RESIDUAL_STAGE,
+                'geographic_score': region_score
+            }
+            return sum(weight * caps.get(name, 1.0) for name, weight in algorithm.weights) + _BOUND_EPSILON
+
+        return [
+            (promising, None),
+            (good_region, bound(1.0)),
+            (residual, bound(0.5))
+        ]
+
+
+candidate_indexes = CandidateIndexes()
@@ -0,0 +1,327 @@
+# app/services/job_service.py
+"""Asynchronous match-generation jobs.
+
+Jobs are rows in the match_jobs table; the table is the queue. A local thread
+or process pool executes them, so no external broker is needed. A worker
+claims a job with an atomic conditional UPDATE and, from a separate
+connection, refreshes the job's heartbeat every MATCH_JOB_HEARTBEAT_SECONDS
+and its progress after every scanned chunk. It writes the generated matches
+and the job's completion in the same transaction. Jobs whose worker died (a
+crashed process or a restarted server) are detected by their stale heartbeat
+and queued again; the check runs when jobs are enqueued or polled, at most
+once every MATCH_JOB_RECOVERY_SECONDS.
+
+A claim is the (worker_id, attempts) pair written when the job was claimed.
+Every later write is conditional on it, so a worker whose job was requeued
+and claimed again while it was still running stops refreshing the job and
+rolls back its matches instead of completing the job a second time.
+"""
+from flask import current_app
+from app import db
+from app.models.match_job import MatchJob
+from app.services.matching_service import MatchingService
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Application used by process-pool workers, created once per worker process
+_worker_app = None
+
+
+def _worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _run_in_worker_process(job_id):
+    """Process-pool entry point: build an app once per process and run the job"""
+    global _worker_app
+    if _worker_app is None:
+        from app import create_app
+        _worker_app = create_app()
+    with _worker_app.app_context():
+        return run_match_job(job_id)
+
+
+def _run_in_app_context(app, job_id):
+    """Thread-pool entry point"""
+    with app.app_context():
+        return run_match_job(job_id)
+
+
+def claim_match_job(job_id):
+    """Atomically move a queued job to running
+
+    Returns the claim, (worker_id, attempts), or None if another worker has
+    the job.
+    """
+    now = datetime.utcnow()
+    worker_id = _worker_id()
+    result = db.session.execute(
+        db.update(MatchJob)
+        .where(MatchJob.id == job_id, MatchJob.status == 'queued')
+        .values(
+            status='running',
+            attempts=MatchJob.attempts + 1,
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now,
+            error=None
+        )
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return None
+    attempts = db.session.execute(db.select(MatchJob.attempts).where(MatchJob.id == job_id)).scalar_one()
+    db.session.commit()
+    return worker_id, attempts
+
+
+def _claimed(job_id, claim):
+    """Conditions matching the job only while it is still running under ``claim``"""
+    worker_id, attempts = claim
+    return (
+        MatchJob.id == job_id,
+        MatchJob.status == 'running',
+        MatchJob.worker_id == worker_id,
+        MatchJob.attempts == attempts
+    )
+
+
+def _record_progress(job_id, claim, **values):
+    """Write progress and heartbeat outside the worker's session transaction"""
+    with db.engine.begin() as connection:
+        connection.execute(
+            db.update(MatchJob)
+            .where(*_claimed(job_id, claim))
+            .values(heartbeat_at=datetime.utcnow(), **values)
+        )
+
+
+class _Heartbeat:
+    """Refreshes a claimed job's heartbeat on a timer, however long a scan step takes"""
+
+    def __init__(self, job_id, claim, interval):
+        self.job_id = job_id
+        self.claim = claim
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(current_app._get_current_object(),),
+            name=f'match-job-{job_id}-heartbeat',
+            daemon=True
+        )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self, app):
+        with app.app_context():
+            while not self._stopped.wait(self.interval):
+                try:
+                    _record_progress(self.job_id, self.claim)
+                except Exception as e:
+                    logger.warning(f"Match job {self.job_id} heartbeat failed: {str(e)}")
+
+
+def run_match_job(job_id):
+    """Execute one generation job; must run inside an application context"""
+    claim = claim_match_job(job_id)
+    if claim is None:
+        logger.info(f"Match job {job_id} already claimed, skipping")
+        return None
+
+    job = db.session.get(MatchJob, job_id)
+    report = {}
+    try:
+        with _Heartbeat(job_id, claim, current_app.config['MATCH_JOB_HEARTBEAT_SECONDS']):
+            matches = MatchingService.generate_matches_for_user(
+                job.user_id,
+                job.match_limit,
+                report=report,
+                progress=lambda scanned, total: _record_progress(
+                    job_id, claim, candidates_scanned=scanned, candidates_total=total
+                ),
+                commit=False
+            )
+
+            # Completing the job commits the generated matches with it
+            match_ids = [match.id for match in matches]
+            completed = db.session.execute(
+                db.update(MatchJob)
+                .where(*_claimed(job_id, claim))
+                .values(
+                    status='completed',
+                    match_ids=json.dumps(match_ids) if match_ids else None,
+                    candidates_scanned=report.get('candidates_scanned', 0),
+                    elapsed_ms=report.get('elapsed_ms'),
+                    finished_at=datetime.utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if completed.rowcount != 1:
+                # Requeued while running; the worker holding the job now writes its matches
+                db.session.rollback()
+                logger.warning(f"Match job {job_id} lost its claim, discarding {len(matches)} matches")
+                return None
+            db.session.commit()
+
+        logger.info(f"Match job {job_id} completed with {len(matches)} matches")
+        return match_ids
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Match job {job_id} failed: {str(e)}")
+        db.session.execute(
+            db.update(MatchJob)
+            .where(*_claimed(job_id, claim))
+            .values(status='failed', error=str(e), finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return None
+
+
+class MatchJobQueue:
+    """Local worker pool executing queued match-generation jobs"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._last_recovery = None  # Monotonic time of the last stale check
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MATCH_JOB_EXECUTOR', 'thread')  # thread, process or sync
+        app.config.setdefault('MATCH_JOB_WORKERS', 2)
+        app.config.setdefault('MATCH_JOB_STALE_SECONDS', 300)
+        app.config.setdefault('MATCH_JOB_HEARTBEAT_SECONDS', 30)
+        app.config.setdefault('MATCH_JOB_MAX_ATTEMPTS', 3)
+        app.config.setdefault('MATCH_JOB_RECOVERY_SECONDS', 60)
+        app.extensions['match_jobs'] = self
+        self.app = app
+        with self._lock:
+            self._last_recovery = None
+
+    def enqueue(self, user_id, limit=10):
+        """Persist a new job and hand it to the worker pool"""
+        self.recover()
+
+        job = MatchJob(user_id=user_id, match_limit=limit, status='queued')
+        db.session.add(job)
+        db.session.commit()
+
+        self._submit(job.id)
+        logger.info(f"Queued match job {job.id} for user {user_id}")
+        return job
+
+    def recover(self, force=False):
+        """Requeue jobs left behind by crashed workers and resubmit them
+
+        Runs at most once every MATCH_JOB_RECOVERY_SECONDS unless forced. The
+        first run in a process (and a forced one) also resubmits every queued
+        job, since jobs queued before a restart have no worker. Workers that
+        lose a claim race simply skip the job, so several processes
+        recovering at once is safe.
+        """
+        config = self.app.config
+        now = time.monotonic()
+        with self._lock:
+            first_run = self._last_recovery is None
+            if not (force or first_run or now - self._last_recovery >= config['MATCH_JOB_RECOVERY_SECONDS']):
+                return
+            self._last_recovery = now
+
+        stale_before = datetime.utcnow() - timedelta(seconds=config['MATCH_JOB_STALE_SECONDS'])
+        stale_jobs = MatchJob.query.filter(
+            MatchJob.status == 'running',
+            MatchJob.heartbeat_at < stale_before
+        ).all()
+        for job in stale_jobs:
+            self._retry_or_fail(job, 'Worker stopped responding')
+        db.session.commit()
+
+        if force or first_run:
+            queued_ids = [job_id for (job_id,) in db.session.query(MatchJob.id).filter_by(status='queued')]
+        else:
+            queued_ids = [job.id for job in stale_jobs if job.status == 'queued']
+        for job_id in queued_ids:
+            self._submit(job_id)
+        if stale_jobs or queued_ids:
+            logger.info(f"Recovered {len(stale_jobs)} stale and resubmitted {len(queued_ids)} queued match jobs")
+
+    def _retry_or_fail(self, job, reason):
+        if (job.attempts or 0) < self.app.config['MATCH_JOB_MAX_ATTEMPTS']:
+            job.status = 'queued'
+        else:
+            job.status = 'failed'
+            job.error = reason
+            job.finished_at = datetime.utcnow()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self.app.config['MATCH_JOB_WORKERS']
+                if self.app.config['MATCH_JOB_EXECUTOR'] == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix='match-job'
+                    )
+            return self._executor
+
+    def _submit(self, job_id):
+        mode = self.app.config['MATCH_JOB_EXECUTOR']
+        if mode == 'sync':
+            run_match_job(job_id)
+            return
+
+        executor = self._get_executor()
+        if mode == 'process':
+            future = executor.submit(_run_in_worker_process, job_id)
+        else:
+            future = executor.submit(_run_in_app_context, self.app, job_id)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id, future):
+        error = future.exception()
+        if error is None:
+            return
+
+        logger.error(f"Worker running match job {job_id} crashed: {error}")
+        if isinstance(error, BrokenProcessPool):
+            # Replace the dead pool; the next submit builds a fresh one
+            with self._lock:
+                self._executor = None
+
+        with self.app.app_context():
+            job = db.session.get(MatchJob, job_id)
+            if job and job.status == 'running':
+                self._retry_or_fail(job, str(error))
+                db.session.commit()
+                if job.status == 'queued':
+                    self._submit(job_id)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+match_jobs = MatchJobQueue()
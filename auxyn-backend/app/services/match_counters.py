@@ -0,0 +1,294 @@
+# app/services/match_counters.py
+"""Per-user match counter rollups.
+
+Every match counts once towards each participant's ``match_counters`` row
+(and, for the investor, towards a ``match_reason_counters`` row for its
+leading reason). A before_flush listener turns each flushed Match insert,
+change or delete into counter deltas -- the match's contribution after the
+change minus its contribution before -- and applies them with relative
+UPDATEs on the flush's own connection, so the counters commit or roll back
+together with the state transition that caused them. Dashboard endpoints
+then read one row instead of aggregating the matches table.
+
+Rows written with Core bulk statements bypass the listener; callers doing
+that either pass their own deltas to ``apply`` (the view buffer) or rebuild
+the counters afterwards (the seeder), and
+``flask match reconcile-counters`` rebuilds them and reports any drift.
+"""
+from app import db
+from app.models.match import Match
+from app.models.match_counter import MatchCounter, MatchReasonCounter
+from app.utils.upsert import insert_missing
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import datetime
+import json
+import math
+
+HIGH_QUALITY_SCORE = 0.8
+COUNTER_FIELDS = (
+    'total', 'pending', 'viewed', 'interested', 'not_interested',
+    'mutual', 'investor_interested', 'high_quality', 'score_sum'
+)
+
+# Match attributes that feed the counters
+TRACKED_ATTRIBUTES = (
+    'investor_id', 'startup_id', 'status', 'investor_interest', 'startup_interest',
+    'compatibility_score', 'match_reasons'
+)
+
+
+def leading_reason(match_reasons):
+    """First match reason of a match_reasons JSON value ('' when none)"""
+    try:
+        reasons = json.loads(match_reasons) if match_reasons else []
+    except ValueError:
+        return ''
+    return reasons[0] if reasons else ''
+
+
+def contributions(state):
+    """(user_id, counts) for each participant, plus the investor's leading reason"""
+    mutual = state['investor_interest'] == 'interested' and state['startup_interest'] == 'interested'
+    score = state['compatibility_score'] or 0.0
+    shared = {
+        'total': 1,
+        'pending': int(state['status'] == 'pending'),
+        'viewed': int(state['status'] == 'viewed'),
+        'mutual': int(mutual),
+        'investor_interested': int(state['investor_interest'] == 'interested'),
+        'high_quality': int(score >= HIGH_QUALITY_SCORE),
+        'score_sum': score
+    }
+    counts = []
+    for user_key, interest_key in (('investor_id', 'investor_interest'), ('startup_id', 'startup_interest')):
+        counts.append((state[user_key], {
+            **shared,
+            'interested': int(state[interest_key] == 'interested'),
+            'not_interested': int(state[interest_key] == 'not_interested')
+        }))
+    return counts, leading_reason(state['match_reasons'])
+
+
+def _column_default(attribute):
+    default = Match.__table__.c[attribute].default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+def _match_state(match, before):
+    """Tracked attribute values of a match before or after the pending flush"""
+    match_state = inspect(match)
+    if before and match_state.persistent:
+        for attribute in match_state.expired_attributes & set(TRACKED_ATTRIBUTES):
+            getattr(match, attribute)  # Unmodified expired values are not in the history
+    attrs = match_state.attrs
+    state = {}
+    for attribute in TRACKED_ATTRIBUTES:
+        history = attrs[attribute].history
+        if before:
+            values = history.deleted or history.unchanged
+        else:
+            values = history.added or history.unchanged
+        value = values[0] if values else None
+        if value is None and not before and match_state.pending:
+            value = _column_default(attribute)  # Column defaults are applied at INSERT
+        state[attribute] = value
+    return state
+
+
+class MatchCounters:
+    """Keeps match_counters in step with Match writes"""
+
+    def __init__(self, app=None):
+        self._registered = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['match_counters'] = self
+        if not self._registered:
+            # Load the previous value on set, so deltas never miss an expired attribute
+            for attribute in TRACKED_ATTRIBUTES:
+                event.listen(getattr(Match, attribute), 'set', lambda *args: None, active_history=True)
+            event.listen(Session, 'before_flush', self._before_flush)
+            self._registered = True
+
+    def _before_flush(self, session, flush_context, instances):
+        counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        reasons = defaultdict(int)
+
+        def add(state, sign):
+            counts, reason = contributions(state)
+            for user_id, values in counts:
+                if user_id is None:
+                    continue
+                for field, value in values.items():
+                    counters[user_id][field] += sign * value
+            if state['investor_id'] is not None:
+                reasons[(state['investor_id'], reason)] += sign
+
+        for match in session.new:
+            if isinstance(match, Match):
+                add(_match_state(match, before=False), 1)
+        for match in session.dirty:
+            if isinstance(match, Match) and session.is_modified(match):
+                add(_match_state(match, before=True), -1)
+                add(_match_state(match, before=False), 1)
+        for match in session.deleted:
+            if isinstance(match, Match):
+                add(_match_state(match, before=True), -1)
+
+        counters = {
+            user_id: values for user_id, values in counters.items()
+            if any(not math.isclose(value, 0, abs_tol=1e-12) for value in values.values())
+        }
+        reasons = {key: delta for key, delta in reasons.items() if delta}
+        if counters or reasons:
+            self.apply(session.connection(), counters, reasons)
+
+    def apply(self, conn, counters, reasons):
+        """Add {user_id: {field: delta}} and {(user_id, reason): delta} on ``conn``'s transaction"""
+        now = datetime.utcnow()
+        table = MatchCounter.__table__
+        if counters:
+            # Zero rows for first-seen users; concurrent creators skip instead of conflicting
+            insert_missing(conn, table, [
+                {'user_id': user_id, **dict.fromkeys(COUNTER_FIELDS, 0), 'updated_at': now}
+                for user_id in sorted(counters)
+            ])
+            conn.execute(
+                table.update().where(table.c.user_id == db.bindparam('counter_user_id')).values(
+                    updated_at=now,
+                    **{field: table.c[field] + db.bindparam(f'delta_{field}') for field in COUNTER_FIELDS}
+                ),
+                [
+                    {'counter_user_id': user_id, **{f'delta_{field}': values[field] for field in COUNTER_FIELDS}}
+                    for user_id, values in counters.items()
+                ]
+            )
+
+        if reasons:
+            table = MatchReasonCounter.__table__
+            insert_missing(conn, table, [
+                {'user_id': user_id, 'reason': reason, 'count': 0} for user_id, reason in sorted(reasons)
+            ])
+            conn.execute(
+                table.update().where(
+                    table.c.user_id == db.bindparam('counter_user_id'),
+                    table.c.reason == db.bindparam('counter_reason')
+                ).values(count=table.c.count + db.bindparam('delta')),
+                [
+                    {'counter_user_id': user_id, 'counter_reason': reason, 'delta': delta}
+                    for (user_id, reason), delta in reasons.items()
+                ]
+            )
+
+    @staticmethod
+    def read(user_id, with_reasons=False):
+        """Counter values for a user in one query (zeros when the user has no matches)
+
+        With ``with_reasons`` the investor's (reason, count) pairs are joined
+        in and returned under 'reasons', with '' mapped back to None.
+        """
+        columns = [getattr(MatchCounter, field) for field in COUNTER_FIELDS]
+        if with_reasons:
+            rows = db.session.query(*columns, MatchReasonCounter.reason, MatchReasonCounter.count).outerjoin(
+                MatchReasonCounter,
+                db.and_(MatchReasonCounter.user_id == MatchCounter.user_id, MatchReasonCounter.count > 0)
+            ).filter(MatchCounter.user_id == user_id).order_by(MatchReasonCounter.reason).all()
+        else:
+            rows = db.session.query(*columns).filter(MatchCounter.user_id == user_id).all()
+
+        values = {field: getattr(rows[0], field) if rows else 0 for field in COUNTER_FIELDS}
+        if with_reasons:
+            values['reasons'] = [(row.reason or None, row.count) for row in rows if row.count]
+        return values
+
+    @staticmethod
+    def expected():
+        """Counters recomputed from the matches table: ({user_id: counts}, {(user_id, reason): count})"""
+        def count_where(condition):
+            return db.func.sum(db.case((condition, 1), else_=0))
+
+        counters = {}
+        for participant, own_interest in ((Match.investor_id, Match.investor_interest),
+                                          (Match.startup_id, Match.startup_interest)):
+            rows = db.session.query(
+                participant.label('user_id'),
+                db.func.count(Match.id).label('total'),
+                count_where(Match.status == 'pending').label('pending'),
+                count_where(Match.status == 'viewed').label('viewed'),
+                count_where(own_interest == 'interested').label('interested'),
+                count_where(own_interest == 'not_interested').label('not_interested'),
+                count_where(db.and_(
+                    Match.investor_interest == 'interested', Match.startup_interest == 'interested'
+                )).label('mutual'),
+                count_where(Match.investor_interest == 'interested').label('investor_interested'),
+                count_where(Match.compatibility_score >= HIGH_QUALITY_SCORE).label('high_quality'),
+                db.func.coalesce(db.func.sum(Match.compatibility_score), 0.0).label('score_sum')
+            ).group_by(participant)
+            for row in rows:
+                counts = counters.setdefault(row.user_id, dict.fromkeys(COUNTER_FIELDS, 0))
+                for field in COUNTER_FIELDS:
+                    counts[field] += getattr(row, field)
+
+        reasons = defaultdict(int)
+        for investor_id, match_reasons in db.session.query(Match.investor_id, Match.match_reasons):
+            reasons[(investor_id, leading_reason(match_reasons))] += 1
+        return counters, dict(reasons)
+
+    def reconcile(self, fix=True):
+        """Rebuild the counters from the matches table and report drift
+
+        Returns a report with the users checked and one entry per drifted
+        value; with ``fix`` the tables are replaced by the recomputed rows in
+        the current transaction (the caller commits).
+        """
+        expected, expected_reasons = self.expected()
+        stored = {
+            row.user_id: {field: getattr(row, field) for field in COUNTER_FIELDS}
+            for row in db.session.query(MatchCounter.user_id, *[getattr(MatchCounter, f) for f in COUNTER_FIELDS])
+        }
+        stored_reasons = {
+            (user_id, reason): count
+            for user_id, reason, count in db.session.query(
+                MatchReasonCounter.user_id, MatchReasonCounter.reason, MatchReasonCounter.count
+            )
+            if count
+        }
+
+        zeros = dict.fromkeys(COUNTER_FIELDS, 0)
+        drift = []
+        for user_id in sorted(set(expected) | set(stored)):
+            want, have = expected.get(user_id, zeros), stored.get(user_id, zeros)
+            for field in COUNTER_FIELDS:
+                if not math.isclose(want[field], have[field], rel_tol=1e-9, abs_tol=1e-9):
+                    drift.append({'user_id': user_id, 'field': field, 'expected': want[field], 'stored': have[field]})
+        for user_id, reason in sorted(set(expected_reasons) | set(stored_reasons)):
+            want, have = expected_reasons.get((user_id, reason), 0), stored_reasons.get((user_id, reason), 0)
+            if want != have:
+                drift.append({'user_id': user_id, 'field': f'reason:{reason}', 'expected': want, 'stored': have})
+
+        if fix:
+            now = datetime.utcnow()
+            db.session.execute(db.delete(MatchReasonCounter))
+            db.session.execute(db.delete(MatchCounter))
+            if expected:
+                db.session.execute(db.insert(MatchCounter), [
+                    {'user_id': user_id, **counts, 'updated_at': now} for user_id, counts in expected.items()
+                ])
+            if expected_reasons:
+                db.session.execute(db.insert(MatchReasonCounter), [
+                    {'user_id': user_id, 'reason': reason, 'count': count}
+                    for (user_id, reason), count in expected_reasons.items()
+                ])
+
+        return {
+            'users': len(set(expected) | set(stored)),
+            'drifted_users': len({d['user_id'] for d in drift}),
+            'drift': drift
+        }
+
+
+match_counters = MatchCounters()
@@ -5,297 +5,446 @@ from app.models.investor_profile import InvestorProfile
 from app.models.startup_profile import StartupProfile
 from app.models.match import Match
 from app.models.match_insight import MatchInsight
+from app.services.batch_scoring import StartupColumns, InvestorColumns, score_row, rank_candidates
+from app.services.scoring_registry import scoring_registry
+from app.services.candidate_index import candidate_indexes
+from app.services.score_cache import score_cache
+from app.services.match_counters import match_counters, COUNTER_FIELDS
 from datetime import datetime, timedelta
 import logging
+import base64
+import binascii
 import json
+import heapq
+import time
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 class MatchingService:
     
+    MATCH_THRESHOLD = 0.3  # Only create matches above this score
+    CANDIDATE_CHUNK_SIZE = 1000  # Candidate profiles scored per batch
+    
+    # Profile columns that feed the compatibility score
+    INVESTOR_MATCHING_FIELDS = (
+        'preferred_industries', 'min_investment', 'max_investment',
+        'investment_stage', 'geographic_preference'
+    )
+    STARTUP_MATCHING_FIELDS = (
+        'industry', 'funding_needed', 'funding_stage', 'headquarters', 'market_size'
+    )
+    
+    INTEREST_VALUES = ('interested', 'not_interested', 'pending')
+    
+    # Partner profile columns shown on match list cards
+    INVESTOR_CARD_FIELDS = (
+        'name', 'title', 'company', 'bio', 'location',
+        'preferred_industries', 'min_investment', 'max_investment'
+    )
+    STARTUP_CARD_FIELDS = (
+        'company_name', 'tagline', 'industry', 'company_stage',
+        'funding_needed', 'funding_stage', 'headquarters', 'logo_url'
+    )
+    
     @staticmethod
-    def generate_matches_for_user(user_id, limit=10):
-        """Generate matches for a specific user (investor or startup)"""
+    def generate_matches_for_user(user_id, limit=10, report=None, progress=None, commit=True):
+        """Generate matches for a specific user (investor or startup)
+        
+        If ``report`` is a dict it is filled with scan statistics
+        (candidates scanned and elapsed time). ``progress`` is called as
+        ``progress(scanned, total)`` after each scored chunk. With
+        ``commit=False`` the new rows are flushed but left for the caller
+        to commit.
+        """
         user = User.query.get(user_id)
         if not user:
             raise ValueError("User not found")
         
+        if report is None:
+            report = {}
+        
         if user.user_type == 'investor':
-            return MatchingService._generate_matches_for_investor(user_id, limit)
+            return MatchingService._generate_matches_for_investor(user_id, limit, report, progress, commit)
         elif user.user_type == 'startup':
-            return MatchingService._generate_matches_for_startup(user_id, limit)
+            return MatchingService._generate_matches_for_startup(user_id, limit, report, progress, commit)
         else:
             raise ValueError("Invalid user type")
     
     @staticmethod
-    def _generate_matches_for_investor(investor_id, limit=10):
+    def _generate_matches_for_investor(investor_id, limit=10, report=None, progress=None, commit=True):
         """Generate startup matches for an investor"""
         investor_profile = InvestorProfile.query.filter_by(user_id=investor_id).first()
         if not investor_profile:
             raise ValueError("Investor profile not found")
         
-        # Get all startup profiles
-        startup_profiles = StartupProfile.query.all()
-        
-        # Filter out existing matches
-        existing_matches = Match.query.filter_by(investor_id=investor_id).all()
-        existing_startup_ids = {match.startup_id for match in existing_matches}
+        # Stream startups not already matched with this investor
+        matched_startup_ids = db.select(Match.startup_id).filter_by(investor_id=investor_id)
+        candidates = StartupProfile.query.filter(
+            ~StartupProfile.user_id.in_(matched_startup_ids)
+        )
         
-        matches = []
-        for startup_profile in startup_profiles:
-            if startup_profile.user_id in existing_startup_ids:
-                continue
-            
-            if len(matches) >= limit:
-                break  
-                
-            match_score = MatchingService._calculate_compatibility_score(
-                investor_profile, startup_profile
-            )
-            
-            if match_score['overall_score'] > 0.3:  # Only create matches above threshold
-                match = MatchingService._create_match_record(
-                    investor_id, startup_profile.user_id, match_score
-                )
-                matches.append(match)
+        # One algorithm for the whole scan, even if the config reloads meanwhile
+        algorithm = scoring_registry.active()
+        tiers = candidate_indexes.candidate_tiers(investor_profile, algorithm)
+        top_candidates = MatchingService._select_top_candidates(
+            investor_profile, StartupProfile, candidates, StartupColumns, limit, report, progress, tiers, algorithm
+        )
         
-        # Sort by compatibility score
-        matches.sort(key=lambda x: x.compatibility_score, reverse=True)
-        return matches[:limit]
+        scored_pairs = [
+            (investor_profile, startup_profile, match_score)
+            for startup_profile, match_score in top_candidates
+        ]
+        return MatchingService._persist_matches(scored_pairs, commit=commit, algorithm_version=algorithm.version)
     
     @staticmethod
-    def _generate_matches_for_startup(startup_id, limit=10):
+    def _generate_matches_for_startup(startup_id, limit=10, report=None, progress=None, commit=True):
         """Generate investor matches for a startup"""
         startup_profile = StartupProfile.query.filter_by(user_id=startup_id).first()
         if not startup_profile:
             raise ValueError("Startup profile not found")
         
-        # Get all investor profiles
-        investor_profiles = InvestorProfile.query.all()
+        # Stream investors not already matched with this startup
+        matched_investor_ids = db.select(Match.investor_id).filter_by(startup_id=startup_id)
+        candidates = InvestorProfile.query.filter(
+            ~InvestorProfile.user_id.in_(matched_investor_ids)
+        )
         
-        # Filter out existing matches
-        existing_matches = Match.query.filter_by(startup_id=startup_id).all()
-        existing_investor_ids = {match.investor_id for match in existing_matches}
+        # One algorithm for the whole scan, even if the config reloads meanwhile
+        algorithm = scoring_registry.active()
+        tiers = candidate_indexes.candidate_tiers(startup_profile, algorithm)
+        top_candidates = MatchingService._select_top_candidates(
+            startup_profile, InvestorProfile, candidates, InvestorColumns, limit, report, progress, tiers, algorithm
+        )
         
-        matches = []
-        for investor_profile in investor_profiles:
-            if investor_profile.user_id in existing_investor_ids:
+        scored_pairs = [
+            (investor_profile, startup_profile, match_score)
+            for investor_profile, match_score in top_candidates
+        ]
+        return MatchingService._persist_matches(scored_pairs, commit=commit, algorithm_version=algorithm.version)
+    
+    @staticmethod
+    def _iter_candidate_chunks(model, query, chunk_size, ids=None):
+        """Yield lists of candidate profiles in primary key order
+        
+        Each chunk is a separate keyset query rather than one long-lived
+        cursor, so no read lock is held between chunks and progress can be
+        written from another connection while the scan runs. With ``ids``
+        only those profiles are fetched, a bounded slice of ids per query.
+        """
+        if ids is not None:
+            ids = sorted(ids)
+            for start in range(0, len(ids), chunk_size):
+                chunk = query.filter(
+                    model.id.in_(ids[start:start + chunk_size])
+                ).order_by(model.id).all()
+                if chunk:
+                    yield chunk
+            return
+        
+        last_id = 0
+        while True:
+            chunk = query.filter(model.id > last_id).order_by(model.id).limit(chunk_size).all()
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last_id = chunk[-1].id
+    
+    @staticmethod
+    def _select_top_candidates(profile, model, query, columns_class, limit, report=None, progress=None,
+                               tiers=None, algorithm=None):
+        """Scan candidates and keep the best ``limit`` above the threshold
+        
+        Candidates are scored chunk by chunk and only a bounded min-heap of the
+        best entries survives between chunks, so memory stays O(limit + chunk).
+        Ties on score are broken by profile id (lowest first), which makes the
+        result independent of chunk boundaries and scan order.
+        
+        ``tiers`` is an optional list of (profile_ids, score_upper_bound)
+        from the candidate indexes. A tier is skipped when no candidate in it
+        could make the result: its bound is at or below the threshold, or the
+        heap is full and the bound is below the current K-th best score.
+        Without tiers every candidate is scanned. ``algorithm`` defaults to the
+        active scoring algorithm.
+        
+        Returns (candidate_profile, match_score) pairs, best first.
+        """
+        started = time.perf_counter()
+        scanned = 0
+        skipped = 0
+        heap = []  # (score, -profile_id, profile, match_score); worst entry on top
+        total = query.order_by(None).count() if progress else None
+        chunk_size = MatchingService.CANDIDATE_CHUNK_SIZE
+        algorithm = algorithm or scoring_registry.active()
+        
+        if tiers is None:
+            tiers = [(None, None)]
+        
+        for tier_ids, bound in (tiers if limit > 0 else []):
+            if bound is not None and (
+                bound <= MatchingService.MATCH_THRESHOLD or
+                (len(heap) >= limit and bound < heap[0][0])
+            ):
+                skipped += len(tier_ids)
                 continue
             
-            if len(matches) >= limit:
-                break
+            for chunk in MatchingService._iter_candidate_chunks(model, query, chunk_size, tier_ids):
+                scanned += len(chunk)
+                if progress:
+                    progress(scanned, total)
+                scores = MatchingService.score_partners(profile, chunk, columns_class, algorithm)
+                ids = np.array([candidate.id for candidate in chunk], dtype=np.int64)
+                overall = scores['overall_score']
                 
-            match_score = MatchingService._calculate_compatibility_score(
-                investor_profile, startup_profile
-            )
-            
-            if match_score['overall_score'] > 0.3:  # Only create matches above threshold
-                match = MatchingService._create_match_record(
-                    investor_profile.user_id, startup_id, match_score
-                )
-                matches.append(match)
-        
-        # Sort by compatibility score
-        matches.sort(key=lambda x: x.compatibility_score, reverse=True)
-        return matches[:limit]
+                eligible = np.flatnonzero(overall > MatchingService.MATCH_THRESHOLD)
+                if len(heap) >= limit:
+                    eligible = eligible[overall[eligible] >= heap[0][0]]
+                if not len(eligible):
+                    continue
+                
+                # Best ``limit`` of this chunk, by score then lowest id
+                for idx in rank_candidates(overall, ids, eligible, limit):
+                    entry = (float(overall[idx]), -int(ids[idx]))
+                    if len(heap) < limit:
+                        heapq.heappush(heap, entry + (chunk[idx], score_row(scores, idx)))
+                    elif entry > heap[0][:2]:
+                        heapq.heapreplace(heap, entry + (chunk[idx], score_row(scores, idx)))
+                    else:
+                        break  # Remaining chunk entries rank lower still
+        
+        elapsed = time.perf_counter() - started
+        if report is not None:
+            report['candidates_scanned'] = scanned
+            report['candidates_skipped'] = skipped
+            report['elapsed_ms'] = round(elapsed * 1000, 2)
+        logger.info(f"Scanned {scanned} candidates ({skipped} pruned) in {elapsed * 1000:.1f}ms, kept {len(heap)}")
+        
+        heap.sort(reverse=True)
+        return [(candidate, match_score) for _, _, candidate, match_score in heap]
     
     @staticmethod
-    def _calculate_compatibility_score(investor_profile, startup_profile):
-        """Calculate compatibility score between investor and startup"""
-        scores = {
-            'industry_score': 0.0,
-            'funding_score': 0.0,
-            'geographic_score': 0.0,
-            'stage_score': 0.0,
-            'market_size_score': 0.0
-        }
-        
-        # Industry alignment (30% weight)
-        scores['industry_score'] = MatchingService._calculate_industry_score(
-            investor_profile, startup_profile
-        )
-        
-        # Funding compatibility (25% weight)
-        scores['funding_score'] = MatchingService._calculate_funding_score(
-            investor_profile, startup_profile
-        )
-        
-        # Geographic preference (15% weight)
-        scores['geographic_score'] = MatchingService._calculate_geographic_score(
-            investor_profile, startup_profile
-        )
-        
-        # Investment stage alignment (20% weight)
-        scores['stage_score'] = MatchingService._calculate_stage_score(
-            investor_profile, startup_profile
+    def score_pair(investor_profile, startup_profile, algorithm=None):
+        """Compatibility score for one pair, served from the score cache when possible"""
+        algorithm = algorithm or scoring_registry.active()
+        key = score_cache.key_for(investor_profile, startup_profile, algorithm.version)
+        return score_cache.get_or_compute(
+            key,
+            lambda: algorithm.score(investor_profile, startup_profile)
         )
+    
+    @staticmethod
+    def score_partners(profile, partners, columns_class, algorithm):
+        """Score arrays for ``partners`` against ``profile``, read through the score cache
+        
+        Cached pairs are served from the cache; only the misses are encoded
+        with ``columns_class`` and scored, in one batch, and their scores
+        are added to the cache. Returns the same {component: array} mapping
+        as ``columns_class(partners).score(profile, algorithm)``.
+        """
+        # A profile with unflushed edits still carries its old version
+        if score_cache.maxsize <= 0 or not partners or db.session.is_modified(profile):
+            return columns_class(partners).score(profile, algorithm)
+        
+        if isinstance(profile, InvestorProfile):
+            keys = [score_cache.key_for(profile, partner, algorithm.version) for partner in partners]
+        else:
+            keys = [score_cache.key_for(partner, profile, algorithm.version) for partner in partners]
+        cached = [score_cache.get(key) for key in keys]
+        missing = [idx for idx, match_score in enumerate(cached) if match_score is None]
+        
+        if missing:
+            scores = columns_class([partners[idx] for idx in missing]).score(profile, algorithm)
+            for row, idx in enumerate(missing):
+                score_cache.put(keys[idx], score_row(scores, row))
+            if len(missing) == len(partners):
+                return scores
+        else:
+            scores = {name: np.empty(0) for name in cached[0]}
+        
+        merged = {name: np.empty(len(partners)) for name in scores}
+        hits = [idx for idx, match_score in enumerate(cached) if match_score is not None]
+        for name, values in merged.items():
+            values[missing] = scores[name]
+            values[hits] = [cached[idx][name] for idx in hits]
+        return merged
+    
+    @staticmethod
+    def _calculate_compatibility_score(investor_profile, startup_profile, algorithm=None):
+        """Calculate compatibility score between investor and startup
         
-        # Market size alignment (10% weight)
-        scores['market_size_score'] = MatchingService._calculate_market_size_score(
-            investor_profile, startup_profile
-        )
-        
-        # Calculate weighted overall score
-        weights = {
-            'industry_score': 0.30,
-            'funding_score': 0.25,
-            'geographic_score': 0.15,
-            'stage_score': 0.20,
-            'market_size_score': 0.10
-        }
-        
-        overall_score = sum(scores[key] * weights[key] for key in scores)
-        
-        return {
-            'overall_score': overall_score,
-            **scores
-        }
+        Components and weights come from the scoring algorithm (the active
+        one by default); see scoring_registry.
+        """
+        return (algorithm or scoring_registry.active()).score(investor_profile, startup_profile)
     
     @staticmethod
     def _calculate_industry_score(investor_profile, startup_profile):
         """Calculate industry alignment score"""
-        investor_industries = investor_profile.preferred_industries_list
-        startup_industry = startup_profile.industry
-        
-        if not investor_industries or not startup_industry:
-            return 0.5  # Neutral score if data missing
-        
-        # Exact match
-        if startup_industry in investor_industries:
-            return 1.0
-        
-        # Related industry matching (simplified)
-        tech_industries = ['technology', 'software', 'ai', 'fintech', 'edtech']
-        health_industries = ['healthcare', 'biotech', 'medtech', 'pharma']
-        
-        investor_has_tech = any(ind in tech_industries for ind in investor_industries)
-        startup_is_tech = startup_industry.lower() in tech_industries
-        
-        investor_has_health = any(ind in health_industries for ind in investor_industries)
-        startup_is_health = startup_industry.lower() in health_industries
-        
-        if (investor_has_tech and startup_is_tech) or (investor_has_health and startup_is_health):
-            return 0.7
-        
-        return 0.2  # Low but not zero for different industries
+        return scoring_registry.active().component('industry_score', investor_profile, startup_profile)
     
     @staticmethod
     def _calculate_funding_score(investor_profile, startup_profile):
         """Calculate funding compatibility score"""
-        if not startup_profile.funding_needed:
-            return 0.5
-        
-        funding_needed = startup_profile.funding_needed
-        min_investment = investor_profile.min_investment or 0
-        max_investment = investor_profile.max_investment or float('inf')
-        
-        if min_investment <= funding_needed <= max_investment:
-            return 1.0
-        elif funding_needed < min_investment:
-            # Startup needs less than investor minimum
-            if funding_needed >= min_investment * 0.5:
-                return 0.7  # Close enough
-            else:
-                return 0.3  # Too small
-        else:
-            # Startup needs more than investor maximum
-            if funding_needed <= max_investment * 1.5:
-                return 0.6  # Slightly over budget
-            else:
-                return 0.2  # Way over budget
+        return scoring_registry.active().component('funding_score', investor_profile, startup_profile)
     
     @staticmethod
     def _calculate_geographic_score(investor_profile, startup_profile):
         """Calculate geographic compatibility score"""
-        investor_locations = investor_profile.geographic_preference_list
-        startup_location = startup_profile.headquarters
-        
-        if not investor_locations or not startup_location:
-            return 0.7  # Assume neutral/good if no preference specified
-        
-        # Exact location match
-        if startup_location in investor_locations:
-            return 1.0
-        
-        # Region-based matching (simplified)
-        us_states = ['california', 'new york', 'texas', 'florida', 'washington']
-        if any(loc.lower() in us_states for loc in investor_locations) and \
-           startup_location.lower() in us_states:
-            return 0.8  # Same country
-        
-        return 0.5  # Different regions but not penalized heavily
+        return scoring_registry.active().component('geographic_score', investor_profile, startup_profile)
     
     @staticmethod
     def _calculate_stage_score(investor_profile, startup_profile):
         """Calculate investment stage compatibility"""
-        investor_stages = investor_profile.investment_stage_list
-        startup_stage = startup_profile.funding_stage
-        
-        if not investor_stages or not startup_stage:
-            return 0.6  # Neutral if no data
-        
-        if startup_stage in investor_stages:
-            return 1.0
+        return scoring_registry.active().component('stage_score', investor_profile, startup_profile)
+    
+    @staticmethod
+    def _calculate_market_size_score(investor_profile, startup_profile):
+        """Calculate market size alignment score"""
+        return scoring_registry.active().component('market_size_score', investor_profile, startup_profile)
+    
+    @staticmethod
+    def _persist_matches(scored_pairs, commit=True, algorithm_version=None):
+        """Write generated matches and their insights in a single transaction
+        
+        ``scored_pairs`` is a list of (investor_profile, startup_profile,
+        match_score) tuples. Match rows are inserted in one batched flush to
+        obtain their ids, then all MatchInsight rows go in as one bulk INSERT
+        built from the profiles the scorer already loaded. Either every row
+        lands or, on error, none do. ``algorithm_version`` records which
+        scoring algorithm produced the scores (the active one by default).
+        """
+        if not scored_pairs:
+            return []
+        
+        algorithm_version = algorithm_version or scoring_registry.active().version
+        try:
+            matches = [
+                MatchingService._build_match_record(
+                    investor_profile.user_id, startup_profile.user_id, match_score, algorithm_version
+                )
+                for investor_profile, startup_profile, match_score in scored_pairs
+            ]
+            db.session.add_all(matches)
+            db.session.flush()
+            
+            insight_rows = [
+                MatchingService._build_match_insight(match, investor_profile, startup_profile)
+                for match, (investor_profile, startup_profile, _) in zip(matches, scored_pairs)
+            ]
+            db.session.execute(db.insert(MatchInsight), insight_rows)
+            
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         
-        # Stage progression logic
-        stage_order = ['pre_seed', 'seed', 'series_a', 'series_b', 'series_c']
+        return matches
+    
+    @staticmethod
+    def _build_match_record(investor_id, startup_id, match_score, algorithm_version):
+        """Build an unsaved match record from a score breakdown"""
+        match = Match(investor_id=investor_id, startup_id=startup_id)
+        MatchingService._apply_match_score(match, match_score, algorithm_version)
+        return match
+    
+    @staticmethod
+    def _apply_match_score(match, match_score, algorithm_version):
+        """Set a match's score columns from a score breakdown"""
+        match.compatibility_score = match_score['overall_score']
+        match.industry_match_score = match_score['industry_score']
+        match.funding_stage_score = match_score['funding_score']
+        match.geographic_score = match_score['geographic_score']
+        match.experience_score = match_score.get('stage_score', 0)
+        match.market_size_score = match_score['market_size_score']
+        match.confidence_level = MatchingService._determine_confidence_level(match_score['overall_score'])
+        match.match_reasons = json.dumps(MatchingService._generate_match_reasons(match_score))
+        match.algorithm_version = algorithm_version
+    
+    @staticmethod
+    def matching_snapshot(profile):
+        """Values of the profile fields that drive scoring, for change detection"""
+        if isinstance(profile, InvestorProfile):
+            fields = MatchingService.INVESTOR_MATCHING_FIELDS
+        else:
+            fields = MatchingService.STARTUP_MATCHING_FIELDS
+        return {field: getattr(profile, field) for field in fields}
+    
+    @staticmethod
+    def changed_matching_fields(before, profile):
+        """Names of scoring fields whose value differs from a snapshot"""
+        after = MatchingService.matching_snapshot(profile)
+        return sorted(field for field, value in after.items() if before.get(field) != value)
+    
+    @staticmethod
+    def rescore_matches_for_profile(profile, commit=True):
+        """Re-score a profile's existing matches in place after it changed
+        
+        Only the pairs this profile already takes part in are touched: the
+        partners are loaded in one query and scored in a single batch pass,
+        and each Match row plus its insight get the new component scores and
+        the current algorithm version. Unmatched candidate pairs hold no
+        stored score, so the next generation run already sees the new
+        profile values.
+        
+        Returns the number of matches updated.
+        """
+        if isinstance(profile, InvestorProfile):
+            matches = Match.query.filter_by(investor_id=profile.user_id).all()
+            partner_model, partner_key, columns_class = StartupProfile, 'startup_id', StartupColumns
+        else:
+            matches = Match.query.filter_by(startup_id=profile.user_id).all()
+            partner_model, partner_key, columns_class = InvestorProfile, 'investor_id', InvestorColumns
+        if not matches:
+            return 0
         
+        algorithm = scoring_registry.active()
         try:
-            startup_idx = stage_order.index(startup_stage)
-            investor_indices = [stage_order.index(stage) for stage in investor_stages if stage in stage_order]
+            partners = partner_model.query.filter(
+                partner_model.user_id.in_({getattr(match, partner_key) for match in matches})
+            ).all()
+            scores = MatchingService.score_partners(profile, partners, columns_class, algorithm)
+            row_for_user = {partner.user_id: idx for idx, partner in enumerate(partners)}
             
-            if investor_indices:
-                min_diff = min(abs(startup_idx - inv_idx) for inv_idx in investor_indices)
-                if min_diff <= 1:
-                    return 0.8  # Adjacent stages
-                elif min_diff <= 2:
-                    return 0.5  # Close stages
-                else:
-                    return 0.2  # Distant stages
-        except ValueError:
-            pass
-        
-        return 0.4  # Default for unknown stages
+            rescored = {}
+            for match in matches:
+                idx = row_for_user.get(getattr(match, partner_key))
+                if idx is None:
+                    continue  # Partner profile was deleted; leave the match as is
+                MatchingService._apply_match_score(match, score_row(scores, idx), algorithm.version)
+                rescored[match.id] = match
+            
+            insights = db.session.query(MatchInsight.id, MatchInsight.match_id).filter(
+                MatchInsight.match_id.in_(list(rescored))
+            ).all()
+            if insights:
+                db.session.execute(db.update(MatchInsight), [
+                    MatchingService._match_insight_scores(insight_id, rescored[match_id])
+                    for insight_id, match_id in insights
+                ])
+            
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        logger.info(f"Rescored {len(rescored)} matches for user {profile.user_id}")
+        return len(rescored)
     
     @staticmethod
-    def _calculate_market_size_score(investor_profile, startup_profile):
-        """Calculate market size alignment score"""
-        if not startup_profile.market_size:
-            return 0.6  # Neutral if no data
-        
-        # Simple market size scoring
-        market_scores = {
-            'small': 0.4,
-            'medium': 0.7,
-            'large': 0.9,
-            'very_large': 1.0
+    def _match_insight_scores(insight_id, match):
+        """Insight columns that mirror a match's scores, for a bulk UPDATE"""
+        return {
+            'id': insight_id,
+            'overall_explanation': MatchingService._overall_explanation(match),
+            'industry_score': match.industry_match_score,
+            'funding_score': match.funding_stage_score,
+            'geographic_score': match.geographic_score,
+            'algorithm_confidence': match.compatibility_score
         }
-        
-        return market_scores.get(startup_profile.market_size, 0.5)
-    
-    @staticmethod
-    def _create_match_record(investor_id, startup_id, match_score):
-        """Create and save a match record"""
-        match = Match(
-            investor_id=investor_id,
-            startup_id=startup_id,
-            compatibility_score=match_score['overall_score'],
-            industry_match_score=match_score['industry_score'],
-            funding_stage_score=match_score['funding_score'],
-            geographic_score=match_score['geographic_score'],
-            experience_score=match_score.get('stage_score', 0),
-            market_size_score=match_score['market_size_score'],
-            confidence_level=MatchingService._determine_confidence_level(match_score['overall_score']),
-            match_reasons=json.dumps(MatchingService._generate_match_reasons(match_score))
-        )
-        
-        db.session.add(match)
-        db.session.commit()
-        
-        # Generate insights for the match
-        MatchingService._generate_match_insights(match)
-        
-        return match
     
     @staticmethod
     def _determine_confidence_level(score):
@@ -337,30 +486,25 @@ class MatchingService:
         return reasons
     
     @staticmethod
-    def _generate_match_insights(match):
-        """Generate detailed insights for a match"""
-        # Get profiles
-        investor_profile = InvestorProfile.query.filter_by(user_id=match.investor_id).first()
-        startup_profile = StartupProfile.query.filter_by(user_id=match.startup_id).first()
-        
-        insight = MatchInsight(
-            match_id=match.id,
-            overall_explanation=f"This match scores {match.compatibility_percentage}% based on industry alignment, funding compatibility, and strategic fit.",
-            industry_analysis=MatchingService._generate_industry_analysis(investor_profile, startup_profile),
-            industry_score=match.industry_match_score,
-            funding_analysis=MatchingService._generate_funding_analysis(investor_profile, startup_profile),
-            funding_score=match.funding_stage_score,
-            geographic_analysis=MatchingService._generate_geographic_analysis(investor_profile, startup_profile),
-            geographic_score=match.geographic_score,
-            algorithm_confidence=match.compatibility_score,
-            data_completeness=0.8,  # Placeholder
-            insight_quality='medium'
-        )
-        
-        db.session.add(insight)
-        db.session.commit()
-        
-        return insight
+    def _build_match_insight(match, investor_profile, startup_profile):
+        """Build the MatchInsight column values for a flushed match"""
+        return {
+            'match_id': match.id,
+            'overall_explanation': MatchingService._overall_explanation(match),
+            'industry_analysis': MatchingService._generate_industry_analysis(investor_profile, startup_profile),
+            'industry_score': match.industry_match_score,
+            'funding_analysis': MatchingService._generate_funding_analysis(investor_profile, startup_profile),
+            'funding_score': match.funding_stage_score,
+            'geographic_analysis': MatchingService._generate_geographic_analysis(investor_profile, startup_profile),
+            'geographic_score': match.geographic_score,
+            'algorithm_confidence': match.compatibility_score,
+            'data_completeness': 0.8,  # Placeholder
+            'insight_quality': 'medium'
+        }
+    
+    @staticmethod
+    def _overall_explanation(match):
+        return f"This match scores {match.compatibility_percentage}% based on industry alignment, funding compatibility, and strategic fit."
     
     @staticmethod
     def _generate_industry_analysis(investor_profile, startup_profile):
@@ -369,8 +513,21 @@ class MatchingService:
     
     @staticmethod
     def _generate_funding_analysis(investor_profile, startup_profile):
-        """Generate funding-specific analysis"""
-        return f"The startup seeks ${startup_profile.funding_needed:,} which fits within the investor's ${investor_profile.min_investment:,}-${investor_profile.max_investment:,} range."
+        """Generate funding-specific analysis
+        
+        Amounts may be missing: like the funding scorer, an unset minimum is
+        $0, an unset maximum is no upper bound and an unset need is unknown.
+        """
+        min_investment = investor_profile.min_investment or 0
+        max_investment = investor_profile.max_investment
+        if max_investment:
+            investor_range = f"${min_investment:,}-${max_investment:,}"
+        else:
+            investor_range = f"${min_investment:,}+"
+        
+        if not startup_profile.funding_needed:
+            return f"The startup has not stated its funding need; the investor invests in the {investor_range} range."
+        return f"The startup seeks ${startup_profile.funding_needed:,} which fits within the investor's {investor_range} range."
     
     @staticmethod
     def _generate_geographic_analysis(investor_profile, startup_profile):
@@ -378,23 +535,137 @@ class MatchingService:
         return f"Geographic alignment between investor preferences and startup location in {startup_profile.headquarters}."
     
     @staticmethod
-    def get_matches_for_user(user_id, status_filter=None, limit=50):
-        """Get existing matches for a user"""
+    def get_matches_for_user(user_id, status_filter=None, limit=50, with_partner_cards=False):
+        """Get existing matches for a user
+        
+        With ``with_partner_cards`` each match's partner user and the card
+        columns of their profile are loaded in the same query.
+        """
+        matches, _ = MatchingService.get_match_page(
+            user_id, limit=limit, status_filter=status_filter, with_partner_cards=with_partner_cards
+        )
+        return matches
+    
+    @staticmethod
+    def get_match_page(user_id, limit=50, cursor=None, status_filter=None, filters=None,
+                       with_partner_cards=False):
+        """One page of a user's matches, best first, plus the cursor of the next page
+        
+        Pages are ordered by (compatibility_score DESC, id DESC) and continue
+        after the position encoded in ``cursor``, so every page is an index
+        range seek rather than an offset scan. ``filters`` may hold
+        ``confidence``, ``interest`` (the user's own interest state),
+        ``min_score``, ``created_after`` and ``created_before``. The next
+        cursor is None on the last page.
+        """
+        query = MatchingService._match_list_query(user_id, cursor, status_filter, filters, with_partner_cards)
+        matches = query.limit(limit + 1).all()
+        
+        if len(matches) > limit:
+            matches = matches[:limit]
+            return matches, MatchingService.encode_match_cursor(matches[-1])
+        return matches, None
+    
+    @staticmethod
+    def iter_matches(user_id, cursor=None, status_filter=None, filters=None, with_partner_cards=False,
+                     batch_size=100):
+        """Every match from ``cursor`` on, in match list order, fetched ``batch_size`` rows at a time
+        
+        Rows are read from a streaming cursor with ``yield_per``, so only one
+        batch of matches is held in memory however many the user has.
+        """
+        query = MatchingService._match_list_query(user_id, cursor, status_filter, filters, with_partner_cards)
+        return iter(query.yield_per(batch_size))
+    
+    @staticmethod
+    def _match_list_query(user_id, cursor, status_filter, filters, with_partner_cards):
+        """Ordered match list query shared by the paged and streamed match lists"""
         user = User.query.get(user_id)
         if not user:
             raise ValueError("User not found")
-        
-        query = Match.query
+        filters = filters or {}
         
         if user.user_type == 'investor':
-            query = query.filter_by(investor_id=user_id)
+            query = Match.query.filter(Match.investor_id == user_id)
+            interest_column = Match.investor_interest
         else:
-            query = query.filter_by(startup_id=user_id)
+            query = Match.query.filter(Match.startup_id == user_id)
+            interest_column = Match.startup_interest
         
         if status_filter:
-            query = query.filter_by(status=status_filter)
+            query = query.filter(Match.status == status_filter)
+        if filters.get('confidence'):
+            query = query.filter(Match.confidence_level == filters['confidence'])
+        if filters.get('interest') == 'pending':
+            query = query.filter(db.or_(interest_column.is_(None), interest_column == 'pending'))
+        elif filters.get('interest'):
+            query = query.filter(interest_column == filters['interest'])
+        if filters.get('min_score') is not None:
+            query = query.filter(Match.compatibility_score >= filters['min_score'])
+        if filters.get('created_after'):
+            query = query.filter(Match.created_at >= filters['created_after'])
+        if filters.get('created_before'):
+            query = query.filter(Match.created_at < filters['created_before'])
+        
+        if cursor:
+            score, match_id = MatchingService.decode_match_cursor(cursor)
+            # The redundant bound keeps the predicate a range on the index
+            query = query.filter(
+                Match.compatibility_score <= score,
+                db.or_(Match.compatibility_score < score, Match.id < match_id)
+            )
         
-        return query.order_by(Match.compatibility_score.desc()).limit(limit).all()
+        if with_partner_cards:
+            query = query.options(MatchingService._partner_card_loader(user.user_type))
+        
+        return query.order_by(Match.compatibility_score.desc(), Match.id.desc())
+    
+    @staticmethod
+    def match_statistics(user_id, reason_breakdown=False):
+        """Match counts for one user, read from the match_counters rollup
+        
+        Returns total, pending, viewed, interested and not_interested (the
+        user's own interest), mutual, investor_interested, high_quality and
+        avg_score in a single-row query. With ``reason_breakdown`` the
+        investor's per-leading-reason counts are joined into the same query
+        and returned under 'reasons'.
+        """
+        counts = match_counters.read(user_id, with_reasons=reason_breakdown)
+        stats = {field: counts[field] for field in COUNTER_FIELDS if field != 'score_sum'}
+        stats['avg_score'] = counts['score_sum'] / stats['total'] if stats['total'] else 0
+        if reason_breakdown:
+            stats['reasons'] = counts['reasons']
+        return stats
+    
+    @staticmethod
+    def encode_match_cursor(match):
+        """Opaque cursor for the page position after ``match``"""
+        position = json.dumps([match.compatibility_score, match.id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def decode_match_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            score, match_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return float(score), int(match_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+    
+    @staticmethod
+    def _partner_card_loader(user_type):
+        """Joined-eager option for the partner side of a user's matches"""
+        if user_type == 'investor':
+            partner, profile, model, fields = (
+                Match.startup, User.startup_profile, StartupProfile, MatchingService.STARTUP_CARD_FIELDS
+            )
+        else:
+            partner, profile, model, fields = (
+                Match.investor, User.investor_profile, InvestorProfile, MatchingService.INVESTOR_CARD_FIELDS
+            )
+        return db.joinedload(partner).load_only(User.id).joinedload(profile).load_only(
+            *[getattr(model, field) for field in fields]
+        )
     
     @staticmethod
     def update_match_interest(match_id, user_id, interest):
@@ -407,6 +678,7 @@ class MatchingService:
         if not user:
             raise ValueError("User not found")
         
+        user_id = int(user_id)
         if user.user_type == 'investor' and match.investor_id == user_id:
             match.set_investor_interest(interest)
         elif user.user_type == 'startup' and match.startup_id == user_id:
@@ -414,4 +686,62 @@ class MatchingService:
         else:
             raise ValueError("User not authorized for this match")
         
-        return match 
\ No newline at end of file
+        return match
+    
+    @staticmethod
+    def apply_match_updates(user_id, user_type, items, commit=True):
+        """Apply interest changes and views to many of a user's matches at once
+        
+        Each item is a dict with a ``match_id`` and an ``interest`` and/or
+        ``view: true``. The matches are loaded and authorized with one query,
+        updated in memory with the same transitions as the single-match
+        endpoints, and committed together. Returns one result per item, in
+        order: ``{'match_id', 'ok', 'match'}`` or ``{'match_id', 'ok', 'error'}``.
+        Items are applied in order, so repeated match ids see earlier changes.
+        """
+        if user_type == 'investor':
+            owner_key, set_interest, mark_viewed = 'investor_id', Match.set_investor_interest, Match.mark_viewed_by_investor
+        else:
+            owner_key, set_interest, mark_viewed = 'startup_id', Match.set_startup_interest, Match.mark_viewed_by_startup
+        
+        match_ids = {item.get('match_id') for item in items if isinstance(item.get('match_id'), int)}
+        matches = {match.id: match for match in Match.query.filter(Match.id.in_(match_ids))} if match_ids else {}
+        
+        results = []
+        for item in items:
+            match_id = item.get('match_id')
+            interest = item.get('interest')
+            result = {'match_id': match_id, 'ok': False}
+            results.append(result)
+            
+            if not isinstance(match_id, int):
+                result['error'] = 'Missing or invalid match_id'
+            elif interest is None and not item.get('view'):
+                result['error'] = 'Nothing to update: pass interest and/or view'
+            elif interest is not None and interest not in MatchingService.INTEREST_VALUES:
+                result['error'] = 'Invalid interest value'
+            elif match_id not in matches:
+                result['error'] = 'Match not found'
+            elif getattr(matches[match_id], owner_key) != user_id:
+                result['error'] = 'User not authorized for this match'
+            else:
+                match = matches[match_id]
+                if item.get('view'):
+                    mark_viewed(match, commit=False)
+                if interest is not None:
+                    set_interest(match, interest, commit=False)
+                result['ok'] = True
+        
+        try:
+            # Serialize between flush and commit, while the flushed state is still loaded
+            db.session.flush()
+            for result in results:
+                if result['ok']:
+                    result['match'] = matches[result['match_id']].to_dict(include_sensitive=True)
+            if commit:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        return results
@@ -0,0 +1,552 @@
+# app/services/profile_search.py
+"""Full-text search over startup and investor profiles.
+
+Each profile is indexed as one document with four weighted fields:
+
+* name - startup company_name / investor name
+* headline - startup tagline / investor title and company
+* body - startup description / investor bio
+* keywords - startup value_proposition / investor expertise_areas
+
+Queries are words that must all appear. A trailing ``*`` makes a word a
+prefix (``fin*``). Results are ranked by BM25 over the weighted fields, and
+each one carries its matching fields with the hits wrapped in
+<mark>...</mark>.
+
+Two backends implement this (SEARCH_BACKEND: auto, fts5 or memory):
+
+* fts5 - an SQLite FTS5 table, ``profile_search``. Mapper events write each
+  profile insert, change or delete on the flush's own connection, so the
+  index commits or rolls back with the profile. The table is created by the
+  migration and alongside ``db.create_all()``.
+* memory - an in-process inverted index with the same tokenizer, the same
+  ranking formula and the same highlighting. It is used when the database is
+  not SQLite or SQLite lacks FTS5. Like the candidate indexes, it is built
+  lazily and kept current by the same mapper events. It is rebuilt when a
+  signature query, run at most every SEARCH_INDEX_CHECK_SECONDS, shows writes
+  from other processes or a rolled back write.
+
+Rows written with Core statements bypass the mapper events: the seeder
+reindexes what it inserts, and ``flask search rebuild`` rebuilds everything.
+"""
+from app import db
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from collections import defaultdict
+import bisect
+import heapq
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'profile_search'
+FIELDS = ('name', 'headline', 'body', 'keywords')
+FIELD_WEIGHTS = (10.0, 5.0, 1.0, 3.0)
+HIGHLIGHT = ('<mark>', '</mark>')
+SNIPPET_TOKENS = 24  # Body text is cut to this many tokens around the first hit
+MAX_QUERY_TERMS = 8
+
+# kind -> (model, rowid tag, source columns)
+KINDS = {
+    'startup': (StartupProfile, 0, ('company_name', 'tagline', 'description', 'value_proposition')),
+    'investor': (InvestorProfile, 1, ('name', 'title', 'company', 'bio', 'expertise_areas'))
+}
+
+_TOKEN = re.compile(r'[^\W_]+')
+_QUERY_TERM = re.compile(r'([^\W_]+)(\*?)')
+
+
+def fts5_available():
+    """Whether the sqlite3 library this process links against has FTS5"""
+    try:
+        conn = sqlite3.connect(':memory:')
+        try:
+            conn.execute('CREATE VIRTUAL TABLE probe USING fts5(x)')
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def normalize(token):
+    """Case- and diacritic-folded token, as FTS5's unicode61 tokenizer folds it"""
+    decomposed = unicodedata.normalize('NFKD', token.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    return [normalize(token) for token in _TOKEN.findall(text or '')]
+
+
+def parse_query(text):
+    """Query text -> [(term, is_prefix)]; raises ValueError when there is nothing to search"""
+    terms = []
+    for word, star in _QUERY_TERM.findall(text or ''):
+        term = (normalize(word), bool(star))
+        if term not in terms:
+            terms.append(term)
+    if not terms:
+        raise ValueError('Search query must contain at least one word')
+    if len(terms) > MAX_QUERY_TERMS:
+        raise ValueError(f'Search queries are limited to {MAX_QUERY_TERMS} words')
+    return terms
+
+
+def document(kind, values):
+    """The four indexed fields of a profile, from its source column values"""
+    if kind == 'startup':
+        return (values['company_name'], values['tagline'], values['description'], values['value_proposition'])
+    headline = ' '.join(filter(None, (values['title'], values['company']))) or None
+    areas = json.loads(values['expertise_areas']) if values['expertise_areas'] else []
+    return (values['name'], headline, values['bio'], ', '.join(areas) or None)
+
+
+def rowid(kind, profile_id):
+    """One id space for both kinds: profile id and kind tag packed together"""
+    return profile_id * 2 + KINDS[kind][1]
+
+
+def _kind_of(profile):
+    return 'startup' if isinstance(profile, StartupProfile) else 'investor'
+
+
+def _source_values(profile, kind):
+    return {column: getattr(profile, column) for column in KINDS[kind][2]}
+
+
+def _source_rows(kind, ids=None, batch_size=1000):
+    """(profile_id, user_id, source values) for ``ids`` (every profile when None)"""
+    model, _, columns = KINDS[kind]
+    query = db.session.query(model.id, model.user_id, *[getattr(model, column) for column in columns])
+    if ids is None:
+        for row in query.order_by(model.id).yield_per(batch_size):
+            yield row[0], row[1], dict(zip(columns, row[2:]))
+        return
+    ids = sorted(ids)
+    for start in range(0, len(ids), batch_size):
+        for row in query.filter(model.id.in_(ids[start:start + batch_size])):
+            yield row[0], row[1], dict(zip(columns, row[2:]))
+
+
+class Fts5Backend:
+    """Documents in an SQLite FTS5 table, written on the flush's connection"""
+
+    name = 'fts5'
+
+    @staticmethod
+    def create_table(conn):
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            "kind UNINDEXED, user_id UNINDEXED, name, headline, body, keywords, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+    @staticmethod
+    def drop_table(conn):
+        conn.exec_driver_sql(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def write(self, conn, kind, profile_id, user_id=None, values=None, version=None):
+        """Replace (or, without values, delete) one profile's document"""
+        self._write_many(conn, kind, [profile_id], [] if values is None else [(profile_id, user_id, values)])
+
+    @staticmethod
+    def _write_many(conn, kind, removed_ids, rows):
+        if removed_ids:
+            conn.exec_driver_sql(
+                f'DELETE FROM {TABLE} WHERE rowid = ?',
+                [(rowid(kind, profile_id),) for profile_id in removed_ids]
+            )
+        if rows:
+            conn.exec_driver_sql(
+                f'INSERT INTO {TABLE} (rowid, kind, user_id, name, headline, body, keywords) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(rowid(kind, profile_id), kind, user_id, *document(kind, values))
+                 for profile_id, user_id, values in rows]
+            )
+
+    def reindex(self, kind, ids=None, batch_size=1000):
+        conn = db.session.connection()
+        if ids is None:
+            self.create_table(conn)
+            conn.exec_driver_sql(f'DELETE FROM {TABLE} WHERE kind = ?', (kind,))
+        count, batch = 0, []
+        for row in _source_rows(kind, ids):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self._write_many(conn, kind, [] if ids is None else [row[0] for row in batch], batch)
+                count, batch = count + len(batch), []
+        self._write_many(conn, kind, [] if ids is None else [row[0] for row in batch], batch)
+        return count + len(batch)
+
+    def optimize(self):
+        db.session.connection().exec_driver_sql(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+
+    def search(self, terms, kind, limit, offset):
+        match = ' '.join(f'"{term}"' + ('*' if prefix else '') for term, prefix in terms)
+        weights = ', '.join(str(weight) for weight in (0.0, 0.0) + FIELD_WEIGHTS)
+        where = f'{TABLE} MATCH ?' + (' AND kind = ?' if kind else '')
+        params = (match, kind) if kind else (match,)
+        marks = ', '.join(
+            f"snippet({TABLE}, {column}, ?, ?, '…', {SNIPPET_TOKENS})" if field == 'body'
+            else f'highlight({TABLE}, {column}, ?, ?)'
+            for column, field in enumerate(FIELDS, start=2)
+        )
+
+        conn = db.session.connection()
+        total = conn.exec_driver_sql(f'SELECT count(*) FROM {TABLE} WHERE {where}', params).scalar()
+        rows = conn.exec_driver_sql(
+            f'SELECT rowid, kind, user_id, name, headline, -bm25({TABLE}, {weights}) AS score, {marks} '
+            f'FROM {TABLE} WHERE {where} ORDER BY bm25({TABLE}, {weights}), rowid LIMIT ? OFFSET ?',
+            HIGHLIGHT * len(FIELDS) + params + (limit, offset)
+        ).all()
+        return [
+            _hit(row[1], row[0] // 2, row[2], row[3], row[4], row[5], dict(zip(FIELDS, row[6:])))
+            for row in rows
+        ], total
+
+
+class MemoryBackend:
+    """In-process inverted index ranked like FTS5's bm25()"""
+
+    name = 'memory'
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.check_seconds = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.documents = {}  # rowid -> (kind, profile_id, user_id, fields, length, version)
+            self.postings = defaultdict(dict)  # token -> {rowid: per-field hit counts}
+            self.total_length = 0
+            self._vocabulary = None
+            self.signature = None  # kind -> (row count, max id, version sum) once built
+            self._checked_at = None
+            self._uncommitted = False
+
+    # Index maintenance
+
+    def _add(self, kind, profile_id, user_id, values, version):
+        key = rowid(kind, profile_id)
+        self._remove(key)
+        fields = document(kind, values)
+        length = 0
+        for position, text in enumerate(fields):
+            tokens = tokenize(text)
+            length += len(tokens)
+            for token in tokens:
+                if token not in self.postings:
+                    self._vocabulary = None
+                hits = self.postings[token].setdefault(key, [0] * len(FIELDS))
+                hits[position] += 1
+        self.documents[key] = (kind, profile_id, user_id, fields, length, version or 0)
+        self.total_length += length
+
+    def _remove(self, key):
+        entry = self.documents.pop(key, None)
+        if entry is None:
+            return
+        self.total_length -= entry[4]
+        for text in entry[3]:
+            for token in set(tokenize(text)):
+                postings = self.postings.get(token)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self.postings[token]
+                        self._vocabulary = None
+
+    def write(self, conn, kind, profile_id, user_id=None, values=None, version=None):
+        # Mapper event hook; the signature tracks each row written so it stays valid
+        with self._lock:
+            if self.signature is None:
+                return  # Not built yet; the first search builds it
+            if values is None:
+                # The max id may have dropped; the next search rebuilds
+                self._remove(rowid(kind, profile_id))
+                self.signature = None
+                return
+            self._uncommitted = True
+            previous = self.documents.get(rowid(kind, profile_id))
+            self._add(kind, profile_id, user_id, values, version)
+            count, max_id, version_sum = self.signature[kind]
+            if previous is None:
+                count, max_id = count + 1, max(max_id, profile_id)
+            else:
+                version_sum -= previous[5]
+            self.signature = {**self.signature, kind: (count, max_id, version_sum + (version or 0))}
+
+    def reindex(self, kind, ids=None):
+        # Bulk writes change the signature, so the next search rebuilds the index
+        with self._lock:
+            self.signature = None
+        if ids is not None:
+            return len(ids)
+        model = KINDS[kind][0]
+        return db.session.query(db.func.count(model.id)).scalar()
+
+    def optimize(self):
+        pass
+
+    @staticmethod
+    def _signature():
+        """Row count, max id and version sum per kind; changes on any write"""
+        signature = {}
+        for kind, (model, _, _) in KINDS.items():
+            count, max_id, version_sum = db.session.query(
+                db.func.count(model.id), db.func.max(model.id), db.func.sum(model.version)
+            ).one()
+            signature[kind] = (count, max_id or 0, version_sum or 0)
+        return signature
+
+    def on_commit(self):
+        self._uncommitted = False
+
+    def on_rollback(self):
+        # Writes applied at flush were undone; check the signature on the next search
+        if self._uncommitted:
+            self._uncommitted = False
+            self._checked_at = None
+
+    def ensure_fresh(self):
+        """Rebuild if the tables changed in ways the mapper events did not see
+
+        The signature query scans both profile tables, so it runs at most
+        every SEARCH_INDEX_CHECK_SECONDS; writes made through this process's
+        ORM are applied by the mapper events in the meantime.
+        """
+        with self._lock:
+            if (self.signature is not None and self._checked_at is not None
+                    and time.monotonic() - self._checked_at < self.check_seconds):
+                return
+            signature = self._signature()
+            if signature != self.signature:
+                self.documents.clear()
+                self.postings.clear()
+                self.total_length = 0
+                self._vocabulary = None
+                for kind, (model, _, columns) in KINDS.items():
+                    query = db.session.query(
+                        model.id, model.user_id, model.version, *[getattr(model, column) for column in columns]
+                    )
+                    for row in query.yield_per(1000):
+                        self._add(kind, row[0], row[1], dict(zip(columns, row[3:])), row[2])
+                self.signature = signature
+                logger.info(f"Built in-memory search index over {len(self.documents)} profiles")
+            self._checked_at = time.monotonic()
+
+    # Querying
+
+    def _expand(self, term, prefix):
+        if not prefix:
+            return [term] if term in self.postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + '\U0010ffff')
+        return self._vocabulary[start:end]
+
+    def search(self, terms, kind, limit, offset):
+        with self._lock:
+            self.ensure_fresh()
+            # Per term: rowid -> per-field hits, summed over the tokens a prefix expands to
+            term_hits = []
+            for term, prefix in terms:
+                hits = defaultdict(lambda: [0] * len(FIELDS))
+                for token in self._expand(term, prefix):
+                    for key, counts in self.postings[token].items():
+                        merged = hits[key]
+                        for position, count in enumerate(counts):
+                            merged[position] += count
+                term_hits.append(hits)
+
+            candidates = set(term_hits[0]) if term_hits else set()
+            for hits in term_hits[1:]:
+                candidates &= hits.keys()
+            if kind:
+                candidates = {key for key in candidates if self.documents[key][0] == kind}
+
+            total_documents = len(self.documents)
+            average_length = self.total_length / total_documents if total_documents else 0
+            scored = []
+            for key in candidates:
+                length = self.documents[key][4]
+                score = 0.0
+                for hits in term_hits:
+                    frequency = sum(weight * count for weight, count in zip(FIELD_WEIGHTS, hits[key]))
+                    score += self._idf(len(hits), total_documents) * frequency * (self.K1 + 1) / (
+                        frequency + self.K1 * (1 - self.B + self.B * length / (average_length or 1))
+                    )
+                scored.append((-score, key))
+            page = heapq.nsmallest(offset + limit, scored)[offset:]
+
+            results = []
+            for negative_score, key in page:
+                kind_name, profile_id, user_id, fields = self.documents[key][:4]
+                marked = {
+                    field: _mark(text, terms, snippet=field == 'body')
+                    for field, text in zip(FIELDS, fields)
+                }
+                results.append(_hit(kind_name, profile_id, user_id, fields[0], fields[1], -negative_score, marked))
+            return results, len(scored)
+
+    @staticmethod
+    def _idf(matching, total):
+        # FTS5 floors non-positive idf (terms in over half the documents) at a small constant
+        idf = math.log((total - matching + 0.5) / (matching + 0.5)) if total else 0
+        return idf if idf > 0 else 1e-6
+
+
+def _term_matches(token, terms):
+    token = normalize(token)
+    return any(token.startswith(term) if prefix else token == term for term, prefix in terms)
+
+
+def _mark(text, terms, snippet=False):
+    """``text`` with matching tokens wrapped in HIGHLIGHT markers, cut around the first hit for snippets"""
+    if not text:
+        return text
+    tokens = list(_TOKEN.finditer(text))
+    hits = [index for index, match in enumerate(tokens) if _term_matches(match.group(), terms)]
+    start_token, end_token = 0, len(tokens)
+    if snippet and len(tokens) > SNIPPET_TOKENS:
+        first = hits[0] if hits else 0
+        start_token = max(0, min(first - SNIPPET_TOKENS // 4, len(tokens) - SNIPPET_TOKENS))
+        end_token = start_token + SNIPPET_TOKENS
+
+    start = tokens[start_token].start() if start_token else 0
+    end = tokens[end_token - 1].end() if end_token < len(tokens) else len(text)
+    pieces, cursor = [], start
+    for index in hits:
+        if start_token <= index < end_token:
+            match = tokens[index]
+            pieces += [text[cursor:match.start()], HIGHLIGHT[0], match.group(), HIGHLIGHT[1]]
+            cursor = match.end()
+    pieces.append(text[cursor:end])
+    return ('…' if start_token else '') + ''.join(pieces) + ('…' if end_token < len(tokens) else '')
+
+
+def _hit(kind, profile_id, user_id, name, headline, score, marked):
+    return {
+        'type': kind,
+        'profile_id': profile_id,
+        'user_id': int(user_id) if user_id is not None else None,
+        'name': name,
+        'headline': headline,
+        'score': round(score, 4),
+        # Only the fields the query matched
+        'highlights': {field: text for field, text in marked.items() if text and HIGHLIGHT[0] in text}
+    }
+
+
+class ProfileSearch:
+    """Keeps the profile search index current and answers queries"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._memory = MemoryBackend()
+        self._fts5 = Fts5Backend()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SEARCH_BACKEND', 'auto')
+        app.config.setdefault('SEARCH_INDEX_CHECK_SECONDS', 5.0)
+        app.extensions['profile_search'] = self
+        choice = app.config['SEARCH_BACKEND']
+        sqlite = make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite'
+        if choice == 'auto':
+            choice = 'fts5' if sqlite and fts5_available() else 'memory'
+        if choice not in ('fts5', 'memory'):
+            raise ValueError(f"Unknown SEARCH_BACKEND '{choice}': use auto, fts5 or memory")
+        self.backend = self._fts5 if choice == 'fts5' else self._memory
+        self._memory.reset()  # Indexes describe one database; rebuild lazily for this app
+        self._memory.check_seconds = app.config['SEARCH_INDEX_CHECK_SECONDS']
+
+        if not self._listening:
+            for model in (StartupProfile, InvestorProfile):
+                event.listen(model, 'after_insert', self._on_write)
+                event.listen(model, 'after_update', self._on_update)
+                event.listen(model, 'after_delete', self._on_delete)
+            event.listen(Session, 'after_commit', lambda session: self._memory.on_commit())
+            event.listen(Session, 'after_rollback', lambda session: self._memory.on_rollback())
+            event.listen(db.metadata, 'after_create', self._on_create_all)
+            event.listen(db.metadata, 'before_drop', self._on_drop_all)
+            self._listening = True
+
+    @property
+    def backend_name(self):
+        return self.backend.name if self.backend is not None else None
+
+    # Schema and mapper event hooks
+
+    def _on_create_all(self, target, connection, **kw):
+        if self.backend is self._fts5:
+            Fts5Backend.create_table(connection)
+
+    def _on_drop_all(self, target, connection, **kw):
+        if self.backend is self._fts5:
+            Fts5Backend.drop_table(connection)
+
+    def _on_write(self, mapper, connection, profile):
+        if self.backend is not None:
+            kind = _kind_of(profile)
+            self.backend.write(
+                connection, kind, profile.id, profile.user_id, _source_values(profile, kind), profile.version
+            )
+
+    def _on_update(self, mapper, connection, profile):
+        state = inspect(profile)
+        columns = KINDS[_kind_of(profile)][2] + ('user_id',)
+        # The memory index also tracks row versions, which every update bumps
+        if self.backend is self._memory or any(state.attrs[column].history.has_changes() for column in columns):
+            self._on_write(mapper, connection, profile)
+
+    def _on_delete(self, mapper, connection, profile):
+        if self.backend is not None:
+            self.backend.write(connection, _kind_of(profile), profile.id)
+
+    # Public API
+
+    def search(self, query, kind=None, limit=20, offset=0):
+        """Rank profiles for ``query``: returns (results, total matches)
+
+        ``kind`` restricts results to 'startup' or 'investor' profiles.
+        Raises ValueError for an empty or overlong query or an unknown kind.
+        """
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Invalid type: use {' or '.join(KINDS)}")
+        return self.backend.search(parse_query(query), kind, limit, offset)
+
+    def reindex(self, model, ids=None):
+        """Rewrite the documents of ``model`` profiles ``ids`` (all of them when None)
+
+        Runs in the current transaction; the caller commits. Returns the
+        number of profiles indexed.
+        """
+        kind = 'startup' if model is StartupProfile else 'investor'
+        return self.backend.reindex(kind, ids)
+
+    def rebuild(self):
+        """Reindex every profile and compact the index; returns {kind: profiles indexed}"""
+        counts = {kind: self.backend.reindex(kind) for kind in KINDS}
+        self.backend.optimize()
+        return counts
+
+
+profile_search = ProfileSearch()
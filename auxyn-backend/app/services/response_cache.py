@@ -0,0 +1,233 @@
+# app/services/response_cache.py
+"""Per-user response cache for the polled dashboard endpoints.
+
+Views decorated with ``@response_cache.cached(name)`` store their serialized
+200 response under (user id, endpoint name) for RESPONSE_CACHE_TTL seconds.
+Entries are also dropped as soon as their inputs change: a session listener
+collects the users touched by flushed Match writes (created, viewed,
+interest or score changes) and by profile or preference edits, and
+invalidates their entries once the transaction commits. Each invalidation
+also bumps the user's generation; a response is only stored if the
+generation it was computed under is still current, so an invalidation
+landing while a view runs is not undone by caching its stale result. Writes
+made in another process (process-pool match jobs, CLI commands) are only picked up
+when the TTL expires.
+
+The storage backend is pluggable (RESPONSE_CACHE_BACKEND): 'memory' is an
+in-process LRU with per-entry expiry, 'none' disables caching, and any other
+value is imported as 'package.module:ClassName' and built with
+``ClassName.from_config(app.config)``. Backends implement get, set, delete,
+clear and size.
+"""
+from flask import Response
+from flask_jwt_extended import get_jwt_identity
+from app.models.match import Match
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.models.user_preferences import UserPreferences
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import OrderedDict, defaultdict
+from functools import wraps
+import importlib
+import threading
+import time
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get('RESPONSE_CACHE_SIZE', 10000))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class NullBackend:
+    """Caches nothing"""
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def size(self):
+        return 0
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'none': NullBackend
+}
+
+
+def _load_backend(name, config):
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        module_name, _, class_name = name.partition(':')
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class.from_config(config)
+
+
+class ResponseCache:
+    """Caches serialized responses per (user, endpoint) with commit-time invalidation"""
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend()
+        self.ttl = 60
+        self.endpoints = set()
+        self._lock = threading.Lock()
+        self._generations = defaultdict(int)  # user_id -> invalidations so far
+        self._generation_lock = threading.Lock()
+        self._registered = False
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_BACKEND', 'memory')
+        app.config.setdefault('RESPONSE_CACHE_SIZE', 10000)
+        app.config.setdefault('RESPONSE_CACHE_TTL', 60)
+        app.extensions['response_cache'] = self
+        self.backend = _load_backend(app.config['RESPONSE_CACHE_BACKEND'], app.config)
+        self.ttl = app.config['RESPONSE_CACHE_TTL']
+        self._reset_stats()
+        if not self._registered:
+            event.listen(Session, 'before_flush', self._collect_users)
+            event.listen(Session, 'after_commit', self._invalidate_collected)
+            event.listen(Session, 'after_rollback', lambda session: session.info.pop('response_cache_users', None))
+            self._registered = True
+
+    def _reset_stats(self):
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.invalidations = 0
+
+    def cached(self, name):
+        """Cache a view's 200 JSON response per authenticated user"""
+        self.endpoints.add(name)
+
+        def decorator(view):
+            @wraps(view)
+            def decorated_view(*args, **kwargs):
+                key = (int(get_jwt_identity()), name)
+                cached = self.backend.get(key)
+                if cached is not None:
+                    self._count(self.hits, name)
+                    return Response(cached, mimetype='application/json')
+
+                self._count(self.misses, name)
+                generation = self._generations[key[0]]
+                response = view(*args, **kwargs)
+                if isinstance(response, Response) and response.status_code == 200:
+                    # Skip the store if the user was invalidated while the view ran
+                    with self._generation_lock:
+                        if self._generations[key[0]] == generation:
+                            self.backend.set(key, response.get_data(), self.ttl)
+                return response
+            return decorated_view
+        return decorator
+
+    def _count(self, counter, name):
+        with self._lock:
+            counter[name] += 1
+
+    def invalidate(self, user_ids):
+        """Drop every cached endpoint response of the given users"""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        with self._generation_lock:
+            for user_id in user_ids:
+                self._generations[user_id] += 1
+            self.backend.delete([(user_id, name) for user_id in user_ids for name in self.endpoints])
+        with self._lock:
+            self.invalidations += len(user_ids)
+
+    def _collect_users(self, session, flush_context, instances):
+        users = session.info.setdefault('response_cache_users', set())
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Match):
+                users.update(user_id for user_id in (obj.investor_id, obj.startup_id) if user_id is not None)
+            elif isinstance(obj, (InvestorProfile, StartupProfile, UserPreferences)) and obj.user_id is not None:
+                users.add(int(obj.user_id))
+
+    def _invalidate_collected(self, session):
+        users = session.info.pop('response_cache_users', None)
+        if users:
+            self.invalidate(users)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            endpoints = {}
+            for name in sorted(self.endpoints):
+                lookups = self.hits[name] + self.misses[name]
+                endpoints[name] = {
+                    'hits': self.hits[name],
+                    'misses': self.misses[name],
+                    'hit_ratio': round(self.hits[name] / lookups, 4) if lookups else 0.0
+                }
+            return {
+                'backend': type(self.backend).__name__,
+                'size': self.backend.size(),
+                'ttl_seconds': self.ttl,
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                'invalidations': self.invalidations,
+                'endpoints': endpoints
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,99 @@
+# app/services/score_cache.py
+"""Memoized pair scores.
+
+Scores are cached under (investor profile id, investor profile version,
+startup profile id, startup profile version, algorithm version). Profile
+versions are bumped on every ORM update of the row, so an edited profile
+produces new keys and its old entries are never served again; they simply
+age out of the LRU.
+
+Generation scans, match rescoring after a profile edit and the match
+preview all read through the cache (MatchingService.score_partners and
+score_pair): cached pairs are not scored again, and every pair scored on a
+miss is added.
+"""
+from collections import OrderedDict
+import threading
+
+
+class ScoreCache:
+    """Thread-safe LRU cache of compatibility score breakdowns"""
+
+    def __init__(self, maxsize=50000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        app.config.setdefault('SCORE_CACHE_SIZE', 50000)
+        app.extensions['score_cache'] = self
+        # Keys are only meaningful for one database; start empty per app
+        self.clear()
+        self.resize(app.config['SCORE_CACHE_SIZE'])
+
+    @staticmethod
+    def key_for(investor_profile, startup_profile, algorithm_version):
+        return (
+            investor_profile.id, investor_profile.version,
+            startup_profile.id, startup_profile.version,
+            algorithm_version
+        )
+
+    def get(self, key):
+        with self._lock:
+            match_score = self._entries.get(key)
+            if match_score is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(match_score)
+
+    def put(self, key, match_score):
+        # Unsaved profiles have no id/version yet and cannot be keyed
+        if self.maxsize <= 0 or None in key:
+            return
+        with self._lock:
+            self._entries[key] = dict(match_score)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(self, key, compute):
+        match_score = self.get(key)
+        if match_score is None:
+            match_score = compute()
+            self.put(key, match_score)
+        return match_score
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > max(self.maxsize, 0):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+score_cache = ScoreCache()
@@ -0,0 +1,353 @@
+# app/services/scoring_registry.py
+"""Scorer registry and versioned scoring algorithms.
+
+Component scorers are plain functions registered by name with
+``@register_scorer``; each takes (investor_profile, startup_profile, tables)
+and returns a 0.0-1.0 score. A scoring algorithm is a named version made of
+component weights plus the lookup tables the scorers read (related industry
+groups, US states, stage order, market size scores). Compiling an algorithm
+binds everything into one fused closure, so scoring a pair does no registry
+or weight lookups.
+
+Algorithm version "1.0" is built in. Further versions, and which one is
+active, come from a JSON file (SCORING_CONFIG_PATH)::
+
+    {
+      "active_version": "1.1",
+      "versions": {
+        "1.1": {
+          "weights": {"industry_score": 0.35, "funding_score": 0.25,
+                      "geographic_score": 0.10, "stage_score": 0.20,
+                      "market_size_score": 0.10},
+          "tables": {"tech_industries": ["technology", "software", "ai"]}
+        }
+      }
+    }
+
+Omitted tables fall back to the built-in ones. A version string names one
+fixed definition: cached scores and Match.algorithm_version are keyed by it.
+A config that redefines "1.0", or a version already loaded with other weights
+or tables, is rejected; changed scoring ships under a new version. Versions
+dropped from the file stay loaded until restart. The file is re-read when its
+mtime changes (checked at most every SCORING_CONFIG_CHECK_SECONDS); the new
+set of algorithms is compiled completely before it replaces the old one in a
+single assignment, and a config that fails to load leaves the current
+algorithms in place.
+"""
+from collections import namedtuple
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ScoringTables = namedtuple('ScoringTables', [
+    'tech_industries', 'health_industries', 'us_states', 'stage_order', 'market_size_scores'
+])
+
+DEFAULT_TABLES = ScoringTables(
+    tech_industries=('technology', 'software', 'ai', 'fintech', 'edtech'),
+    health_industries=('healthcare', 'biotech', 'medtech', 'pharma'),
+    us_states=('california', 'new york', 'texas', 'florida', 'washington'),
+    stage_order=('pre_seed', 'seed', 'series_a', 'series_b', 'series_c'),
+    market_size_scores={
+        'small': 0.4,
+        'medium': 0.7,
+        'large': 0.9,
+        'very_large': 1.0
+    }
+)
+
+# Component weights of the built-in algorithm, in accumulation order
+DEFAULT_WEIGHTS = (
+    ('industry_score', 0.30),
+    ('funding_score', 0.25),
+    ('geographic_score', 0.15),
+    ('stage_score', 0.20),
+    ('market_size_score', 0.10)
+)
+DEFAULT_VERSION = '1.0'
+
+COMPONENT_SCORERS = {}
+
+
+def register_scorer(name):
+    """Register a component scorer under ``name`` (e.g. 'industry_score')"""
+    def decorator(func):
+        COMPONENT_SCORERS[name] = func
+        return func
+    return decorator
+
+
+@register_scorer('industry_score')
+def industry_score(investor_profile, startup_profile, tables):
+    """Industry alignment"""
+    investor_industries = investor_profile.preferred_industries_list
+    startup_industry = startup_profile.industry
+
+    if not investor_industries or not startup_industry:
+        return 0.5  # Neutral score if data missing
+
+    # Exact match
+    if startup_industry in investor_industries:
+        return 1.0
+
+    # Related industry matching (simplified)
+    investor_has_tech = any(ind in tables.tech_industries for ind in investor_industries)
+    startup_is_tech = startup_industry.lower() in tables.tech_industries
+
+    investor_has_health = any(ind in tables.health_industries for ind in investor_industries)
+    startup_is_health = startup_industry.lower() in tables.health_industries
+
+    if (investor_has_tech and startup_is_tech) or (investor_has_health and startup_is_health):
+        return 0.7
+
+    return 0.2  # Low but not zero for different industries
+
+
+@register_scorer('funding_score')
+def funding_score(investor_profile, startup_profile, tables):
+    """Funding compatibility"""
+    if not startup_profile.funding_needed:
+        return 0.5
+
+    funding_needed = startup_profile.funding_needed
+    min_investment = investor_profile.min_investment or 0
+    max_investment = investor_profile.max_investment or float('inf')
+
+    if min_investment <= funding_needed <= max_investment:
+        return 1.0
+    elif funding_needed < min_investment:
+        # Startup needs less than investor minimum
+        if funding_needed >= min_investment * 0.5:
+            return 0.7  # Close enough
+        else:
+            return 0.3  # Too small
+    else:
+        # Startup needs more than investor maximum
+        if funding_needed <= max_investment * 1.5:
+            return 0.6  # Slightly over budget
+        else:
+            return 0.2  # Way over budget
+
+
+@register_scorer('geographic_score')
+def geographic_score(investor_profile, startup_profile, tables):
+    """Geographic compatibility"""
+    investor_locations = investor_profile.geographic_preference_list
+    startup_location = startup_profile.headquarters
+
+    if not investor_locations or not startup_location:
+        return 0.7  # Assume neutral/good if no preference specified
+
+    # Exact location match
+    if startup_location in investor_locations:
+        return 1.0
+
+    # Region-based matching (simplified)
+    if any(loc.lower() in tables.us_states for loc in investor_locations) and \
+       startup_location.lower() in tables.us_states:
+        return 0.8  # Same country
+
+    return 0.5  # Different regions but not penalized heavily
+
+
+@register_scorer('stage_score')
+def stage_score(investor_profile, startup_profile, tables):
+    """Investment stage compatibility"""
+    investor_stages = investor_profile.investment_stage_list
+    startup_stage = startup_profile.funding_stage
+
+    if not investor_stages or not startup_stage:
+        return 0.6  # Neutral if no data
+
+    if startup_stage in investor_stages:
+        return 1.0
+
+    # Stage progression logic
+    stage_order = tables.stage_order
+    if startup_stage in stage_order:
+        startup_idx = stage_order.index(startup_stage)
+        investor_indices = [stage_order.index(stage) for stage in investor_stages if stage in stage_order]
+
+        if investor_indices:
+            return stage_distance_score(min(abs(startup_idx - inv_idx) for inv_idx in investor_indices))
+
+    return 0.4  # Default for unknown stages
+
+
+def stage_distance_score(min_diff):
+    if min_diff <= 1:
+        return 0.8  # Adjacent stages
+    elif min_diff <= 2:
+        return 0.5  # Close stages
+    return 0.2  # Distant stages
+
+
+@register_scorer('market_size_score')
+def market_size_score(investor_profile, startup_profile, tables):
+    """Market size alignment"""
+    if not startup_profile.market_size:
+        return 0.6  # Neutral if no data
+
+    return tables.market_size_scores.get(startup_profile.market_size, 0.5)
+
+
+class ScoringAlgorithm:
+    """A named scoring version compiled into a single pair-scoring function"""
+
+    def __init__(self, version, weights, tables=DEFAULT_TABLES):
+        if not version or len(version) > 10:
+            raise ValueError(f"Invalid algorithm version: {version!r}")
+        unknown = [name for name, _ in weights if name not in COMPONENT_SCORERS]
+        if unknown:
+            raise ValueError(f"Unknown scoring components: {', '.join(unknown)}")
+        missing = [name for name, _ in DEFAULT_WEIGHTS if name not in dict(weights)]
+        if missing:
+            raise ValueError(f"Missing weights for: {', '.join(missing)}")
+        if any(weight < 0 for _, weight in weights):
+            raise ValueError("Scoring weights must not be negative")
+
+        self.version = version
+        self.weights = tuple((name, float(weight)) for name, weight in weights)
+        self.weight_map = dict(self.weights)
+        self.tables = tables
+        self.score = self._compile()
+
+    def _compile(self):
+        tables = self.tables
+        plan = tuple(
+            (name, COMPONENT_SCORERS[name], weight) for name, weight in self.weights
+        )
+
+        def score(investor_profile, startup_profile):
+            scores = {}
+            overall = 0
+            for name, scorer, weight in plan:
+                value = scorer(investor_profile, startup_profile, tables)
+                scores[name] = value
+                overall = overall + value * weight
+            return {'overall_score': overall, **scores}
+
+        return score
+
+    def same_definition(self, other):
+        """True when ``other`` scores with the same weights and tables"""
+        return self.weights == other.weights and self.tables == other.tables
+
+    def component(self, name, investor_profile, startup_profile):
+        """Score a single component with this algorithm's tables"""
+        return COMPONENT_SCORERS[name](investor_profile, startup_profile, self.tables)
+
+    def __reduce__(self):
+        # Compiled closures do not pickle; worker processes recompile
+        return (ScoringAlgorithm, (self.version, self.weights, self.tables))
+
+    def __repr__(self):
+        return f"<ScoringAlgorithm {self.version}>"
+
+
+def _tables_from_config(overrides):
+    unknown = set(overrides) - set(ScoringTables._fields)
+    if unknown:
+        raise ValueError(f"Unknown scoring tables: {', '.join(sorted(unknown))}")
+    values = DEFAULT_TABLES._asdict()
+    for name, value in overrides.items():
+        values[name] = dict(value) if name == 'market_size_scores' else tuple(value)
+    return ScoringTables(**values)
+
+
+def compile_config(config, loaded=None):
+    """Compile a parsed scoring config into (active_version, {version: algorithm})
+
+    ``loaded`` holds the algorithms currently in use; they are kept, and a
+    config giving any of them (or the built-in version) a different
+    definition raises ValueError.
+    """
+    algorithms = {DEFAULT_VERSION: ScoringAlgorithm(DEFAULT_VERSION, DEFAULT_WEIGHTS)}
+    for version, algorithm in (loaded or {}).items():
+        algorithms.setdefault(version, algorithm)
+    for version, spec in config.get('versions', {}).items():
+        algorithm = ScoringAlgorithm(
+            version,
+            list(spec['weights'].items()),
+            _tables_from_config(spec.get('tables', {}))
+        )
+        if version in algorithms and not algorithms[version].same_definition(algorithm):
+            raise ValueError(f"Version {version!r} is already defined differently; use a new version")
+        algorithms[version] = algorithm
+
+    active_version = config.get('active_version', DEFAULT_VERSION)
+    if active_version not in algorithms:
+        raise ValueError(f"Active version {active_version!r} is not defined")
+    return active_version, algorithms
+
+
+class ScoringRegistry:
+    """Holds the compiled algorithms and hot-reloads them from a config file"""
+
+    def __init__(self, app=None):
+        self._state = compile_config({})  # (active_version, algorithms), swapped whole
+        self._lock = threading.Lock()
+        self.config_path = None
+        self.check_interval = 2.0
+        self._config_mtime = None
+        self._next_check = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SCORING_CONFIG_PATH', None)
+        app.config.setdefault('SCORING_CONFIG_CHECK_SECONDS', 2.0)
+        app.extensions['scoring_registry'] = self
+        self.config_path = app.config['SCORING_CONFIG_PATH']
+        self.check_interval = app.config['SCORING_CONFIG_CHECK_SECONDS']
+        self._state = compile_config({})
+        self._config_mtime = None
+        self._next_check = 0.0
+        self.reload_if_changed()
+
+    def active(self):
+        """The algorithm new scores should be computed with"""
+        if self.config_path and time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        active_version, algorithms = self._state
+        return algorithms[active_version]
+
+    def get(self, version):
+        return self._state[1].get(version)
+
+    def versions(self):
+        return sorted(self._state[1])
+
+    def reload_if_changed(self):
+        """Recompile from the config file if it changed; returns True on swap"""
+        if not self.config_path:
+            return False
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                mtime = os.stat(self.config_path).st_mtime_ns
+            except OSError as e:
+                logger.error(f"Cannot read scoring config {self.config_path}: {str(e)}")
+                return False
+            if mtime == self._config_mtime:
+                return False
+
+            try:
+                with open(self.config_path) as config_file:
+                    state = compile_config(json.load(config_file), loaded=self._state[1])
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.error(f"Invalid scoring config {self.config_path}, keeping current algorithms: {str(e)}")
+                self._config_mtime = mtime  # Do not retry until the file changes again
+                return False
+
+            self._state = state
+            self._config_mtime = mtime
+            logger.info(f"Loaded scoring config: active version {state[0]} of {', '.join(sorted(state[1]))}")
+            return True
+
+
+scoring_registry = ScoringRegistry()
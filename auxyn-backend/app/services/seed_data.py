@@ -0,0 +1,237 @@
+# app/services/seed_data.py
+"""Synthetic marketplace data.
+
+Bulk-inserts users with investor and startup profiles drawn from skewed,
+roughly realistic distributions (tech-heavy industries, seed-heavy stages,
+stage-dependent funding sizes, clustered locations), plus scored matches with
+interest and view states and their insights. The same seed always produces
+the same data, so benchmark runs are comparable across commits.
+"""
+from app import db
+from app.models.user import User
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.models.match import Match
+from app.models.match_insight import MatchInsight
+from app.services.batch_matching import InvestorRow, StartupRow
+from app.services.matching_service import MatchingService
+from app.services.match_counters import match_counters
+from app.services.profile_search import profile_search
+from app.services.scoring_registry import scoring_registry
+from werkzeug.security import generate_password_hash
+from datetime import datetime, timedelta
+import json
+import logging
+import math
+import random
+
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = 'seed-password'
+
+INDUSTRY_WEIGHTS = {
+    'technology': 18, 'software': 14, 'fintech': 12, 'ai': 10, 'healthcare': 9,
+    'biotech': 6, 'edtech': 5, 'medtech': 4, 'retail': 7, 'energy': 5,
+    'logistics': 4, 'agritech': 3, 'media': 3
+}
+STAGE_WEIGHTS = {'pre_seed': 25, 'seed': 35, 'series_a': 22, 'series_b': 12, 'series_c': 6}
+LOCATION_WEIGHTS = {
+    'California': 30, 'New York': 15, 'Texas': 8, 'Florida': 4, 'Washington': 5,
+    'London': 10, 'Berlin': 6, 'Bangalore': 7, 'Singapore': 5, 'Lagos': 5, 'Toronto': 5
+}
+MARKET_SIZE_WEIGHTS = {'small': 20, 'medium': 35, 'large': 30, 'very_large': 15}
+STAGE_FUNDING = {
+    'pre_seed': 250000, 'seed': 1000000, 'series_a': 5000000,
+    'series_b': 15000000, 'series_c': 40000000
+}
+STAGES = list(STAGE_WEIGHTS)
+
+# Interest states: (value, weight)
+INVESTOR_INTEREST = ((None, 55), ('interested', 30), ('not_interested', 15))
+STARTUP_INTEREST = ((None, 50), ('interested', 35), ('not_interested', 15))
+
+
+class _Sampler:
+    """Weighted choices over a fixed random stream"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def pick(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def pick_pairs(self, pairs):
+        return self.rng.choices([value for value, _ in pairs], weights=[weight for _, weight in pairs])[0]
+
+    def pick_distinct(self, weights, count):
+        chosen = []
+        while len(chosen) < count:
+            value = self.pick(weights)
+            if value not in chosen:
+                chosen.append(value)
+        return chosen
+
+    def funding_for(self, stage):
+        amount = STAGE_FUNDING[stage] * math.exp(self.rng.gauss(0, 0.5))
+        return int(round(amount, -3))
+
+
+def _startup_row(sampler, profile_id, user_id):
+    rng = sampler.rng
+    stage = sampler.pick(STAGE_WEIGHTS)
+    return {
+        'id': profile_id,
+        'user_id': user_id,
+        'company_name': f"Startup {user_id}",
+        'tagline': f"Seeded startup {user_id}",
+        'industry': sampler.pick(INDUSTRY_WEIGHTS),
+        'company_stage': rng.choice(['idea', 'mvp', 'early_revenue', 'growth', 'scale']),
+        'team_size': rng.randint(1, 200),
+        'funding_needed': sampler.funding_for(stage),
+        'funding_stage': stage,
+        'market_size': sampler.pick(MARKET_SIZE_WEIGHTS) if rng.random() > 0.05 else None,
+        'headquarters': sampler.pick(LOCATION_WEIGHTS),
+        'logo_url': None
+    }
+
+
+def _investor_row(sampler, profile_id, user_id):
+    rng = sampler.rng
+    # Investors back a contiguous band of stages around a favourite one
+    center = STAGES.index(sampler.pick(STAGE_WEIGHTS))
+    low = max(0, center - rng.randint(0, 1))
+    high = min(len(STAGES) - 1, center + rng.randint(0, 1))
+    stages = STAGES[low:high + 1]
+    locations = sampler.pick_distinct(LOCATION_WEIGHTS, rng.randint(1, 2)) if rng.random() > 0.2 else []
+    return {
+        'id': profile_id,
+        'user_id': user_id,
+        'name': f"Investor {user_id}",
+        'company': f"Fund {user_id}",
+        'min_investment': int(STAGE_FUNDING[stages[0]] * 0.2),
+        'max_investment': int(STAGE_FUNDING[stages[-1]] * 2),
+        'preferred_industries': json.dumps(sampler.pick_distinct(INDUSTRY_WEIGHTS, rng.randint(1, 3))),
+        'investment_stage': json.dumps(stages),
+        'geographic_preference': json.dumps(locations) if locations else None
+    }
+
+
+def _next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(model, rows, batch_size):
+    # Table-level INSERT: one executemany per batch, no per-row ORM grouping
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(model.__table__.insert(), rows[start:start + batch_size])
+
+
+def seed_marketplace(users, seed=42, investor_share=0.25, matches_per_investor=8, batch_size=5000, now=None):
+    """Insert ``users`` synthetic users with profiles, matches and insights
+
+    Returns a summary of what was inserted. Ids continue after the current
+    maximum, so seeding into a non-empty database is safe.
+    """
+    sampler = _Sampler(seed)
+    rng = sampler.rng
+    algorithm = scoring_registry.active()
+    now = now or datetime.utcnow()
+    password_hash = generate_password_hash(SEED_PASSWORD)
+
+    user_id = _next_id(User)
+    investor_profile_id = _next_id(InvestorProfile)
+    startup_profile_id = _next_id(StartupProfile)
+
+    user_rows, investor_rows, startup_rows = [], [], []
+    for _ in range(users):
+        user_type = 'investor' if rng.random() < investor_share else 'startup'
+        user_rows.append({
+            'id': user_id,
+            'email': f"{user_type}{user_id}@seed.example.com",
+            'password_hash': password_hash,
+            'user_type': user_type
+        })
+        if user_type == 'investor':
+            investor_rows.append(_investor_row(sampler, investor_profile_id, user_id))
+            investor_profile_id += 1
+        else:
+            startup_rows.append(_startup_row(sampler, startup_profile_id, user_id))
+            startup_profile_id += 1
+        user_id += 1
+
+    try:
+        _insert(User, user_rows, batch_size)
+        _insert(InvestorProfile, investor_rows, batch_size)
+        _insert(StartupProfile, startup_rows, batch_size)
+
+        match_count = _seed_matches(
+            sampler, investor_rows, startup_rows, matches_per_investor, algorithm, now, batch_size
+        )
+        # Bulk inserts bypass the counter listener and the search index events
+        match_counters.reconcile(fix=True)
+        profile_search.reindex(InvestorProfile, [row['id'] for row in investor_rows])
+        profile_search.reindex(StartupProfile, [row['id'] for row in startup_rows])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    summary = {
+        'seed': seed,
+        'users': users,
+        'investors': len(investor_rows),
+        'startups': len(startup_rows),
+        'matches': match_count,
+        'algorithm_version': algorithm.version
+    }
+    logger.info(f"Seeded marketplace: {summary}")
+    return summary
+
+
+def _seed_matches(sampler, investor_rows, startup_rows, matches_per_investor, algorithm, now, batch_size):
+    """Score random investor/startup pairs and insert them as matches"""
+    if not investor_rows or not startup_rows:
+        return 0
+
+    rng = sampler.rng
+    startups = [
+        StartupRow(row['id'], row['user_id'], row['industry'], row['funding_needed'],
+                   row['funding_stage'], row['headquarters'], row['market_size'])
+        for row in startup_rows
+    ]
+
+    match_id = _next_id(Match)
+    match_rows, insight_rows = [], []
+    for row in investor_rows:
+        investor = InvestorRow(
+            row['id'], row['user_id'], json.loads(row['preferred_industries']),
+            row['min_investment'], row['max_investment'],
+            json.loads(row['investment_stage']),
+            json.loads(row['geographic_preference']) if row['geographic_preference'] else []
+        )
+        for startup in rng.sample(startups, min(matches_per_investor, len(startups))):
+            match = MatchingService._build_match_record(
+                investor.user_id, startup.user_id, algorithm.score(investor, startup), algorithm.version
+            )
+            match.id = match_id
+            match.created_at = match.updated_at = now - timedelta(seconds=rng.randint(0, 90 * 86400))
+
+            viewed = rng.random() < 0.6
+            match.status = 'viewed' if viewed else 'pending'
+            match.investor_interest = sampler.pick_pairs(INVESTOR_INTEREST)
+            match.startup_interest = sampler.pick_pairs(STARTUP_INTEREST)
+            match._update_match_status()
+            if viewed:
+                match.investor_viewed_at = match.created_at + timedelta(hours=rng.randint(1, 72))
+            if match.investor_interest or match.startup_interest:
+                match.last_interaction_at = match.created_at + timedelta(hours=rng.randint(1, 240))
+
+            match_rows.append({column.key: getattr(match, column.key) for column in Match.__table__.columns})
+            insight_rows.append(MatchingService._build_match_insight(match, investor, startup))
+            match_id += 1
+
+    for row in match_rows:
+        row['generated_by'] = 'seed'
+    _insert(Match, match_rows, batch_size)
+    _insert(MatchInsight, insight_rows, batch_size)
+    return len(match_rows)
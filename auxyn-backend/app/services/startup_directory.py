@@ -0,0 +1,125 @@
+# app/services/startup_directory.py
+"""Paged startup directory.
+
+The directory is listed in one of four orders: ``rating`` (rating_avg),
+``top`` (rating_bayes, the confidence-adjusted rating), ``followers``
+(follower_count) or ``newest`` (created_at). Each is
+descending with the id as tie-breaker, optionally within one ``category``.
+Every order has a (key, id) index and a (category, key, id) index, and pages
+continue after the position encoded in the cursor. A page a million rows
+deep is therefore the same index range seek as the first page; no OFFSET is
+skipped over.
+
+An exact total would cost a COUNT over up to every startup on each request.
+Instead the total is counted once per category and served from memory for
+STARTUP_COUNT_TTL seconds, so it can lag recent inserts by up to that long.
+"""
+from app import db
+from app.models.startup import Startup
+from datetime import datetime
+import base64
+import binascii
+import json
+import threading
+import time
+
+# Sort name -> Startup column, listed in descending order
+SORTS = {
+    'rating': 'rating_avg',
+    'top': 'rating_bayes',
+    'followers': 'follower_count',
+    'newest': 'created_at'
+}
+DEFAULT_SORT = 'newest'
+
+
+class StartupDirectory:
+    """Keyset-paged startup listing with cached totals"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._totals = {}  # category (None for all) -> (expires_at, total)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STARTUP_COUNT_TTL', 60)
+        app.extensions['startup_directory'] = self
+        self.app = app
+        with self._lock:
+            self._totals.clear()
+
+    def page(self, limit=50, cursor=None, category=None, sort=DEFAULT_SORT):
+        """One page of startups plus the cursor of the next page (None on the last page)"""
+        startups = self.query(cursor, category, sort).limit(limit + 1).all()
+        if len(startups) > limit:
+            startups = startups[:limit]
+            return startups, self.encode_cursor(startups[-1], sort)
+        return startups, None
+
+    def iter_startups(self, cursor=None, category=None, sort=DEFAULT_SORT, batch_size=100):
+        """Every startup from ``cursor`` on, in directory order, fetched ``batch_size`` rows at a time"""
+        return iter(self.query(cursor, category, sort).yield_per(batch_size))
+
+    def query(self, cursor, category, sort):
+        """Ordered directory query; raises ValueError for an unknown sort or a bad cursor"""
+        if sort not in SORTS:
+            raise ValueError(f"Invalid sort: choose one of {', '.join(SORTS)}")
+        column = getattr(Startup, SORTS[sort])
+
+        query = Startup.query
+        if category:
+            query = query.filter(Startup.category == category)
+        if cursor:
+            value, startup_id = self.decode_cursor(cursor, sort)
+            # The redundant bound keeps the predicate a range on the index
+            query = query.filter(column <= value, db.or_(column < value, Startup.id < startup_id))
+        return query.order_by(column.desc(), Startup.id.desc())
+
+    def total(self, category=None):
+        """Number of startups in ``category`` (all when None), cached for STARTUP_COUNT_TTL seconds"""
+        now = time.monotonic()
+        ttl = self.app.config['STARTUP_COUNT_TTL'] if self.app is not None else 0
+        with self._lock:
+            entry = self._totals.get(category)
+        if ttl > 0 and entry is not None and entry[0] > now:
+            return entry[1]
+
+        query = db.session.query(db.func.count(Startup.id))
+        if category:
+            query = query.filter(Startup.category == category)
+        total = query.scalar()
+        if ttl > 0:
+            with self._lock:
+                self._totals[category] = (now + ttl, total)
+        return total
+
+    @staticmethod
+    def encode_cursor(startup, sort):
+        """Opaque cursor for the page position after ``startup`` in ``sort`` order"""
+        value = getattr(startup, SORTS[sort])
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        position = json.dumps([sort, value, startup.id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor, sort):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            cursor_sort, value, startup_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if cursor_sort != sort:
+                raise ValueError
+            if sort == 'newest':
+                value = datetime.fromisoformat(value)
+            elif sort in ('rating', 'top'):
+                value = float(value)
+            else:
+                value = int(value)
+            return value, int(startup_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+
+
+startup_directory = StartupDirectory()
@@ -0,0 +1,89 @@
+# app/services/startup_reviews.py
+"""Paged startup reviews.
+
+A startup's ratings are listed newest first, (created_at, id) descending,
+and each page continues after the position encoded in the cursor. The
+ix_rating_startup_created index makes every page one index range seek,
+however many ratings the startup has. Unless the full text is requested,
+review text is cut to REVIEW_EXCERPT_LENGTH characters in SQL, so long
+reviews never leave the database whole.
+
+The summary (histogram, average and Bayesian rating) is read from the
+aggregates on the startup row; see app.services.startup_stats.
+"""
+from app import db
+from app.models.rating import Rating
+from datetime import datetime
+import base64
+import binascii
+import json
+
+
+class StartupReviews:
+    """Keyset-paged rating listing for one startup"""
+
+    @staticmethod
+    def summary(startup):
+        """Rating summary from the startup's stored aggregates; no ratings are read"""
+        return {
+            'average_rating': round(startup.average_rating, 1),
+            'bayesian_rating': round(startup.rating_bayes, 2),
+            'total_ratings': startup.rating_count,
+            'histogram': startup.rating_histogram
+        }
+
+    @staticmethod
+    def page(startup_id, limit=20, cursor=None, full_text=False, excerpt_length=280):
+        """One page of review dicts plus the cursor of the next page (None on the last page)
+
+        Raises ValueError for a bad cursor.
+        """
+        if full_text:
+            text = Rating.review_text
+        else:
+            # One character past the excerpt tells whether anything was cut
+            text = db.func.substr(Rating.review_text, 1, excerpt_length + 1)
+        query = db.session.query(
+            Rating.id, Rating.user_id, Rating.rating, Rating.created_at, text.label('review_text')
+        ).filter(Rating.startup_id == startup_id)
+        if cursor:
+            created_at, rating_id = StartupReviews.decode_cursor(cursor)
+            # The redundant bound keeps the predicate a range on the index
+            query = query.filter(
+                Rating.created_at <= created_at,
+                db.or_(Rating.created_at < created_at, Rating.id < rating_id)
+            )
+        rows = query.order_by(Rating.created_at.desc(), Rating.id.desc()).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = StartupReviews.encode_cursor(rows[-1])
+
+        reviews = []
+        for row in rows:
+            truncated = not full_text and row.review_text is not None and len(row.review_text) > excerpt_length
+            reviews.append({
+                'id': row.id,
+                'rating': row.rating,
+                'review_text': row.review_text[:excerpt_length] if truncated else row.review_text,
+                'review_truncated': truncated,
+                'user_id': row.user_id,
+                'created_at': row.created_at.isoformat() if row.created_at else None
+            })
+        return reviews, next_cursor
+
+    @staticmethod
+    def encode_cursor(rating):
+        """Opaque cursor for the page position after ``rating``"""
+        position = json.dumps([rating.created_at.isoformat(), rating.id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, rating_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(created_at), int(rating_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
@@ -0,0 +1,183 @@
+# app/services/startup_stats.py
+"""Startup rating and follower aggregates.
+
+Each startup row carries ``rating_sum``, ``rating_count``,
+``follower_count``, the rating histogram ``stars_1`` .. ``stars_5`` and the
+derived ``rating_avg`` and ``rating_bayes`` (both indexed for the directory's
+rating sorts), so the startup directory, detail and ratings endpoints read
+one row per startup. No Rating or Follow scan is needed. A before_flush
+listener turns every flushed Rating or Follow insert, change or delete into
+deltas (a rating's contribution after the change minus its contribution
+before), and applies them with relative UPDATEs on the flush's connection.
+The aggregates therefore commit or roll back with the rating or follow that
+changed them.
+
+``rating_bayes`` is the mean rating shrunk towards a prior: it counts
+STARTUP_RATING_PRIOR_WEIGHT phantom ratings of STARTUP_RATING_PRIOR_MEAN on
+top of the real ones, so a single five-star rating does not outrank a
+hundred ratings averaging 4.8. Changing either setting takes effect for
+existing rows on the next reconcile.
+
+Rows written with Core statements bypass the listener;
+``flask startup reconcile-stats`` recomputes the aggregates from the
+ratings and follows tables and reports any drift.
+"""
+from app import db
+from app.models.follow import Follow
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.utils.flush_history import flushed_values
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import defaultdict
+import math
+
+HISTOGRAM_FIELDS = tuple(f'stars_{stars}' for stars in range(1, 6))
+AGGREGATE_FIELDS = ('rating_sum', 'rating_count', 'follower_count') + HISTOGRAM_FIELDS
+DERIVED_FIELDS = ('rating_avg', 'rating_bayes')
+
+
+def _average(rating_sum, rating_count):
+    """SQL expression for rating_avg given the new sum and count"""
+    return db.case((rating_count > 0, db.cast(rating_sum, db.Float) / rating_count), else_=0.0)
+
+
+class StartupStats:
+    """Keeps the startup aggregates in step with Rating and Follow writes"""
+
+    def __init__(self, app=None):
+        self._registered = False
+        self.prior_mean = 3.0
+        self.prior_weight = 5.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('STARTUP_RATING_PRIOR_MEAN', 3.0)
+        app.config.setdefault('STARTUP_RATING_PRIOR_WEIGHT', 5.0)
+        app.extensions['startup_stats'] = self
+        self.prior_mean = float(app.config['STARTUP_RATING_PRIOR_MEAN'])
+        self.prior_weight = float(app.config['STARTUP_RATING_PRIOR_WEIGHT'])
+        if not self._registered:
+            # Load the previous value on set, so deltas never miss an expired attribute
+            for attribute in (Rating.startup_id, Rating.rating, Follow.startup_id):
+                event.listen(attribute, 'set', lambda *args: None, active_history=True)
+            event.listen(Session, 'before_flush', self._before_flush)
+            self._registered = True
+
+    def bayesian_average(self, rating_sum, rating_count):
+        """Mean rating with the prior's phantom ratings added; works on numbers and SQL expressions"""
+        return (self.prior_weight * self.prior_mean + rating_sum) / (self.prior_weight + rating_count)
+
+    def _before_flush(self, session, flush_context, instances):
+        deltas = defaultdict(lambda: dict.fromkeys(AGGREGATE_FIELDS, 0))
+
+        def add(obj, before, sign):
+            if isinstance(obj, Rating):
+                startup_id, rating = flushed_values(obj, ('startup_id', 'rating'), before)
+                if startup_id is not None and rating is not None:
+                    deltas[startup_id]['rating_sum'] += sign * rating
+                    deltas[startup_id]['rating_count'] += sign
+                    if 1 <= rating <= 5:
+                        deltas[startup_id][f'stars_{rating}'] += sign
+            elif isinstance(obj, Follow):
+                startup_id, = flushed_values(obj, ('startup_id',), before)
+                if startup_id is not None:
+                    deltas[startup_id]['follower_count'] += sign
+
+        for obj in session.new:
+            if isinstance(obj, Startup) and obj.rating_bayes is None:
+                obj.rating_bayes = self.bayesian_average(obj.rating_sum or 0, obj.rating_count or 0)
+            add(obj, before=False, sign=1)
+        for obj in session.dirty:
+            if isinstance(obj, (Rating, Follow)) and session.is_modified(obj):
+                add(obj, before=True, sign=-1)
+                add(obj, before=False, sign=1)
+        for obj in session.deleted:
+            add(obj, before=True, sign=-1)
+
+        deltas = {
+            int(startup_id): values for startup_id, values in deltas.items()
+            if any(values.values())
+        }
+        if deltas:
+            self.apply(session.connection(), deltas)
+
+    def apply(self, conn, deltas):
+        """Add {startup_id: {field: delta}} to the startup rows on ``conn``'s transaction"""
+        table = Startup.__table__
+        values = {field: table.c[field] + db.bindparam(f'delta_{field}') for field in AGGREGATE_FIELDS}
+        conn.execute(
+            table.update().where(table.c.id == db.bindparam('delta_startup_id')).values(
+                **values,
+                rating_avg=_average(values['rating_sum'], values['rating_count']),
+                rating_bayes=self.bayesian_average(db.cast(values['rating_sum'], db.Float), values['rating_count'])
+            ),
+            [
+                {'delta_startup_id': startup_id, **{f'delta_{field}': values[field] for field in AGGREGATE_FIELDS}}
+                for startup_id, values in deltas.items()
+            ]
+        )
+
+    def expected(self):
+        """Aggregates recomputed from the ratings and follows tables: {startup_id: values}"""
+        expected = defaultdict(lambda: dict.fromkeys(AGGREGATE_FIELDS, 0))
+        ratings = db.session.query(
+            Rating.startup_id, Rating.rating, db.func.count(Rating.id)
+        ).group_by(Rating.startup_id, Rating.rating)
+        for startup_id, rating, rating_count in ratings:
+            values = expected[startup_id]
+            values['rating_sum'] += rating * rating_count
+            values['rating_count'] += rating_count
+            if 1 <= rating <= 5:
+                values[f'stars_{rating}'] += rating_count
+        follows = db.session.query(Follow.startup_id, db.func.count(Follow.id)).group_by(Follow.startup_id)
+        for startup_id, follower_count in follows:
+            expected[startup_id]['follower_count'] = follower_count
+        for values in expected.values():
+            values['rating_avg'] = values['rating_sum'] / values['rating_count'] if values['rating_count'] else 0.0
+            values['rating_bayes'] = self.bayesian_average(values['rating_sum'], values['rating_count'])
+        return dict(expected)
+
+    def reconcile(self, fix=True):
+        """Compare the stored aggregates with recomputed ones, optionally rewriting them
+
+        Returns a report with the startups checked and one entry per drifted
+        value; with ``fix`` the drifted startups are updated in the current
+        transaction (the caller commits).
+        """
+        expected = self.expected()
+        fields = AGGREGATE_FIELDS + DERIVED_FIELDS
+        zeros = dict(dict.fromkeys(fields, 0), rating_bayes=self.bayesian_average(0, 0))
+        drift, fixes = [], []
+        stored = db.session.query(Startup.id, *[getattr(Startup, field) for field in fields])
+        checked = 0
+        for row in stored:
+            checked += 1
+            want = expected.get(row.id, zeros)
+            changed = False
+            for field in fields:
+                if not math.isclose(getattr(row, field), want[field], abs_tol=1e-9):
+                    drift.append({'startup_id': row.id, 'field': field, 'expected': want[field],
+                                  'stored': getattr(row, field)})
+                    changed = True
+            if changed:
+                fixes.append({'fix_startup_id': row.id, **{f'fix_{field}': want[field] for field in fields}})
+
+        if fix and fixes:
+            table = Startup.__table__
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('fix_startup_id')).values(
+                    **{field: db.bindparam(f'fix_{field}') for field in fields}
+                ),
+                fixes
+            )
+
+        return {
+            'startups': checked,
+            'drifted_startups': len(fixes),
+            'drift': drift
+        }
+
+
+startup_stats = StartupStats()
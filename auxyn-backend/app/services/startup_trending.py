@@ -0,0 +1,213 @@
+# app/services/startup_trending.py
+"""Trending startups leaderboard.
+
+A startup's trending score is the sum over its follows and ratings of the
+event's weight (TRENDING_FOLLOW_WEIGHT, TRENDING_RATING_WEIGHT) decayed by
+half every TRENDING_HALF_LIFE_HOURS since the event. Decaying every score
+on every read would touch every row, so each startup's ``trending_scores``
+row instead stores
+
+    score_log = log(sum of weight * e^(decay * seconds since EPOCH))
+
+Every score shares the same e^(-decay * now) factor, so ordering by
+score_log is ordering by the current score, and the score itself is
+e^(score_log - decay * seconds from EPOCH to now). Log space keeps the
+growing exponentials from overflowing. An event adds or removes one term,
+which changes one row: the leaderboard is a B-tree on (score_log,
+startup_id), with O(log n) updates and top-N reads from the end of the
+index.
+
+A before_flush listener adds a term for each flushed Follow or Rating
+insert and removes it on delete, so unfollowing takes back the follow's
+decayed weight. Re-rating is deliberately not a new event: the rating keeps
+its original time and the score stays the same. The ratings table holds one
+time per rating, so a re-rate term could neither be taken back when the
+rating is deleted nor be reproduced by a rebuild. The terms are applied on the flush's connection and commit
+or roll back with the event. A startup's first event inserts an empty
+(log 0) placeholder row with ON CONFLICT DO NOTHING before the row is
+locked and updated, so concurrent first events queue on the row instead of
+colliding on the insert. Rows written with Core statements bypass the
+listener, and removals can lose precision when the removed term dominates
+the score. Changing a weight or the half-life only applies to new events.
+``flask startup rebuild-trending`` recomputes every score from the follows
+and ratings tables.
+"""
+from app import db
+from app.models.follow import Follow
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.models.trending_score import TrendingScore
+from app.utils.flush_history import flushed_values
+from app.utils.upsert import insert_missing
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import datetime
+import math
+
+# Event times are measured from here; any fixed instant works
+EPOCH = datetime(2020, 1, 1)
+
+# A removal leaving less than this fraction of the score empties it
+REMOVAL_TOLERANCE = 1e-9
+
+# score_log of a placeholder row: log of the empty sum
+EMPTY_SCORE_LOG = float('-inf')
+
+
+def log_add(score_log, term):
+    """log(e^score_log + e^term); None stands for an empty score"""
+    if score_log is None:
+        return term
+    high, low = max(score_log, term), min(score_log, term)
+    return high + math.log1p(math.exp(low - high))
+
+
+def log_subtract(score_log, term):
+    """log(e^score_log - e^term), or None once nothing meaningful is left"""
+    if score_log is None:
+        return None
+    remaining = 1 - math.exp(min(term - score_log, 0.0))
+    if remaining <= REMOVAL_TOLERANCE:
+        return None
+    return score_log + math.log(remaining)
+
+
+class StartupTrending:
+    """Time-decayed trending scores, kept in step with Follow and Rating writes"""
+
+    def __init__(self, app=None):
+        self._registered = False
+        self.half_life_hours = 48.0
+        self.weights = {Follow: 1.0, Rating: 2.0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TRENDING_HALF_LIFE_HOURS', 48.0)
+        app.config.setdefault('TRENDING_FOLLOW_WEIGHT', 1.0)
+        app.config.setdefault('TRENDING_RATING_WEIGHT', 2.0)
+        app.extensions['startup_trending'] = self
+        self.half_life_hours = float(app.config['TRENDING_HALF_LIFE_HOURS'])
+        self.weights = {
+            Follow: float(app.config['TRENDING_FOLLOW_WEIGHT']),
+            Rating: float(app.config['TRENDING_RATING_WEIGHT'])
+        }
+        if self.half_life_hours <= 0 or min(self.weights.values()) <= 0:
+            raise ValueError("Trending half-life and event weights must be positive")
+        if not self._registered:
+            event.listen(Session, 'before_flush', self._before_flush)
+            self._registered = True
+
+    @property
+    def decay(self):
+        """Decay rate per second"""
+        return math.log(2) / (self.half_life_hours * 3600)
+
+    def term(self, model, created_at):
+        """Log-space contribution of a Follow or Rating made at ``created_at``"""
+        return math.log(self.weights[model]) + self.decay * (created_at - EPOCH).total_seconds()
+
+    def score(self, score_log, now=None):
+        """Current score for a stored score_log"""
+        now = now or datetime.utcnow()
+        return math.exp(score_log - self.decay * (now - EPOCH).total_seconds())
+
+    def _before_flush(self, session, flush_context, instances):
+        terms = defaultdict(list)  # startup_id -> [(sign, term)]
+
+        def add(obj, before, sign):
+            startup_id, created_at = flushed_values(obj, ('startup_id', 'created_at'), before)
+            if startup_id is None:
+                return
+            if created_at is None:
+                if before:
+                    return  # Undated rows never scored
+                # Stamp the event now, so the stored time matches the scored one
+                created_at = obj.created_at = datetime.utcnow()
+            terms[int(startup_id)].append((sign, self.term(type(obj), created_at)))
+
+        for obj in session.new:
+            if isinstance(obj, (Follow, Rating)):
+                add(obj, before=False, sign=1)
+        for obj in session.dirty:
+            if isinstance(obj, (Follow, Rating)) and session.is_modified(obj):
+                if flushed_values(obj, ('startup_id', 'created_at'), True) != flushed_values(obj, ('startup_id', 'created_at'), False):
+                    add(obj, before=True, sign=-1)
+                    add(obj, before=False, sign=1)
+        for obj in session.deleted:
+            if isinstance(obj, (Follow, Rating)):
+                add(obj, before=True, sign=-1)
+
+        if terms:
+            self.apply(session.connection(), terms)
+
+    def apply(self, conn, terms):
+        """Add and remove {startup_id: [(sign, term)]} on ``conn``'s transaction"""
+        table = TrendingScore.__table__
+        startup_ids = sorted(terms)
+        # Every startup gets a row to lock; placeholders left empty are deleted below
+        insert_missing(conn, table, [
+            {'startup_id': startup_id, 'score_log': EMPTY_SCORE_LOG} for startup_id in startup_ids
+        ])
+        current = dict(conn.execute(
+            db.select(table.c.startup_id, table.c.score_log)
+            .where(table.c.startup_id.in_(startup_ids))
+            .with_for_update()
+        ).all())
+
+        updates, deletes = [], []
+        for startup_id in startup_ids:
+            score_log = current[startup_id]
+            if score_log == EMPTY_SCORE_LOG:
+                score_log = None
+            # Additions first, so a removal never outweighs a score about to grow
+            for sign, term in sorted(terms[startup_id], key=lambda item: -item[0]):
+                score_log = log_add(score_log, term) if sign > 0 else log_subtract(score_log, term)
+            if score_log is None:
+                deletes.append({'trending_startup_id': startup_id})
+            else:
+                updates.append({'trending_startup_id': startup_id, 'trending_score_log': score_log})
+
+        if updates:
+            conn.execute(
+                table.update().where(table.c.startup_id == db.bindparam('trending_startup_id')).values(
+                    score_log=db.bindparam('trending_score_log')
+                ),
+                updates
+            )
+        if deletes:
+            conn.execute(table.delete().where(table.c.startup_id == db.bindparam('trending_startup_id')), deletes)
+
+    def top(self, limit=20, now=None):
+        """The ``limit`` highest scoring startups as (startup, current score), best first"""
+        rows = db.session.query(Startup, TrendingScore.score_log).join(
+            TrendingScore, TrendingScore.startup_id == Startup.id
+        ).order_by(TrendingScore.score_log.desc(), TrendingScore.startup_id.desc()).limit(limit)
+        return [(startup, self.score(score_log, now)) for startup, score_log in rows]
+
+    def rebuild(self, batch_size=1000):
+        """Recompute every score from the follows and ratings tables
+
+        Runs in the current transaction (the caller commits) and returns the
+        number of startups scored and events read.
+        """
+        scores, events = {}, 0
+        for model in (Follow, Rating):
+            rows = db.session.query(model.startup_id, model.created_at).filter(
+                model.created_at.isnot(None)
+            ).yield_per(batch_size)
+            for startup_id, created_at in rows:
+                scores[startup_id] = log_add(scores.get(startup_id), self.term(model, created_at))
+                events += 1
+
+        table = TrendingScore.__table__
+        db.session.execute(table.delete())
+        if scores:
+            db.session.execute(table.insert(), [
+                {'startup_id': startup_id, 'score_log': score_log} for startup_id, score_log in scores.items()
+            ])
+        return {'startups': len(scores), 'events': events}
+
+
+startup_trending = StartupTrending()
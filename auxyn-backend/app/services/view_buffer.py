@@ -0,0 +1,235 @@
+# app/services/view_buffer.py
+"""Write-coalescing buffer for match view tracking.
+
+Marking a match as viewed only stamps ``*_viewed_at`` and
+``last_interaction_at`` (and moves a pending match to viewed), but written
+synchronously it costs a commit per page view, and on SQLite each of those
+commits queues behind the single writer lock. Instead, view events are kept
+in memory, one per (match, side) with the latest view time, and a
+background thread writes them in batched UPDATEs every
+VIEW_BUFFER_FLUSH_SECONDS, or as soon as VIEW_BUFFER_FLUSH_SIZE are pending.
+The buffer is bounded: a request that finds VIEW_BUFFER_MAX_PENDING events
+pending flushes them itself. Whatever is left is flushed at interpreter exit.
+
+A flush is one transaction. It moves pending matches to viewed with an
+UPDATE ... RETURNING, so the match counters are adjusted for exactly the
+rows that changed status. It stamps the view times without ever moving
+them backwards. After commit it invalidates the participants' cached
+dashboard responses. Views are visible to other requests only once
+flushed, and views not yet flushed are lost if the process is killed. Set
+VIEW_BUFFER_ENABLED=false to write every view synchronously.
+"""
+from app import db
+from app.models.match import Match
+from app.services.match_counters import match_counters, COUNTER_FIELDS
+from app.services.response_cache import response_cache
+from collections import defaultdict
+from datetime import datetime
+import atexit
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# View timestamp column per side of a match
+VIEW_COLUMNS = {'investor': 'investor_viewed_at', 'startup': 'startup_viewed_at'}
+
+
+def _latest(column, value):
+    """SQL expression keeping the later of a nullable timestamp column and a bound value"""
+    return db.case((db.or_(column.is_(None), column < value), value), else_=column)
+
+
+class ViewBuffer:
+    """Collects match view events in memory and writes them in batches"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pending = {}  # (match_id, side) -> latest view time
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+        self._atexit_registered = False
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('VIEW_BUFFER_ENABLED', True)
+        app.config.setdefault('VIEW_BUFFER_FLUSH_SECONDS', 2.0)
+        app.config.setdefault('VIEW_BUFFER_FLUSH_SIZE', 500)
+        app.config.setdefault('VIEW_BUFFER_MAX_PENDING', 10000)
+        app.extensions['view_buffer'] = self
+        with self._lock:
+            self._pending.clear()  # Events recorded for a previous app's database
+        self.app = app
+        self._reset_stats()
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def _reset_stats(self):
+        self.recorded = 0
+        self.coalesced = 0
+        self.written = 0
+        self.flushes = 0
+        self.last_flush_ms = None
+
+    @property
+    def enabled(self):
+        return self.app is not None and self.app.config['VIEW_BUFFER_ENABLED']
+
+    def mark_viewed(self, match, user_type):
+        """Record that the ``user_type`` side of ``match`` viewed it
+
+        With the buffer disabled this commits through the Match methods.
+        Otherwise the event is queued and ``match`` is detached from the
+        session before the view is applied to it, so it serializes as viewed
+        without being written now.
+        """
+        side = 'investor' if user_type == 'investor' else 'startup'
+        mark = match.mark_viewed_by_investor if side == 'investor' else match.mark_viewed_by_startup
+        if not self.enabled:
+            mark()
+            return
+
+        db.session.expunge(match)
+        mark(commit=False)
+        self.record(match.id, side, getattr(match, VIEW_COLUMNS[side]))
+
+    def record(self, match_id, side, viewed_at=None):
+        """Queue one view event, keeping the latest per (match, side)"""
+        viewed_at = viewed_at or datetime.utcnow()
+        key = (match_id, side)
+        with self._lock:
+            self.recorded += 1
+            if key in self._pending:
+                self.coalesced += 1
+                viewed_at = max(viewed_at, self._pending[key])
+            self._pending[key] = viewed_at
+            pending = len(self._pending)
+
+        config = self.app.config
+        if pending >= config['VIEW_BUFFER_MAX_PENDING']:
+            self.flush()  # Buffer full: this request writes the batch itself
+        elif pending >= config['VIEW_BUFFER_FLUSH_SIZE']:
+            self._wake.set()
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='view-buffer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.app.config['VIEW_BUFFER_FLUSH_SECONDS'])
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error(f"View buffer flush failed: {str(e)}")
+
+    def flush(self):
+        """Write every pending view event; must run inside an application context
+
+        Returns the number of (match, side) events written. On failure the
+        events are queued again and the error is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._pending = self._pending, {}
+            if not events:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                users = self._write(events)
+            except Exception:
+                with self._lock:
+                    for key, viewed_at in events.items():
+                        self._pending[key] = max(viewed_at, self._pending.get(key, viewed_at))
+                raise
+
+            response_cache.invalidate(users)
+            self.written += len(events)
+            self.flushes += 1
+            self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            return len(events)
+
+    def _write(self, events):
+        """Apply a batch of events in one transaction, returning the affected users"""
+        now = datetime.utcnow()
+        table = Match.__table__
+        match_ids = sorted({match_id for match_id, _ in events})
+
+        with db.engine.begin() as conn:
+            # Pending matches become viewed; RETURNING yields exactly the rows that moved
+            moved = conn.execute(
+                table.update()
+                .where(table.c.id.in_(match_ids), table.c.status == 'pending')
+                .values(status='viewed', updated_at=now)
+                .returning(table.c.investor_id, table.c.startup_id)
+            ).all()
+            if moved:
+                counters = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+                for participants in moved:
+                    for user_id in participants:
+                        counters[user_id]['pending'] -= 1
+                        counters[user_id]['viewed'] += 1
+                match_counters.apply(conn, counters, {})
+
+            for side, column in VIEW_COLUMNS.items():
+                rows = [
+                    {'event_match_id': match_id, 'viewed': viewed_at}
+                    for (match_id, event_side), viewed_at in events.items() if event_side == side
+                ]
+                if rows:
+                    viewed = db.bindparam('viewed')
+                    conn.execute(
+                        table.update().where(table.c.id == db.bindparam('event_match_id')).values({
+                            column: _latest(table.c[column], viewed),
+                            'last_interaction_at': _latest(table.c.last_interaction_at, viewed),
+                            'updated_at': now
+                        }),
+                        rows
+                    )
+
+            participants = conn.execute(
+                db.select(table.c.investor_id, table.c.startup_id).where(table.c.id.in_(match_ids))
+            ).all()
+        return {user_id for row in participants for user_id in row}
+
+    def shutdown(self):
+        """Stop the flush thread and write whatever is still pending"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        if self.app is not None and self._pending:
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Could not flush {len(self._pending)} view events at shutdown: {str(e)}")
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'pending': len(self._pending),
+            'recorded': self.recorded,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'flushes': self.flushes,
+            'last_flush_ms': self.last_flush_ms
+        }
+
+
+view_buffer = ViewBuffer()
@@ -0,0 +1,16 @@
+# app/utils/auth.py
+from flask_jwt_extended import get_jwt
+from app.models.user import User
+
+def current_user_type(user_id):
+    """User type of the authenticated user
+    
+    Read from the token's user_type claim (set at login/registration), so
+    read-only endpoints need no user lookup; falls back to the database for
+    tokens without the claim.
+    """
+    user_type = get_jwt().get('user_type')
+    if user_type:
+        return user_type
+    user = User.query.get(user_id)
+    return user.user_type if user else None
@@ -0,0 +1,84 @@
+# app/utils/compression.py
+"""Transparent gzip/deflate compression of API responses.
+
+An after_request hook compresses successful JSON and NDJSON responses when
+the client's Accept-Encoding allows gzip or deflate. Buffered bodies are
+compressed only from COMPRESS_MIN_SIZE bytes up, since small payloads gain
+nothing. Streamed bodies are compressed chunk by chunk as they are
+generated, so streaming keeps its flat memory profile, and each chunk ends
+with a sync flush: the client can decompress every line as soon as it is
+sent instead of waiting for zlib's buffer to fill.
+
+Compressed responses get a weak ETag (the bytes differ from the identity
+encoding) and ``Vary: Accept-Encoding``. If-None-Match revalidation uses
+weak comparison, so conditional GETs still answer 304.
+"""
+from flask import request
+import gzip
+import zlib
+
+# zlib window bits for each content coding
+WBITS = {'gzip': 31, 'deflate': 15}
+
+
+def _compress_stream(chunks, coding, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[coding])
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+            # Sync flush: byte-aligned output the client can decode now, history kept for ratio
+            yield data + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+class ResponseCompression:
+    """Compresses API responses according to Accept-Encoding"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_MIMETYPES', ['application/json', 'application/x-ndjson'])
+        app.extensions['compression'] = self
+        self.config = app.config
+        app.after_request(self._after_request)
+
+    def _after_request(self, response):
+        if response.mimetype not in self.config['COMPRESS_MIMETYPES']:
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+                or 'Content-Encoding' in response.headers or response.direct_passthrough):
+            return response
+
+        coding = request.accept_encodings.best_match(['gzip', 'deflate'])
+        if coding is None:
+            return response
+        level = self.config['COMPRESS_LEVEL']
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, coding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.config['COMPRESS_MIN_SIZE']:
+                return response
+            if coding == 'gzip':
+                response.set_data(gzip.compress(data, level, mtime=0))
+            else:
+                response.set_data(zlib.compress(data, level))
+
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+compression = ResponseCompression()
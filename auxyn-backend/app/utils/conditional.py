@@ -0,0 +1,53 @@
+# app/utils/conditional.py
+"""Conditional GET helpers.
+
+Routes derive validators from the columns that change whenever their payload
+does (row ids, version counters, updated_at) rather than from the serialized
+body. When the request is conditional, the route fetches only those columns,
+and the full rows are loaded and serialized only if the client's copy is
+stale.
+"""
+from flask import request, make_response
+from datetime import datetime, timezone
+import hashlib
+
+
+def is_conditional():
+    """True when the request carries If-None-Match or If-Modified-Since"""
+    return bool(request.if_none_match) or request.if_modified_since is not None
+
+
+def row_etag(kind, *versions):
+    """Strong ETag for a resource from the identities and versions of its rows"""
+    token = '|'.join(v.isoformat() if isinstance(v, datetime) else str(v) for v in (kind, *versions))
+    return hashlib.sha1(token.encode()).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since is not None and last_modified is not None:
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+
+def conditional_response(etag, last_modified, build):
+    """304 when the client's copy is current, otherwise the response from ``build()``
+
+    Both carry the ETag, Last-Modified (naive UTC) and ``Cache-Control:
+    private, no-cache`` so clients revalidate before reusing the payload.
+    """
+    if _not_modified(etag, last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,23 @@
+# app/utils/flush_history.py
+"""Attribute values around a pending flush.
+
+before_flush listeners that maintain rollups (startup stats, trending
+scores) turn each changed row into its contribution before the flush minus
+its contribution after. ``flushed_values`` reads either side from the
+attribute history.
+"""
+from sqlalchemy import inspect
+
+
+def flushed_values(obj, attributes, before):
+    """Values of ``attributes`` on ``obj`` before or after the pending flush"""
+    obj_state = inspect(obj)
+    if before and obj_state.persistent:
+        for attribute in obj_state.expired_attributes & set(attributes):
+            getattr(obj, attribute)  # Unmodified expired values are not in the history
+    values = []
+    for attribute in attributes:
+        history = obj_state.attrs[attribute].history
+        current = (history.deleted or history.unchanged) if before else (history.added or history.unchanged)
+        values.append(current[0] if current else None)
+    return values
@@ -5,21 +5,21 @@ import traceback
 from functools import wraps
 from flask import request, jsonify
 
-# Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-
 # Configure logger
 logger = logging.getLogger('auxyn')
 logger.setLevel(logging.INFO)
 
-# Create file handler
-file_handler = RotatingFileHandler('logs/auxyn.log', maxBytes=10240, backupCount=10)
-file_handler.setFormatter(logging.Formatter(
-    '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-))
-file_handler.setLevel(logging.INFO)
-logger.addHandler(file_handler)
+# Create file handler (LOG_FILE='' turns file logging off, as the tests do)
+log_file = os.environ.get('LOG_FILE', 'logs/auxyn.log')
+if log_file:
+    if os.path.dirname(log_file) and not os.path.exists(os.path.dirname(log_file)):
+        os.makedirs(os.path.dirname(log_file))
+    file_handler = RotatingFileHandler(log_file, maxBytes=10240, backupCount=10)
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+    ))
+    file_handler.setLevel(logging.INFO)
+    logger.addHandler(file_handler)
 
 # Create console handler
 console_handler = logging.StreamHandler()
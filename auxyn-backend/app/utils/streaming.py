@@ -0,0 +1,29 @@
+# app/utils/streaming.py
+"""Newline-delimited JSON streaming for list endpoints.
+
+Clients opt in with ``Accept: application/x-ndjson``. The endpoint then
+returns every matching item as one JSON document per line, serialized as it
+is read, instead of building a page in memory with ``jsonify``.
+"""
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    """True when the client prefers NDJSON over JSON (plain JSON wins ties)"""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_response(items):
+    """Stream ``items`` (JSON-serializable dicts) one line at a time
+
+    The generator runs inside the request context, so lazily loaded rows and
+    the database session stay usable until the last line is sent.
+    """
+    def generate():
+        dumps = current_app.json.dumps
+        for item in items:
+            yield dumps(item) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
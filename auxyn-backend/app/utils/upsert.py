@@ -0,0 +1,28 @@
+# app/utils/upsert.py
+"""Race-free creation of rollup rows.
+
+Rollup tables (match counters, trending scores) get a row the first time a
+key is seen. Selecting for the key and inserting the missing ones lets two
+transactions both insert the same key, and the loser's IntegrityError aborts
+its whole flush. ``insert_missing`` instead issues one INSERT that skips
+keys that already exist (ON CONFLICT DO NOTHING on SQLite and PostgreSQL,
+INSERT IGNORE on MySQL), so callers can follow it with relative UPDATEs.
+"""
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def insert_missing(conn, table, rows):
+    """Insert ``rows`` into ``table``, skipping any whose primary key already exists"""
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        statement = sqlite_insert(table).on_conflict_do_nothing()
+    elif dialect == 'postgresql':
+        statement = pg_insert(table).on_conflict_do_nothing()
+    elif dialect in ('mysql', 'mariadb'):
+        statement = table.insert().prefix_with('IGNORE')
+    else:
+        raise NotImplementedError(f"insert_missing does not support {dialect}")
+    conn.execute(statement, rows)
@@ -0,0 +1,133 @@
+# benchmarks/candidate_pruning.py
+"""Benchmark candidate-index pruning on a skewed synthetic marketplace.
+
+Most startups sit in industries and stages far from every investor's
+preferences, which is where the inverted indexes let generation skip whole
+tiers. Generation is run for the same investors with the indexes disabled
+(full scan) and enabled, and the pairs scored and latencies are compared.
+
+    python benchmarks/candidate_pruning.py --startups 20000 --investors 25
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(db, rng, startup_count, investor_count, niche_share):
+    from app.models.user import User
+    from app.models.investor_profile import InvestorProfile
+    from app.models.startup_profile import StartupProfile
+
+    niche_industries = ['fintech', 'ai', 'healthcare']
+    other_industries = ['retail', 'energy', 'logistics', 'agritech', 'media']
+
+    investor_ids = []
+    for i in range(investor_count):
+        user = User(email=f'bench-investor{i}@example.com', user_type='investor')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(InvestorProfile(
+            user_id=user.id,
+            name=f'Investor {i}',
+            min_investment=100000,
+            max_investment=2000000,
+            preferred_industries=json.dumps(rng.sample(niche_industries, rng.randint(1, 2))),
+            investment_stage=json.dumps(['pre_seed']),
+            geographic_preference=json.dumps(rng.sample(['California', 'London', 'Berlin'], 1))
+        ))
+        investor_ids.append(user.id)
+
+    users = [
+        User(email=f'bench-startup{i}@example.com', user_type='startup')
+        for i in range(startup_count)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+    for user in users:
+        niche = rng.random() < niche_share
+        db.session.add(StartupProfile(
+            user_id=user.id,
+            company_name=f'Startup {user.id}',
+            industry=rng.choice(niche_industries if niche else other_industries),
+            funding_needed=rng.choice([150000, 800000, 5000000]),
+            funding_stage='pre_seed' if niche else rng.choice(['series_b', 'series_c']),
+            headquarters=rng.choice(['California', 'Texas', 'London', 'Berlin', 'Lagos']),
+            market_size=rng.choice(['small', 'medium', 'large', 'very_large'])
+        ))
+    db.session.commit()
+    return investor_ids
+
+
+def run(investor_ids, limit, pruned):
+    from app import db
+    from app.services.candidate_index import candidate_indexes
+    from app.services.matching_service import MatchingService
+
+    candidate_indexes.enabled = pruned
+    if pruned:
+        # Build outside the timed runs, as a long-lived worker would
+        candidate_indexes.startups.ensure_fresh()
+
+    latencies = []
+    scanned = 0
+    results = []
+    for investor_id in investor_ids:
+        report = {}
+        started = time.perf_counter()
+        matches = MatchingService.generate_matches_for_user(investor_id, limit, report=report, commit=False)
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append([(m.startup_id, m.compatibility_score) for m in matches])
+        scanned += report['candidates_scanned']
+        db.session.rollback()
+
+    return {
+        'pairs_scored': scanned,
+        'p50_ms': round(statistics.median(latencies), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'max_ms': round(max(latencies), 2)
+    }, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--startups', type=int, default=20000)
+    parser.add_argument('--investors', type=int, default=25)
+    parser.add_argument('--niche-share', type=float, default=0.05,
+                        help='Fraction of startups in the investors\' industries and stage')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='auxyn-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from app import create_app, db
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        investor_ids = seed(db, random.Random(args.seed), args.startups, args.investors, args.niche_share)
+
+        full, full_results = run(investor_ids, args.limit, pruned=False)
+        pruned, pruned_results = run(investor_ids, args.limit, pruned=True)
+
+    print(json.dumps({
+        'startups': args.startups,
+        'investors': args.investors,
+        'niche_share': args.niche_share,
+        'full_scan': full,
+        'indexed': pruned,
+        'identical_results': full_results == pruned_results,
+        'pairs_scored_reduction': round(1 - pruned['pairs_scored'] / full['pairs_scored'], 3),
+        'p50_speedup': round(full['p50_ms'] / pruned['p50_ms'], 2)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# benchmarks/matching_suite.py
+"""End-to-end matching benchmarks over seeded synthetic marketplaces.
+
+For each dataset size a fresh SQLite database is seeded with
+``seed_marketplace`` (same seed, same data), then match generation and the
+match read endpoints are timed for a sample of investors and startups.
+Latency percentiles, SQL statements per call and peak Python memory are
+reported per operation as JSON, so runs can be diffed across commits.
+
+    python benchmarks/matching_suite.py --sizes 500 2000 8000 --output report.json
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# name -> (path, extra request headers)
+ENDPOINTS = {
+    'get_matches': ('/api/matches/{user_id}', {}),
+    'stream_matches': ('/api/matches/{user_id}', {'Accept': 'application/x-ndjson'}),
+    'stream_matches_gzip': ('/api/matches/{user_id}', {'Accept': 'application/x-ndjson', 'Accept-Encoding': 'gzip'}),
+    'match_stats': ('/api/matches/stats', {}),
+    'match_analytics': ('/api/matches/dashboard/match-analytics', {})
+}
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    latencies = [sample['ms'] for sample in samples]
+    queries = [sample['queries'] for sample in samples]
+    summary = {
+        'calls': len(samples),
+        'bytes_mean': round(sum(sample.get('bytes', 0) for sample in samples) / len(samples)),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries_mean': round(sum(queries) / len(queries), 1),
+        'queries_max': max(queries),
+        'peak_kib_max': round(max(sample['peak_kib'] for sample in samples), 1)
+    }
+    statuses = sorted({sample['status'] for sample in samples if sample.get('status')})
+    if statuses:
+        summary['statuses'] = statuses
+    return summary
+
+
+def measure(counter, func):
+    """Run func once, returning its result and one latency/queries/memory sample"""
+    counter.count = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {'ms': elapsed, 'queries': counter.count, 'peak_kib': peak / 1024}
+
+
+def sample_users(user_type, count, rng):
+    from app.models.user import User
+    ids = [row.id for row in User.query.with_entities(User.id).filter_by(user_type=user_type).order_by(User.id)]
+    return rng.sample(ids, min(count, len(ids)))
+
+
+def bench_generation(counter, user_ids, limit):
+    from app import db
+    from app.services.matching_service import MatchingService
+
+    samples = []
+    for user_id in user_ids:
+        _, sample = measure(
+            counter, lambda: MatchingService.generate_matches_for_user(user_id, limit, commit=False)
+        )
+        samples.append(sample)
+        db.session.rollback()
+    return summarize(samples)
+
+
+def _fetch(client, path, headers):
+    response = client.get(path, headers=headers)
+    response.get_data()
+    return response
+
+
+def bench_endpoints(app, counter, users):
+    from flask_jwt_extended import create_access_token
+
+    client = app.test_client()
+    samples = {name: [] for name in ENDPOINTS}
+    for user in users:
+        token = create_access_token(
+            identity=str(user.id),
+            additional_claims={'email': user.email, 'user_type': user.user_type}
+        )
+        headers = {'Authorization': f'Bearer {token}'}
+        for name, (path, extra_headers) in ENDPOINTS.items():
+            # Read the body inside the measurement, so streamed responses are fully generated
+            response, sample = measure(counter, lambda: _fetch(client, path.format(user_id=user.id), {
+                **headers, **extra_headers
+            }))
+            sample['status'] = response.status_code
+            sample['bytes'] = len(response.data)
+            samples[name].append(sample)
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def bench_triage(app, counter, users):
+    """Interest changes for all of a user's matches: one call per match vs one bulk call"""
+    from flask_jwt_extended import create_access_token
+    from app.models.match import Match
+
+    client = app.test_client()
+    samples = {'single_calls': [], 'bulk': []}
+    for user in users:
+        owner = Match.investor_id if user.user_type == 'investor' else Match.startup_id
+        match_ids = [match_id for (match_id,) in Match.query.with_entities(Match.id).filter(owner == user.id)]
+        if not match_ids:
+            continue
+        token = create_access_token(
+            identity=str(user.id),
+            additional_claims={'email': user.email, 'user_type': user.user_type}
+        )
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def single_calls():
+            return [
+                client.put(f'/api/matches/{match_id}/interest', json={'interest': 'interested'}, headers=headers)
+                for match_id in match_ids
+            ][-1]
+
+        def bulk():
+            items = [{'match_id': match_id, 'interest': 'not_interested'} for match_id in match_ids]
+            return client.post('/api/matches/bulk', json={'items': items}, headers=headers)
+
+        for name, func in (('single_calls', single_calls), ('bulk', bulk)):
+            response, sample = measure(counter, func)
+            sample['status'] = response.status_code
+            samples[name].append(sample)
+    return {name: summarize(values) for name, values in samples.items() if values}
+
+
+def run_size(size, args, workdir):
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, f'bench-{size}.db')}"
+
+    from app import create_app, db
+    from app.models.user import User
+    from app.services.seed_data import seed_marketplace
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seeded = seed_marketplace(size, seed=args.seed, matches_per_investor=args.matches_per_investor)
+        seed_seconds = time.perf_counter() - started
+
+        counter = QueryCounter(db.engine)
+        rng = random.Random(args.seed)
+        investor_ids = sample_users('investor', args.sample, rng)
+        startup_ids = sample_users('startup', args.sample, rng)
+
+        result = {
+            'size': size,
+            'seeded': seeded,
+            'seed_seconds': round(seed_seconds, 2),
+            'generate_matches': {
+                'investor': bench_generation(counter, investor_ids, args.limit),
+                'startup': bench_generation(counter, startup_ids, args.limit)
+            }
+        }
+
+        users = User.query.filter(User.id.in_(investor_ids + startup_ids)).order_by(User.id).all()
+        result['endpoints'] = bench_endpoints(app, counter, users)
+        result['triage'] = bench_triage(app, counter, users)
+        db.session.remove()
+        db.engine.dispose()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 8000],
+                        help='Users per seeded dataset')
+    parser.add_argument('--sample', type=int, default=20,
+                        help='Investors and startups timed per dataset')
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--matches-per-investor', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    os.environ.setdefault('MATCH_JOB_EXECUTOR', 'sync')
+    workdir = tempfile.mkdtemp(prefix='auxyn-bench-')
+
+    report = {
+        'benchmark': 'matching_suite',
+        'git_revision': git_revision(),
+        'python': sys.version.split()[0],
+        'seed': args.seed,
+        'sample': args.sample,
+        'limit': args.limit,
+        'datasets': [run_size(size, args, workdir) for size in args.sizes]
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as report_file:
+            report_file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
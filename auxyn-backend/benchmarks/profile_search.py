@@ -0,0 +1,148 @@
+# benchmarks/profile_search.py
+"""Benchmark profile search against a LIKE '%term%' baseline.
+
+Startup and investor profiles are bulk-inserted with descriptions, bios,
+taglines and expertise areas drawn from a skewed vocabulary, so common and
+rare words, as well as prefixes, are all represented. Each query is then run
+through the search service (FTS5 and the in-memory fallback: ranked top page
+plus the total) and through the LIKE scan a client-side filter would amount
+to (every profile whose searched columns contain every term, unranked).
+
+    python benchmarks/profile_search.py --profiles 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    'payments ledger payroll analytics platform marketplace logistics recycling solar battery grid '
+    'clinic diagnostics genomics tutoring curriculum freight warehouse robotics drone insurance '
+    'lending compliance identity fraud cloud security observability kubernetes database search '
+    'restaurant grocery fashion resale travel booking housing rental construction agriculture '
+    'irrigation fertilizer aquaculture carbon offset hydrogen telemetry satellite climate water'
+).split()
+FILLER = 'we build the for and with teams customers small medium enterprise automated simple fast'.split()
+
+QUERIES = ['payments', 'ledger payroll', 'aquaculture', 'sat*', 'climate water', 'kube*', 'platform']
+
+
+def _text(rng, words):
+    # Zipf-like: early vocabulary words are far more common than late ones
+    picks = [WORDS[min(int(rng.paretovariate(1.1)) - 1, len(WORDS) - 1)] for _ in range(words // 3)]
+    return ' '.join(rng.sample(picks + rng.choices(FILLER, k=words - len(picks)), words)).capitalize() + '.'
+
+
+def seed(db, rng, count, batch_size=10000):
+    from app.models.user import User
+    from app.models.investor_profile import InvestorProfile
+    from app.models.startup_profile import StartupProfile
+
+    for start in range(0, count, batch_size):
+        users, startups, investors = [], [], []
+        for user_id in range(start + 1, min(count, start + batch_size) + 1):
+            investor = rng.random() < 0.25
+            users.append({'id': user_id, 'email': f'user{user_id}@bench.example.com',
+                          'user_type': 'investor' if investor else 'startup'})
+            if investor:
+                investors.append({'user_id': user_id, 'name': f'Investor {user_id}', 'title': 'Partner',
+                                  'company': f'Fund {user_id}', 'bio': _text(rng, 40),
+                                  'expertise_areas': json.dumps(rng.sample(WORDS, 3))})
+            else:
+                startups.append({'user_id': user_id, 'company_name': f'Startup {user_id}',
+                                 'tagline': _text(rng, 6), 'description': _text(rng, 80),
+                                 'value_proposition': _text(rng, 15)})
+        db.session.execute(User.__table__.insert(), users)
+        db.session.execute(InvestorProfile.__table__.insert(), investors)
+        db.session.execute(StartupProfile.__table__.insert(), startups)
+    db.session.commit()
+
+
+def like_search(db, query, limit):
+    """Profiles whose searched text contains every term (prefix terms as substrings), unranked"""
+    from app.models.investor_profile import InvestorProfile
+    from app.models.startup_profile import StartupProfile
+
+    terms = [word.rstrip('*') for word in query.split()]
+    sides = (
+        (StartupProfile, (StartupProfile.company_name, StartupProfile.tagline, StartupProfile.description,
+                          StartupProfile.value_proposition)),
+        (InvestorProfile, (InvestorProfile.name, InvestorProfile.title, InvestorProfile.company,
+                           InvestorProfile.bio, InvestorProfile.expertise_areas))
+    )
+    rows, total = [], 0
+    for model, columns in sides:
+        conditions = [db.or_(*[column.ilike(f'%{term}%') for column in columns]) for term in terms]
+        total += db.session.query(db.func.count(model.id)).filter(*conditions).scalar()
+        rows += db.session.query(model.id).filter(*conditions).limit(limit).all()
+    return rows[:limit], total
+
+
+def timed(func, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='auxyn-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'search.db')}"
+    os.environ.setdefault('MATCH_JOB_EXECUTOR', 'sync')
+
+    from app import create_app, db
+    from app.services.profile_search import profile_search
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(db, random.Random(args.seed), args.profiles)
+        report = {
+            'benchmark': 'profile_search',
+            'profiles': args.profiles,
+            'limit': args.limit,
+            'seed_seconds': round(time.perf_counter() - started, 1),
+            'index_seconds': {},
+            'queries': {}
+        }
+
+        for backend in ('fts5', 'memory'):
+            app.config['SEARCH_BACKEND'] = backend
+            profile_search.init_app(app)
+            started = time.perf_counter()
+            if backend == 'fts5':
+                profile_search.rebuild()
+                db.session.commit()
+            else:
+                profile_search.search('warmup')  # First search builds the index
+            report['index_seconds'][backend] = round(time.perf_counter() - started, 1)
+
+            for query in QUERIES:
+                (_, total), ms = timed(lambda: profile_search.search(query, limit=args.limit), args.repeat)
+                report['queries'].setdefault(query, {})[backend] = {'ms': ms, 'total': total}
+
+        for query in QUERIES:
+            (_, total), ms = timed(lambda: like_search(db, query, args.limit), args.repeat)
+            report['queries'][query]['like'] = {'ms': ms, 'total': total}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
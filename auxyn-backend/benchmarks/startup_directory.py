@@ -0,0 +1,120 @@
+# benchmarks/startup_directory.py
+"""Benchmark the paged startup directory on a large synthetic table.
+
+Startups are bulk-inserted with random categories, aggregates and creation
+times, then the first page, a page reached by following cursors deep into the
+table, and the same depth fetched with OFFSET are timed for every sort, with
+and without a category filter. Cold and cached totals are timed as well.
+
+    python benchmarks/startup_directory.py --startups 1000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['fintech', 'ai', 'healthcare', 'retail', 'energy', 'logistics', 'agritech', 'media']
+
+
+def seed(db, rng, count, batch_size=20000):
+    from app.models.startup import Startup
+
+    table = Startup.__table__
+    started = datetime(2020, 1, 1)
+    for offset in range(0, count, batch_size):
+        rows = []
+        for i in range(offset, min(count, offset + batch_size)):
+            rating_count = rng.choice([0, 0, 1, 3, 10, 40])
+            rating_sum = sum(rng.randint(1, 5) for _ in range(min(rating_count, 5))) * max(1, rating_count // 5)
+            rows.append({
+                'name': f'Startup {i}',
+                'description': '',
+                'category': rng.choice(CATEGORIES),
+                'created_at': started + timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+                'rating_sum': rating_sum,
+                'rating_count': rating_count,
+                'rating_avg': rating_sum / rating_count if rating_count else 0.0,
+                'follower_count': rng.randint(0, 500)
+            })
+        db.session.execute(table.insert(), rows)
+        db.session.commit()
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, round(statistics.median(samples), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--startups', type=int, default=200000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--depth', type=int, default=2000, help='Pages followed before the deep page')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='auxyn-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'directory.db')}"
+    os.environ.setdefault('MATCH_JOB_EXECUTOR', 'sync')
+
+    from app import create_app, db
+    from app.services.startup_directory import SORTS, startup_directory
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(db, random.Random(args.seed), args.startups)
+        report = {
+            'benchmark': 'startup_directory',
+            'startups': args.startups,
+            'page_size': args.page_size,
+            'depth_pages': args.depth,
+            'seed_seconds': round(time.perf_counter() - started, 1),
+            'pages': {}
+        }
+
+        for sort in SORTS:
+            for category in (None, 'ai'):
+                _, first_ms = timed(lambda: startup_directory.page(args.page_size, category=category, sort=sort),
+                                    args.repeat)
+                cursor = None
+                for _ in range(args.depth):
+                    _, cursor = startup_directory.page(args.page_size, cursor=cursor, category=category, sort=sort)
+                _, deep_ms = timed(lambda: startup_directory.page(args.page_size, cursor=cursor,
+                                                                   category=category, sort=sort), args.repeat)
+                offset = args.depth * args.page_size
+                _, offset_ms = timed(lambda: startup_directory.query(None, category, sort)
+                                     .offset(offset).limit(args.page_size + 1).all(), args.repeat)
+                report['pages'][f"{sort}/{category or 'all'}"] = {
+                    'first_page_ms': first_ms,
+                    'keyset_deep_page_ms': deep_ms,
+                    'offset_deep_page_ms': offset_ms
+                }
+                db.session.rollback()
+
+        app.config['STARTUP_COUNT_TTL'] = 0
+        _, cold_all = timed(lambda: startup_directory.total(), 1)
+        _, cold_category = timed(lambda: startup_directory.total('ai'), 1)
+        app.config['STARTUP_COUNT_TTL'] = 60
+        startup_directory.total()
+        _, cached = timed(lambda: startup_directory.total(), args.repeat)
+        report['totals'] = {'cold_all_ms': cold_all, 'cold_category_ms': cold_category, 'cached_ms': cached}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
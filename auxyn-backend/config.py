@@ -15,4 +15,56 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_TOKEN_LOCATION = ['headers']
     JWT_HEADER_NAME = 'Authorization'
-    JWT_HEADER_TYPE = 'Bearer'
\ No newline at end of file
+    JWT_HEADER_TYPE = 'Bearer'
+    
+    # Match generation jobs
+    MATCH_JOB_EXECUTOR = os.environ.get('MATCH_JOB_EXECUTOR', 'thread')  # thread, process or sync
+    MATCH_JOB_WORKERS = int(os.environ.get('MATCH_JOB_WORKERS', 2))
+    MATCH_JOB_STALE_SECONDS = int(os.environ.get('MATCH_JOB_STALE_SECONDS', 300))
+    MATCH_JOB_HEARTBEAT_SECONDS = float(os.environ.get('MATCH_JOB_HEARTBEAT_SECONDS', 30))  # Well under the stale limit
+    MATCH_JOB_RECOVERY_SECONDS = int(os.environ.get('MATCH_JOB_RECOVERY_SECONDS', 60))  # Stale check interval
+    MATCH_JOB_MAX_ATTEMPTS = int(os.environ.get('MATCH_JOB_MAX_ATTEMPTS', 3))
+    
+    # Pair score cache (entries; 0 disables)
+    SCORE_CACHE_SIZE = int(os.environ.get('SCORE_CACHE_SIZE', 50000))
+    
+    # In-memory candidate indexes used to prune match generation
+    CANDIDATE_INDEX_ENABLED = os.environ.get('CANDIDATE_INDEX_ENABLED', 'true').lower() == 'true'
+    
+    # Match views are buffered and written in batches; false writes each view synchronously
+    VIEW_BUFFER_ENABLED = os.environ.get('VIEW_BUFFER_ENABLED', 'true').lower() == 'true'
+    VIEW_BUFFER_FLUSH_SECONDS = float(os.environ.get('VIEW_BUFFER_FLUSH_SECONDS', 2))
+    VIEW_BUFFER_FLUSH_SIZE = int(os.environ.get('VIEW_BUFFER_FLUSH_SIZE', 500))
+    VIEW_BUFFER_MAX_PENDING = int(os.environ.get('VIEW_BUFFER_MAX_PENDING', 10000))
+    
+    # Response compression: JSON bodies below COMPRESS_MIN_SIZE bytes are sent as is
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    
+    # Profile search: auto (FTS5 when SQLite has it), fts5 or memory
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+    SEARCH_INDEX_CHECK_SECONDS = float(os.environ.get('SEARCH_INDEX_CHECK_SECONDS', 5))
+    
+    # Startup directory totals are recounted at most every STARTUP_COUNT_TTL seconds
+    STARTUP_COUNT_TTL = int(os.environ.get('STARTUP_COUNT_TTL', 60))
+    
+    # Bayesian rating: each startup's ratings plus this many phantom ratings of the prior mean
+    STARTUP_RATING_PRIOR_MEAN = float(os.environ.get('STARTUP_RATING_PRIOR_MEAN', 3.0))
+    STARTUP_RATING_PRIOR_WEIGHT = float(os.environ.get('STARTUP_RATING_PRIOR_WEIGHT', 5))
+    
+    # Review text in rating listings is cut to this many characters unless full_text=true
+    REVIEW_EXCERPT_LENGTH = int(os.environ.get('REVIEW_EXCERPT_LENGTH', 280))
+    
+    # Trending startups: follows and ratings weighted, then halved every TRENDING_HALF_LIFE_HOURS
+    TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 48))
+    TRENDING_FOLLOW_WEIGHT = float(os.environ.get('TRENDING_FOLLOW_WEIGHT', 1.0))
+    TRENDING_RATING_WEIGHT = float(os.environ.get('TRENDING_RATING_WEIGHT', 2.0))
+    
+    # Dashboard response cache: memory, none, or package.module:BackendClass
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    
+    # Scoring algorithm config (JSON, hot-reloaded; built-in 1.0 when unset)
+    SCORING_CONFIG_PATH = os.environ.get('SCORING_CONFIG_PATH')
+    SCORING_CONFIG_CHECK_SECONDS = float(os.environ.get('SCORING_CONFIG_CHECK_SECONDS', 2))
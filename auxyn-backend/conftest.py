@@ -0,0 +1,47 @@
+import os
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('MATCH_JOB_EXECUTOR', 'sync')
+os.environ.setdefault('VIEW_BUFFER_ENABLED', 'false')
+os.environ.setdefault('LOG_FILE', '')  # Request logs include bearer tokens; keep them off disk
+
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db as _db
+from app.models.user import User
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def auth_headers(user):
+    token = create_access_token(
+        identity=str(user.id),
+        additional_claims={'email': user.email, 'user_type': user.user_type}
+    )
+    return {'Authorization': f'Bearer {token}'}
+
+
+def make_user(email, user_type):
+    user = User(email=email, user_type=user_type)
+    _db.session.add(user)
+    _db.session.flush()
+    return user
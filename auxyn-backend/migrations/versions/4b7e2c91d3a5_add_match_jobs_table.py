@@ -0,0 +1,48 @@
+"""Add match jobs table
+
+Revision ID: 4b7e2c91d3a5
+Revises: c32513a76a07
+Create Date: 2026-10-18 09:12:41.302518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c91d3a5'
+down_revision = 'c32513a76a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('match_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('match_limit', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('candidates_scanned', sa.Integer(), nullable=True),
+    sa.Column('candidates_total', sa.Integer(), nullable=True),
+    sa.Column('elapsed_ms', sa.Float(), nullable=True),
+    sa.Column('match_ids', sa.Text(), nullable=True),
+    sa.Column('worker_id', sa.String(length=100), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('match_jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_match_jobs_status_heartbeat', ['status', 'heartbeat_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('match_jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_jobs_status_heartbeat')
+
+    op.drop_table('match_jobs')
@@ -0,0 +1,32 @@
+"""Add match list indexes
+
+Revision ID: 6e3a9c1b7f42
+Revises: 9d1f5a7c3e28
+Create Date: 2026-10-18 14:22:08.517306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e3a9c1b7f42'
+down_revision = '9d1f5a7c3e28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_investor_score', ['investor_id', 'compatibility_score', 'id'], unique=False)
+        batch_op.create_index('ix_matches_startup_score', ['startup_id', 'compatibility_score', 'id'], unique=False)
+        batch_op.create_index('ix_matches_investor_status_score', ['investor_id', 'status', 'compatibility_score', 'id'], unique=False)
+        batch_op.create_index('ix_matches_startup_status_score', ['startup_id', 'status', 'compatibility_score', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_startup_status_score')
+        batch_op.drop_index('ix_matches_investor_status_score')
+        batch_op.drop_index('ix_matches_startup_score')
+        batch_op.drop_index('ix_matches_investor_score')
@@ -0,0 +1,32 @@
+"""Add profile version columns
+
+Revision ID: 9d1f5a7c3e28
+Revises: 4b7e2c91d3a5
+Create Date: 2026-10-18 11:04:27.918263
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d1f5a7c3e28'
+down_revision = '4b7e2c91d3a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('startup_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('startup_profiles', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.drop_column('version')
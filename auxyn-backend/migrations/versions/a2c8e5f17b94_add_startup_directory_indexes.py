@@ -0,0 +1,53 @@
+"""Add startup rating average and directory indexes
+
+Revision ID: a2c8e5f17b94
+Revises: f1b6a4d2c8e3
+Create Date: 2026-10-18 20:41:55.902734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2c8e5f17b94'
+down_revision = 'f1b6a4d2c8e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_avg', sa.Float(), server_default='0', nullable=False))
+
+    op.execute("""
+        UPDATE startup SET rating_avg = CAST(rating_sum AS FLOAT) / rating_count
+        WHERE rating_count > 0
+    """)
+    # Directory cursors compare created_at values, so none may be missing, and on
+    # SQLite all must share the microsecond text format new rows are written in
+    op.execute("UPDATE startup SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("""
+            UPDATE startup SET created_at = strftime('%Y-%m-%d %H:%M:%f000', created_at)
+            WHERE length(created_at) = 19
+        """)
+
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.create_index('ix_startup_rating', ['rating_avg', 'id'], unique=False)
+        batch_op.create_index('ix_startup_followers', ['follower_count', 'id'], unique=False)
+        batch_op.create_index('ix_startup_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_startup_category_rating', ['category', 'rating_avg', 'id'], unique=False)
+        batch_op.create_index('ix_startup_category_followers', ['category', 'follower_count', 'id'], unique=False)
+        batch_op.create_index('ix_startup_category_created', ['category', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.drop_index('ix_startup_category_created')
+        batch_op.drop_index('ix_startup_category_followers')
+        batch_op.drop_index('ix_startup_category_rating')
+        batch_op.drop_index('ix_startup_created')
+        batch_op.drop_index('ix_startup_followers')
+        batch_op.drop_index('ix_startup_rating')
+        batch_op.drop_column('rating_avg')
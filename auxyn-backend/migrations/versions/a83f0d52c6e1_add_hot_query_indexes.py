@@ -0,0 +1,64 @@
+"""Add indexes for hot lookup queries
+
+Revision ID: a83f0d52c6e1
+Revises: 6e3a9c1b7f42
+Create Date: 2026-10-18 15:47:31.204718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a83f0d52c6e1'
+down_revision = '6e3a9c1b7f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_index('ix_matches_investor_created', ['investor_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_matches_startup_created', ['startup_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('match_insights', schema=None) as batch_op:
+        batch_op.create_index('ix_match_insights_match_id', ['match_id'], unique=False)
+
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.create_index('ix_investor_profiles_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('startup_profiles', schema=None) as batch_op:
+        batch_op.create_index('ix_startup_profiles_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('user_preferences', schema=None) as batch_op:
+        batch_op.create_index('ix_user_preferences_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('rating', schema=None) as batch_op:
+        batch_op.create_index('ix_rating_startup_user', ['startup_id', 'user_id'], unique=False)
+
+    with op.batch_alter_table('follow', schema=None) as batch_op:
+        batch_op.create_index('ix_follow_startup_id', ['startup_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('follow', schema=None) as batch_op:
+        batch_op.drop_index('ix_follow_startup_id')
+
+    with op.batch_alter_table('rating', schema=None) as batch_op:
+        batch_op.drop_index('ix_rating_startup_user')
+
+    with op.batch_alter_table('user_preferences', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_preferences_user_id')
+
+    with op.batch_alter_table('startup_profiles', schema=None) as batch_op:
+        batch_op.drop_index('ix_startup_profiles_user_id')
+
+    with op.batch_alter_table('investor_profiles', schema=None) as batch_op:
+        batch_op.drop_index('ix_investor_profiles_user_id')
+
+    with op.batch_alter_table('match_insights', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_insights_match_id')
+
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_startup_created')
+        batch_op.drop_index('ix_matches_investor_created')
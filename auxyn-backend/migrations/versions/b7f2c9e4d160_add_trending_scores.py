@@ -0,0 +1,63 @@
+"""Add trending startup scores
+
+Revision ID: b7f2c9e4d160
+Revises: e8d3b6f0a417
+Create Date: 2026-10-18 23:58:40.215873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime
+import math
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f2c9e4d160'
+down_revision = 'e8d3b6f0a417'
+branch_labels = None
+depends_on = None
+
+# Defaults of app.services.startup_trending; other settings are applied by
+# `flask startup rebuild-trending`
+EPOCH = datetime(2020, 1, 1)
+HALF_LIFE_HOURS = 48.0
+WEIGHTS = {'follow': 1.0, 'rating': 2.0}
+
+
+def upgrade():
+    trending_scores = op.create_table('trending_scores',
+    sa.Column('startup_id', sa.Integer(), nullable=False),
+    sa.Column('score_log', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['startup_id'], ['startup.id'], ),
+    sa.PrimaryKeyConstraint('startup_id')
+    )
+    with op.batch_alter_table('trending_scores', schema=None) as batch_op:
+        batch_op.create_index('ix_trending_scores_score', ['score_log', 'startup_id'], unique=False)
+
+    # score_log = log(sum of weight * e^(decay * seconds since EPOCH)) per startup
+    decay = math.log(2) / (HALF_LIFE_HOURS * 3600)
+    scores = {}
+    for table, weight in WEIGHTS.items():
+        events = sa.table(table, sa.column('startup_id', sa.Integer()), sa.column('created_at', sa.DateTime()))
+        rows = op.get_bind().execute(
+            sa.select(events.c.startup_id, events.c.created_at).where(events.c.created_at.isnot(None))
+        )
+        for startup_id, created_at in rows:
+            term = math.log(weight) + decay * (created_at - EPOCH).total_seconds()
+            score_log = scores.get(startup_id)
+            if score_log is None:
+                scores[startup_id] = term
+            else:
+                high, low = max(score_log, term), min(score_log, term)
+                scores[startup_id] = high + math.log1p(math.exp(low - high))
+    if scores:
+        op.bulk_insert(trending_scores, [
+            {'startup_id': startup_id, 'score_log': score_log} for startup_id, score_log in scores.items()
+        ])
+
+
+def downgrade():
+    with op.batch_alter_table('trending_scores', schema=None) as batch_op:
+        batch_op.drop_index('ix_trending_scores_score')
+
+    op.drop_table('trending_scores')
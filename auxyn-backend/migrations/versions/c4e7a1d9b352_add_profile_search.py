@@ -0,0 +1,58 @@
+"""Add profile full-text search table
+
+Revision ID: c4e7a1d9b352
+Revises: a2c8e5f17b94
+Create Date: 2026-10-18 22:06:31.447120
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e7a1d9b352'
+down_revision = 'a2c8e5f17b94'
+branch_labels = None
+depends_on = None
+
+
+def _fts5():
+    # Other databases, and SQLite builds without FTS5, search with the in-memory index
+    if op.get_bind().dialect.name != 'sqlite':
+        return False
+    try:
+        op.get_bind().exec_driver_sql('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        op.get_bind().exec_driver_sql('DROP TABLE temp.fts5_probe')
+        return True
+    except Exception:
+        return False
+
+
+def upgrade():
+    if not _fts5():
+        return
+    op.execute("""
+        CREATE VIRTUAL TABLE profile_search USING fts5(
+            kind UNINDEXED, user_id UNINDEXED, name, headline, body, keywords,
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )
+    """)
+    # Same documents `flask search rebuild` writes; rowid = profile id * 2 + kind tag
+    op.execute("""
+        INSERT INTO profile_search (rowid, kind, user_id, name, headline, body, keywords)
+        SELECT id * 2, 'startup', user_id, company_name, tagline, description, value_proposition
+        FROM startup_profiles
+    """)
+    op.execute("""
+        INSERT INTO profile_search (rowid, kind, user_id, name, headline, body, keywords)
+        SELECT id * 2 + 1, 'investor', user_id, name,
+               NULLIF(TRIM(COALESCE(title, '') || ' ' || COALESCE(company, '')), ''),
+               bio,
+               CASE WHEN json_valid(expertise_areas) THEN
+                   (SELECT group_concat(value, ', ') FROM json_each(expertise_areas))
+               END
+        FROM investor_profiles
+    """)
+
+
+def downgrade():
+    op.execute('DROP TABLE IF EXISTS profile_search')
@@ -0,0 +1,69 @@
+"""Add match counter rollup tables
+
+Revision ID: d5c27e8f41b9
+Revises: a83f0d52c6e1
+Create Date: 2026-10-18 17:05:52.661094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5c27e8f41b9'
+down_revision = 'a83f0d52c6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('match_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.Column('viewed', sa.Integer(), nullable=False),
+    sa.Column('interested', sa.Integer(), nullable=False),
+    sa.Column('not_interested', sa.Integer(), nullable=False),
+    sa.Column('mutual', sa.Integer(), nullable=False),
+    sa.Column('investor_interested', sa.Integer(), nullable=False),
+    sa.Column('high_quality', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('match_reason_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=200), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'reason')
+    )
+
+    # Backfill from existing matches (same figures as `flask match reconcile-counters`)
+    for participant, own_interest in (('investor_id', 'investor_interest'), ('startup_id', 'startup_interest')):
+        op.execute(f"""
+            INSERT INTO match_counters (user_id, total, pending, viewed, interested, not_interested,
+                                        mutual, investor_interested, high_quality, score_sum, updated_at)
+            SELECT {participant}, COUNT(id),
+                   SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN status = 'viewed' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN {own_interest} = 'interested' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN {own_interest} = 'not_interested' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN investor_interest = 'interested' AND startup_interest = 'interested' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN investor_interest = 'interested' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN compatibility_score >= 0.8 THEN 1 ELSE 0 END),
+                   COALESCE(SUM(compatibility_score), 0.0),
+                   CURRENT_TIMESTAMP
+            FROM matches GROUP BY {participant}
+        """)
+    op.execute("""
+        INSERT INTO match_reason_counters (user_id, reason, count)
+        SELECT investor_id, COALESCE(json_extract(match_reasons, '$[0]'), ''), COUNT(id)
+        FROM matches GROUP BY investor_id, COALESCE(json_extract(match_reasons, '$[0]'), '')
+    """)
+
+
+def downgrade():
+    op.drop_table('match_reason_counters')
+    op.drop_table('match_counters')
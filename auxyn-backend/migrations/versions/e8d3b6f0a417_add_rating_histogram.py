@@ -0,0 +1,65 @@
+"""Add startup rating histogram, Bayesian rating and review index
+
+Revision ID: e8d3b6f0a417
+Revises: c4e7a1d9b352
+Create Date: 2026-10-18 23:12:08.361592
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8d3b6f0a417'
+down_revision = 'c4e7a1d9b352'
+branch_labels = None
+depends_on = None
+
+# Default STARTUP_RATING_PRIOR_MEAN and STARTUP_RATING_PRIOR_WEIGHT; other
+# settings are applied by `flask startup reconcile-stats`
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5.0
+
+
+def upgrade():
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        for stars in range(1, 6):
+            batch_op.add_column(sa.Column(f'stars_{stars}', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_bayes', sa.Float(), server_default='3', nullable=False))
+
+    for stars in range(1, 6):
+        op.execute(f"""
+            UPDATE startup SET stars_{stars} = (
+                SELECT COUNT(*) FROM rating WHERE rating.startup_id = startup.id AND rating.rating = {stars}
+            )
+        """)
+    op.execute(f"""
+        UPDATE startup SET rating_bayes =
+            ({PRIOR_WEIGHT * PRIOR_MEAN} + rating_sum) / ({PRIOR_WEIGHT} + rating_count)
+    """)
+    # Review cursors compare created_at values, as the directory's do
+    op.execute("UPDATE rating SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("""
+            UPDATE rating SET created_at = strftime('%Y-%m-%d %H:%M:%f000', created_at)
+            WHERE length(created_at) = 19
+        """)
+
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.create_index('ix_startup_top', ['rating_bayes', 'id'], unique=False)
+        batch_op.create_index('ix_startup_category_top', ['category', 'rating_bayes', 'id'], unique=False)
+
+    with op.batch_alter_table('rating', schema=None) as batch_op:
+        batch_op.create_index('ix_rating_startup_created', ['startup_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('rating', schema=None) as batch_op:
+        batch_op.drop_index('ix_rating_startup_created')
+
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.drop_index('ix_startup_category_top')
+        batch_op.drop_index('ix_startup_top')
+        batch_op.drop_column('rating_bayes')
+        for stars in range(5, 0, -1):
+            batch_op.drop_column(f'stars_{stars}')
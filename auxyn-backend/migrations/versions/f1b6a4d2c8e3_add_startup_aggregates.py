@@ -0,0 +1,38 @@
+"""Add startup rating and follower aggregates
+
+Revision ID: f1b6a4d2c8e3
+Revises: d5c27e8f41b9
+Create Date: 2026-10-18 19:12:40.318206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b6a4d2c8e3'
+down_revision = 'd5c27e8f41b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('follower_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing rows (same figures as `flask startup reconcile-stats`)
+    op.execute("""
+        UPDATE startup SET
+            rating_sum = COALESCE((SELECT SUM(rating) FROM rating WHERE rating.startup_id = startup.id), 0),
+            rating_count = (SELECT COUNT(id) FROM rating WHERE rating.startup_id = startup.id),
+            follower_count = (SELECT COUNT(id) FROM follow WHERE follow.startup_id = startup.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('startup', schema=None) as batch_op:
+        batch_op.drop_column('follower_count')
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
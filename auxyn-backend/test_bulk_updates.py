@@ -0,0 +1,92 @@
+from conftest import auth_headers
+from app.models.match import Match
+from app.models.user import User
+from app.services.match_counters import match_counters
+from app.services.seed_data import seed_marketplace
+from test_matching_service import _count_queries
+
+
+def _state(match):
+    return (match.status, match.investor_interest, match.startup_interest,
+            match.investor_viewed_at is not None, match.startup_viewed_at is not None)
+
+
+def test_bulk_updates_match_single_calls(app, db, client):
+    seed_marketplace(60, seed=14, investor_share=0.4, matches_per_investor=8)
+    investors = User.query.filter_by(user_type='investor').order_by(User.id).limit(2).all()
+    single_ids = [m.id for m in Match.query.filter_by(investor_id=investors[0].id).order_by(Match.id)]
+    bulk_ids = [m.id for m in Match.query.filter_by(investor_id=investors[1].id).order_by(Match.id)]
+    actions = [('interested', False), ('not_interested', True), ('pending', False), (None, True)] * 2
+    # Both investors start from untouched matches
+    db.session.execute(db.update(Match).where(Match.id.in_(single_ids + bulk_ids)).values(
+        status='pending', investor_interest=None, startup_interest=None, investor_viewed_at=None,
+        startup_viewed_at=None
+    ))
+    db.session.commit()
+    match_counters.reconcile(fix=True)
+    db.session.commit()
+
+    # Same actions through the single-match endpoints and through one bulk request
+    for match_id, (interest, view) in zip(single_ids, actions):
+        headers = auth_headers(investors[0])
+        if view:
+            assert client.post(f'/api/matches/{match_id}/view', headers=headers).status_code == 200
+        if interest:
+            response = client.put(f'/api/matches/{match_id}/interest', json={'interest': interest}, headers=headers)
+            assert response.status_code == 200
+
+    items = [
+        {'match_id': match_id, **({'interest': interest} if interest else {}), **({'view': True} if view else {})}
+        for match_id, (interest, view) in zip(bulk_ids, actions)
+    ]
+    headers = auth_headers(investors[1])
+    response, count = _count_queries(db, lambda: client.post('/api/matches/bulk', json={'items': items}, headers=headers))
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['updated'] == 8 and body['failed'] == 0
+    assert [result['match_id'] for result in body['results']] == bulk_ids
+    # One load for authorization, the counter rollup, then one UPDATE per match and a single commit
+    assert count <= 3 + len(items)
+
+    db.session.expire_all()
+    singles = [_state(db.session.get(Match, match_id)) for match_id in single_ids]
+    bulk = [_state(db.session.get(Match, match_id)) for match_id in bulk_ids]
+    assert bulk == singles
+    assert body['results'][0]['match']['investor_interest'] == 'interested'
+    assert match_counters.reconcile(fix=False)['drift'] == []
+
+
+def test_bulk_update_reports_per_item_errors(app, db, client):
+    seed_marketplace(40, seed=15, investor_share=0.5, matches_per_investor=3)
+    investor, other = User.query.filter_by(user_type='investor').order_by(User.id).limit(2).all()
+    own = Match.query.filter_by(investor_id=investor.id).first()
+    foreign = Match.query.filter_by(investor_id=other.id).first()
+    foreign_interest = foreign.investor_interest
+    headers = auth_headers(investor)
+
+    body = client.post('/api/matches/bulk', json={'items': [
+        {'match_id': own.id, 'interest': 'interested'},
+        {'match_id': foreign.id, 'interest': 'interested'},
+        {'match_id': 999999, 'view': True},
+        {'match_id': own.id, 'interest': 'maybe'},
+        {'match_id': own.id},
+        {'interest': 'interested'},
+        {'match_id': own.id, 'interest': 'not_interested'}
+    ]}, headers=headers).get_json()
+
+    assert [result['ok'] for result in body['results']] == [True, False, False, False, False, False, True]
+    assert [result.get('error') for result in body['results'][1:6]] == [
+        'User not authorized for this match',
+        'Match not found',
+        'Invalid interest value',
+        'Nothing to update: pass interest and/or view',
+        'Missing or invalid match_id'
+    ]
+    db.session.expire_all()
+    assert db.session.get(Match, own.id).investor_interest == 'not_interested'
+    assert db.session.get(Match, foreign.id).investor_interest == foreign_interest
+
+    assert client.post('/api/matches/bulk', json={'items': []}, headers=headers).status_code == 400
+    assert client.post('/api/matches/bulk', json={'items': [1]}, headers=headers).status_code == 400
+    too_many = [{'match_id': own.id, 'view': True}] * 501
+    assert client.post('/api/matches/bulk', json={'items': too_many}, headers=headers).status_code == 400
@@ -0,0 +1,100 @@
+import json
+import random
+
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.models.user import User
+from app.services.batch_scoring import InvestorColumns, StartupColumns
+from app.services.candidate_index import candidate_indexes
+from app.services.matching_service import MatchingService
+from app.services.scoring_registry import scoring_registry
+
+
+def _skewed_marketplace(db, rng, startup_count=300, investor_count=60):
+    """Most startups sit in industries and stages far from the investors'"""
+    investors = []
+    for i in range(investor_count):
+        user = User(email=f'investor{i}@example.com', user_type='investor')
+        db.session.add(user)
+        db.session.flush()
+        investor = InvestorProfile(
+            user_id=user.id, name=f'Investor {i}', min_investment=100000, max_investment=2000000,
+            preferred_industries=json.dumps(rng.sample(['fintech', 'ai', 'healthcare'], 1)),
+            investment_stage=json.dumps(['pre_seed']),
+            geographic_preference=json.dumps(rng.sample(['California', 'London'], 1))
+        )
+        db.session.add(investor)
+        investors.append(investor)
+
+    startups = []
+    for i in range(startup_count):
+        user = User(email=f'startup{i}@example.com', user_type='startup')
+        db.session.add(user)
+        db.session.flush()
+        niche = rng.random() < 0.1
+        startup = StartupProfile(
+            user_id=user.id, company_name=f'Startup {i}',
+            industry=rng.choice(['fintech', 'ai', 'healthcare'] if niche else ['retail', 'energy', 'logistics']),
+            funding_needed=rng.choice([150000, 800000, 5000000]),
+            funding_stage='pre_seed' if niche else rng.choice(['series_b', 'series_c']),
+            headquarters=rng.choice(['California', 'Texas', 'London', 'Berlin']),
+            market_size=rng.choice(['small', 'large', 'very_large'])
+        )
+        db.session.add(startup)
+        startups.append(startup)
+    db.session.commit()
+    return investors, startups
+
+
+def _top_k(profile, pruned):
+    candidate_indexes.enabled = pruned
+    if isinstance(profile, InvestorProfile):
+        model, columns_class = StartupProfile, StartupColumns
+    else:
+        model, columns_class = InvestorProfile, InvestorColumns
+
+    report = {}
+    tiers = candidate_indexes.candidate_tiers(profile, scoring_registry.active())
+    top = MatchingService._select_top_candidates(
+        profile, model, model.query, columns_class, 5, report, tiers=tiers
+    )
+    return [(candidate.id, match_score) for candidate, match_score in top], report
+
+
+def test_pruned_generation_matches_full_scan(app, db):
+    investors, startups = _skewed_marketplace(db, random.Random(2))
+
+    skipped = 0
+    for profile in investors[:10] + startups[:20]:
+        full, full_report = _top_k(profile, pruned=False)
+        pruned, report = _top_k(profile, pruned=True)
+        assert pruned == full
+        assert report['candidates_scanned'] + report['candidates_skipped'] == full_report['candidates_scanned']
+        skipped += report['candidates_skipped']
+    assert skipped > 0
+
+
+def test_index_follows_profile_writes(app, db):
+    investors, startups = _skewed_marketplace(db, random.Random(4), startup_count=40, investor_count=5)
+    investor = investors[0]
+    _top_k(investor, pruned=True)
+    index = candidate_indexes.startups
+    signature = index.signature
+
+    # An unrelated startup moves into the investor's niche
+    target = next(s for s in startups if s.industry == 'retail')
+    target.industry = investor.preferred_industries_list[0]
+    target.funding_stage = 'pre_seed'
+    db.session.commit()
+
+    assert target.id in index.postings['industry'][target.industry]
+    assert index.signature != signature
+    assert index.signature == index._current_signature()  # No rebuild needed
+
+    full, _ = _top_k(investor, pruned=False)
+    pruned, _ = _top_k(investor, pruned=True)
+    assert pruned == full
+
+    db.session.delete(target)
+    db.session.commit()
+    assert target.id not in index.all_ids()
@@ -0,0 +1,78 @@
+import random
+
+from conftest import auth_headers
+from app.models.user import User
+from app.services.matching_service import MatchingService
+from test_matching_service import _count_queries, _seed_marketplace
+
+
+def _revalidate(db, client, url, headers, response):
+    return _count_queries(db, lambda: client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']}))
+
+
+def test_profile_etags_follow_row_versions(app, db, client):
+    investor_user, investor, _ = _seed_marketplace(db, random.Random(5), 5)
+    headers = auth_headers(investor_user)
+
+    first = client.get('/api/users/investor', headers=headers)
+    assert first.status_code == 200
+    assert first.headers['ETag'].startswith('"') and first.headers['Last-Modified']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    # Revalidation reads the version columns only and sends no body
+    response, count = _revalidate(db, client, '/api/users/investor', headers, first)
+    assert response.status_code == 304 and response.data == b''
+    assert count == 1
+    assert response.headers['ETag'] == first.headers['ETag']
+
+    not_modified = client.get('/api/users/investor', headers={
+        **headers, 'If-Modified-Since': first.headers['Last-Modified']
+    })
+    assert not_modified.status_code == 304
+
+    assert client.put('/api/users/investor', json={'bio': 'Updated'}, headers=headers).status_code == 200
+    response, _ = _revalidate(db, client, '/api/users/investor', headers, first)
+    assert response.status_code == 200
+    assert response.get_json()['bio'] == 'Updated'
+    assert response.headers['ETag'] != first.headers['ETag']
+
+
+def test_match_and_insight_etags(app, db, client):
+    investor_user, investor, startups = _seed_marketplace(db, random.Random(6), 20)
+    match = MatchingService.generate_matches_for_user(investor_user.id, limit=3)[0]
+    startup_user = db.session.get(User, match.startup_id)
+    headers = auth_headers(investor_user)
+    match_url, insights_url = f'/api/matches/{match.id}/details', f'/api/matches/{match.id}/insights'
+
+    details = client.get(match_url, headers=headers)
+    assert details.status_code == 200
+    assert details.get_json()['partner_profile']['user_id'] == startup_user.id
+    insights = client.get(insights_url, headers=headers)
+    assert insights.status_code == 200
+
+    for url, response in ((match_url, details), (insights_url, insights)):
+        revalidated, count = _revalidate(db, client, url, headers, response)
+        assert revalidated.status_code == 304 and count == 1
+
+    # The partner's profile is part of the match details
+    partner = next(startup for startup in startups if startup.user_id == startup_user.id)
+    partner.company_name = 'Renamed'
+    db.session.commit()
+    assert _revalidate(db, client, match_url, headers, details)[0].status_code == 200
+    assert _revalidate(db, client, insights_url, headers, insights)[0].status_code == 304
+
+    # Interest changes and rescoring (bulk insight update) change the validators
+    details = client.get(match_url, headers=headers)
+    match.set_investor_interest('interested')
+    assert _revalidate(db, client, match_url, headers, details)[0].status_code == 200
+    investor.preferred_industries = '["energy"]'
+    MatchingService.rescore_matches_for_profile(investor)
+    assert _revalidate(db, client, insights_url, headers, insights)[0].status_code == 200
+
+    # The startup side sees the match; other users do not
+    assert client.get(match_url, headers=auth_headers(startup_user)).status_code == 200
+    other = next(startup for startup in startups if startup.user_id != startup_user.id)
+    other_headers = auth_headers(db.session.get(User, other.user_id))
+    assert client.get(match_url, headers=other_headers).status_code == 403
+    assert client.get(insights_url, headers=other_headers).status_code == 403
+    assert client.get('/api/matches/999999/details', headers=headers).status_code == 404
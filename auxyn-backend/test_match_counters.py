@@ -0,0 +1,98 @@
+import random
+
+from sqlalchemy import event
+
+from conftest import auth_headers, make_user
+from app.models.match import Match
+from app.models.match_counter import MatchCounter
+from app.models.user import User
+from app.services.match_counters import match_counters
+from app.services.matching_service import MatchingService
+from app.services.seed_data import seed_marketplace
+from test_matching_service import _seed_marketplace
+
+
+def _assert_in_sync():
+    report = match_counters.reconcile(fix=False)
+    assert report['drift'] == []
+
+
+def test_counters_follow_match_transitions(app, db, client):
+    seed_marketplace(60, seed=9, investor_share=0.4, matches_per_investor=6)
+    _assert_in_sync()
+
+    investor_user, investor, _ = _seed_marketplace(db, random.Random(2), 40)
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=8)
+    assert MatchingService.match_statistics(investor_user.id)['total'] == len(matches)
+    _assert_in_sync()
+
+    matches[0].set_investor_interest('interested')
+    matches[0].set_startup_interest('interested')
+    matches[1].set_investor_interest('not_interested')
+    matches[2].mark_viewed_by_startup()
+    _assert_in_sync()
+    stats = client.get('/api/matches/stats', headers=auth_headers(investor_user)).get_json()
+    assert stats['mutual_matches'] == 1
+    assert stats['interested_matches'] == 1
+
+    # Rescoring changes scores and leading reasons
+    investor.preferred_industries = '["retail"]'
+    MatchingService.rescore_matches_for_profile(investor)
+    _assert_in_sync()
+
+    db.session.delete(matches[3].insights)
+    db.session.delete(matches[3])
+    db.session.commit()
+    _assert_in_sync()
+
+    # Counter updates roll back with the failed transaction
+    matches[4].set_investor_interest(None)
+    before = MatchingService.match_statistics(investor_user.id)
+    matches[4].investor_interest = 'interested'
+    db.session.flush()
+    assert MatchingService.match_statistics(investor_user.id)['interested'] == before['interested'] + 1
+    db.session.rollback()
+    assert MatchingService.match_statistics(investor_user.id) == before
+
+
+def test_reconcile_reports_and_repairs_drift(app, db):
+    seed_marketplace(40, seed=10, investor_share=0.5, matches_per_investor=4)
+    investor = User.query.filter_by(user_type='investor').first()
+    db.session.execute(db.update(MatchCounter).where(MatchCounter.user_id == investor.id).values(total=999))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['match', 'reconcile-counters', '--dry-run'])
+    assert f'user {investor.id} total: stored 999, expected 4' in result.output
+    assert '1 had drifted' in result.output
+
+    result = app.test_cli_runner().invoke(args=['match', 'reconcile-counters'])
+    assert 'rebuilt' in result.output
+    _assert_in_sync()
+    assert MatchingService.match_statistics(investor.id)['total'] == Match.query.filter_by(
+        investor_id=investor.id).count()
+
+
+def test_first_counter_rows_tolerate_a_concurrent_creator(app, db):
+    investor_user = make_user('first-investor@example.com', 'investor')
+    startup_user = make_user('first-startup@example.com', 'startup')
+    assert MatchCounter.query.count() == 0
+
+    # Another transaction creates the investor's counter row just before ours does
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO match_counters') and not race.done:
+            race.done = True
+            cursor.execute('INSERT INTO match_counters (user_id, total, pending, viewed, interested, '
+                           'not_interested, mutual, investor_interested, high_quality, score_sum) '
+                           'VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0, 0)', (investor_user.id,))
+    race.done = False
+    event.listen(db.engine, 'before_cursor_execute', race)
+    try:
+        db.session.add(Match(investor_id=investor_user.id, startup_id=startup_user.id,
+                             compatibility_score=0.9, status='pending'))
+        db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', race)
+
+    assert race.done
+    assert match_counters.read(investor_user.id)['total'] == 1
+    assert match_counters.read(startup_user.id)['total'] == 1
@@ -0,0 +1,164 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+from conftest import auth_headers, make_user
+from app.models.investor_profile import InvestorProfile
+from app.models.match import Match
+from app.models.match_job import MatchJob
+from app.models.startup_profile import StartupProfile
+from app.services.job_service import match_jobs, run_match_job
+from app.services.matching_service import MatchingService
+
+
+def _seed(db, startup_count=12):
+    investor = make_user('investor@example.com', 'investor')
+    db.session.add(InvestorProfile(
+        user_id=investor.id,
+        name='Investor',
+        min_investment=50000,
+        max_investment=1000000,
+        preferred_industries=json.dumps(['fintech'])
+    ))
+    for i in range(startup_count):
+        startup = make_user(f'startup{i}@example.com', 'startup')
+        db.session.add(StartupProfile(
+            user_id=startup.id,
+            company_name=f'Startup {i}',
+            industry='fintech' if i % 2 else 'retail',
+            funding_needed=250000,
+            headquarters='Texas'
+        ))
+    db.session.commit()
+    return investor
+
+
+def test_generate_enqueues_job_and_reports_status(client, db):
+    investor = _seed(db)
+    headers = auth_headers(investor)
+
+    response = client.post('/api/matches/generate', json={'limit': 5}, headers=headers)
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+
+    status = client.get(f'/api/matches/jobs/{job_id}', headers=headers).get_json()
+    assert status['status'] == 'completed'
+    assert status['progress'] == 1.0
+    assert status['candidates_scanned'] == 12
+    assert sorted(status['match_ids']) == sorted(m.id for m in Match.query.all())
+    assert len(status['match_ids']) == 5
+
+
+def test_job_status_is_private(client, db):
+    investor = _seed(db)
+    other = make_user('other@example.com', 'investor')
+    db.session.commit()
+
+    job_id = client.post(
+        '/api/matches/generate', json={}, headers=auth_headers(investor)
+    ).get_json()['job_id']
+
+    response = client.get(f'/api/matches/jobs/{job_id}', headers=auth_headers(other))
+    assert response.status_code == 403
+
+
+def test_stale_running_job_is_recovered(app, db):
+    investor = _seed(db)
+    job = MatchJob(
+        user_id=investor.id,
+        match_limit=3,
+        status='running',
+        attempts=1,
+        heartbeat_at=datetime.utcnow() - timedelta(hours=1)
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    match_jobs.recover(force=True)
+
+    db.session.refresh(job)
+    assert job.status == 'completed'
+    assert job.attempts == 2
+    assert len(job.match_ids_list) == 3
+
+
+def test_stale_jobs_are_recovered_after_startup(app, db, client):
+    investor = _seed(db)
+    headers = auth_headers(investor)
+    app.config['MATCH_JOB_RECOVERY_SECONDS'] = 3600
+    match_jobs.recover()  # The process's first check
+
+    # A worker dies after startup, leaving its job running with a stale heartbeat
+    job = MatchJob(user_id=investor.id, match_limit=2, status='running', attempts=1,
+                   heartbeat_at=datetime.utcnow() - timedelta(hours=1))
+    db.session.add(job)
+    db.session.commit()
+
+    # Within the recovery interval polls do not rescan
+    assert client.get(f'/api/matches/jobs/{job.id}', headers=headers).get_json()['status'] == 'running'
+    app.config['MATCH_JOB_RECOVERY_SECONDS'] = 0
+    status = client.get(f'/api/matches/jobs/{job.id}', headers=headers).get_json()
+    assert status['status'] == 'completed' and len(status['match_ids']) == 2
+
+
+def test_generate_rejects_invalid_limits(client, db):
+    headers = auth_headers(_seed(db))
+    for limit in (0, -3, 101, 'ten', 2.5, True, None):
+        response = client.post('/api/matches/generate', json={'limit': limit}, headers=headers)
+        assert response.status_code == 400, limit
+    assert MatchJob.query.count() == 0
+
+
+def test_job_requeued_while_running_completes_once(app, db, monkeypatch):
+    investor = _seed(db)
+    job = MatchJob(user_id=investor.id, match_limit=3, status='queued')
+    db.session.add(job)
+    db.session.commit()
+
+    # Recovery judges the first run stale mid-scan and queues the job for another worker
+    resubmitted = []
+    monkeypatch.setattr(match_jobs, '_submit', resubmitted.append)
+    generate = MatchingService.generate_matches_for_user
+
+    def stalled(*args, **kwargs):
+        db.session.execute(db.update(MatchJob).where(MatchJob.id == job.id).values(
+            heartbeat_at=datetime.utcnow() - timedelta(hours=1)))
+        db.session.commit()
+        match_jobs.recover(force=True)
+        return generate(*args, **kwargs)
+
+    monkeypatch.setattr(MatchingService, 'generate_matches_for_user', stalled)
+    assert run_match_job(job.id) is None
+    assert resubmitted == [job.id]
+    assert Match.query.count() == 0
+
+    # The second worker's run is the one that lands
+    monkeypatch.setattr(MatchingService, 'generate_matches_for_user', generate)
+    match_ids = run_match_job(job.id)
+    db.session.refresh(job)
+    assert (job.status, job.attempts) == ('completed', 2)
+    assert sorted(job.match_ids_list) == sorted(match_ids) == sorted(m.id for m in Match.query.all())
+    assert len(match_ids) == 3
+
+
+def test_heartbeat_is_written_while_a_step_runs_without_progress(app, db, monkeypatch):
+    investor = _seed(db)
+    job = MatchJob(user_id=investor.id, match_limit=3, status='queued')
+    db.session.add(job)
+    db.session.commit()
+    app.config['MATCH_JOB_HEARTBEAT_SECONDS'] = 0.01
+
+    heartbeats = []
+
+    def slow(*args, **kwargs):
+        started = db.session.execute(db.select(MatchJob.heartbeat_at).where(MatchJob.id == job.id)).scalar_one()
+        time.sleep(0.2)
+        db.session.expire_all()
+        heartbeats.append((started, db.session.execute(
+            db.select(MatchJob.heartbeat_at).where(MatchJob.id == job.id)).scalar_one()))
+        return []
+
+    monkeypatch.setattr(MatchingService, 'generate_matches_for_user', slow)
+    assert run_match_job(job.id) == []
+    (started, later), = heartbeats
+    assert later > started
@@ -0,0 +1,391 @@
+import json
+import random
+
+import pytest
+from sqlalchemy import event
+
+from conftest import auth_headers, make_user
+
+from app.models.investor_profile import InvestorProfile
+from app.models.match import Match
+from app.models.match_insight import MatchInsight
+from app.models.user import User
+from app.models.startup_profile import StartupProfile
+from app.services.batch_matching import PlatformMatchRun
+from app.services.batch_scoring import InvestorColumns, StartupColumns, score_row
+from app.services.matching_service import MatchingService
+from app.services.seed_data import seed_marketplace
+
+INDUSTRIES = ['technology', 'Software', 'ai', 'fintech', 'healthcare', 'Biotech', 'retail', 'energy', '', None]
+STAGES = ['pre_seed', 'seed', 'series_a', 'series_b', 'series_c', 'bridge', '', None]
+LOCATIONS = ['California', 'new york', 'Texas', 'London', 'Berlin', 'florida', '', None]
+MARKET_SIZES = ['small', 'medium', 'large', 'very_large', 'huge', '', None]
+FUNDING = [None, 0, 10000, 50000, 250000, 500000, 1000000, 1500000, 5000000]
+
+
+def _sample_list(rng, values):
+    return rng.sample([v for v in values if v], rng.randint(0, 3))
+
+
+def _investor(rng, user_id):
+    return InvestorProfile(
+        id=user_id,
+        user_id=user_id,
+        name=f'Investor {user_id}',
+        min_investment=rng.choice([None, 0, 25000, 100000, 500000]),
+        max_investment=rng.choice([None, 0, 200000, 1000000, 3000000]),
+        preferred_industries=json.dumps(_sample_list(rng, INDUSTRIES)) or None,
+        investment_stage=json.dumps(_sample_list(rng, STAGES)),
+        geographic_preference=json.dumps(_sample_list(rng, LOCATIONS))
+    )
+
+
+def _startup(rng, user_id):
+    return StartupProfile(
+        id=user_id,
+        user_id=user_id,
+        company_name=f'Startup {user_id}',
+        industry=rng.choice(INDUSTRIES),
+        funding_needed=rng.choice(FUNDING),
+        funding_stage=rng.choice(STAGES),
+        headquarters=rng.choice(LOCATIONS),
+        market_size=rng.choice(MARKET_SIZES)
+    )
+
+
+def test_batch_scores_match_per_pair_helpers(app):
+    rng = random.Random(7)
+    investors = [_investor(rng, i) for i in range(60)]
+    startups = [_startup(rng, 1000 + i) for i in range(120)]
+
+    startup_columns = StartupColumns(startups)
+    for investor in investors:
+        scores = startup_columns.score(investor)
+        for idx, startup in enumerate(startups):
+            expected = MatchingService._calculate_compatibility_score(investor, startup)
+            assert score_row(scores, idx) == expected
+
+    investor_columns = InvestorColumns(investors)
+    for startup in startups:
+        scores = investor_columns.score(startup)
+        for idx, investor in enumerate(investors):
+            expected = MatchingService._calculate_compatibility_score(investor, startup)
+            assert score_row(scores, idx) == expected
+
+
+def test_empty_candidate_set(app):
+    rng = random.Random(1)
+    scores = StartupColumns([]).score(_investor(rng, 1))
+    assert all(len(values) == 0 for values in scores.values())
+    scores = InvestorColumns([]).score(_startup(rng, 2))
+    assert all(len(values) == 0 for values in scores.values())
+
+
+def _seed_marketplace(db, rng, startup_count):
+    investor_user = User(email='investor@example.com', user_type='investor')
+    db.session.add(investor_user)
+    db.session.flush()
+    investor = _investor(rng, investor_user.id)
+    db.session.add(investor)
+
+    startups = []
+    for i in range(startup_count):
+        user = User(email=f'startup{i}@example.com', user_type='startup')
+        db.session.add(user)
+        db.session.flush()
+        startup = _startup(rng, user.id)
+        db.session.add(startup)
+        startups.append(startup)
+    db.session.commit()
+    return investor_user, investor, startups
+
+
+def test_generation_returns_true_top_k(app, db, monkeypatch):
+    rng = random.Random(11)
+    investor_user, investor, startups = _seed_marketplace(db, rng, 250)
+
+    expected = sorted(
+        (
+            (MatchingService._calculate_compatibility_score(investor, s)['overall_score'], -s.id, s.user_id)
+            for s in startups
+        ),
+        reverse=True
+    )
+    expected = [user_id for score, _, user_id in expected if score > 0.3][:15]
+
+    monkeypatch.setattr(MatchingService, 'CANDIDATE_CHUNK_SIZE', 40)
+    report = {}
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=15, report=report)
+
+    assert [m.startup_id for m in matches] == expected
+    assert report['candidates_scanned'] + report['candidates_skipped'] == 250
+
+
+def test_generated_matches_persist_with_insights_in_one_commit(app, db, monkeypatch):
+    rng = random.Random(5)
+    investor_user, investor, _ = _seed_marketplace(db, rng, 40)
+
+    commits = []
+    monkeypatch.setattr(db.session, 'commit', lambda real=db.session.commit: commits.append(1) or real())
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=10)
+
+    assert len(commits) == 1
+    assert Match.query.count() == len(matches) > 0
+    assert {i.match_id for i in MatchInsight.query.all()} == {m.id for m in matches}
+
+
+def test_generation_handles_missing_funding_amounts(app, db):
+    investor_user = make_user('open@fund.com', 'investor')
+    db.session.add(InvestorProfile(user_id=investor_user.id, name='Open Fund',
+                                   preferred_industries=json.dumps(['fintech'])))
+    for i, funding_needed in enumerate((None, 250000)):
+        user = make_user(f'fintech{i}@example.com', 'startup')
+        db.session.add(StartupProfile(user_id=user.id, company_name=f'Fintech {i}', industry='fintech',
+                                      funding_needed=funding_needed))
+    db.session.commit()
+    # Inserts would apply the column defaults; clear the range afterwards
+    db.session.execute(db.update(InvestorProfile).values(min_investment=None, max_investment=None))
+    db.session.commit()
+
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=5)
+
+    assert len(matches) == 2
+    analyses = sorted(insight.funding_analysis for insight in MatchInsight.query.all())
+    assert analyses == [
+        "The startup has not stated its funding need; the investor invests in the $0+ range.",
+        "The startup seeks $250,000 which fits within the investor's $0+ range."
+    ]
+
+
+def test_failed_generation_writes_nothing(app, db, monkeypatch):
+    rng = random.Random(5)
+    investor_user, investor, _ = _seed_marketplace(db, rng, 40)
+
+    def fail(*args):
+        raise RuntimeError('insight failure')
+
+    monkeypatch.setattr(MatchingService, '_build_match_insight', staticmethod(fail))
+    with pytest.raises(RuntimeError):
+        MatchingService.generate_matches_for_user(investor_user.id, limit=10)
+
+    assert Match.query.count() == 0
+    assert MatchInsight.query.count() == 0
+
+
+def test_platform_run_matches_single_user_generation(app, db):
+    rng = random.Random(3)
+    investor_user, investor, startups = _seed_marketplace(db, rng, 60)
+
+    expected = sorted(
+        (
+            (MatchingService._calculate_compatibility_score(investor, s)['overall_score'], -s.id, s.user_id)
+            for s in startups
+        ),
+        reverse=True
+    )
+    expected = [user_id for score, _, user_id in expected if score > 0.3][:5]
+
+    investors, startups_run = PlatformMatchRun(limit=5, workers=1, echo=lambda message: None).run()
+
+    investor_matches = Match.query.filter_by(investor_id=investor_user.id).order_by(Match.id).all()
+    assert [m.startup_id for m in investor_matches[:len(expected)]] == expected
+    assert investors['matches_written'] == len(expected)
+    # Startups matched by the investor pass still get their own pass
+    assert startups_run['sources'] == 60
+    assert MatchInsight.query.count() == Match.query.count()
+
+    # Everyone matched within their daily window is skipped until forced
+    rerun = PlatformMatchRun(limit=5, workers=1, echo=lambda message: None).run()
+    assert sum(summary['matches_written'] for summary in rerun) == 0
+
+
+def test_platform_run_matches_new_startups_in_both_directions(app, db):
+    def investor(email):
+        user = make_user(email, 'investor')
+        db.session.add(InvestorProfile(
+            user_id=user.id, name=email, min_investment=0, max_investment=1000000,
+            preferred_industries=json.dumps(['fintech']), investment_stage=json.dumps(['seed']),
+            geographic_preference=json.dumps(['California'])
+        ))
+        return user
+
+    def startup(email):
+        user = make_user(email, 'startup')
+        db.session.add(StartupProfile(
+            user_id=user.id, company_name=email, industry='fintech', funding_needed=500000,
+            funding_stage='seed', headquarters='California', market_size='large'
+        ))
+        return user
+
+    new_investor, recent_investor = investor('new@fund.com'), investor('recent@fund.com')
+    new_startup, recent_startup = startup('new@startup.com'), startup('recent@startup.com')
+    # The recent pair was matched today, so neither side is due
+    db.session.add(Match(investor_id=recent_investor.id, startup_id=recent_startup.id,
+                         compatibility_score=0.9, status='pending'))
+    db.session.commit()
+
+    investors, startups = PlatformMatchRun(limit=5, workers=1, echo=lambda message: None).run()
+
+    def partners(user):
+        return {m.investor_id for m in Match.query.filter_by(startup_id=user.id)}
+
+    # The investor pass matches the new startup; its own pass then finds the other investor
+    assert (investors['sources'], investors['matches_written']) == (1, 2)
+    assert (startups['sources'], startups['matches_written']) == (1, 1)
+    assert partners(new_startup) == {new_investor.id, recent_investor.id}
+    assert partners(recent_startup) == {new_investor.id, recent_investor.id}
+    assert Match.query.count() == 4
+
+
+def test_profile_update_rescores_existing_matches(app, db, client):
+    rng = random.Random(5)
+    investor_user, investor, startups = _seed_marketplace(db, rng, 40)
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=10)
+    headers = auth_headers(investor_user)
+
+    response = client.put('/api/users/investor', json={'bio': 'Seed investor'}, headers=headers)
+    assert response.get_json()['rescored_matches'] == 0
+
+    response = client.put('/api/users/investor', json={
+        'preferred_industries': ['retail'], 'geographic_preference': ['Berlin']
+    }, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['rescored_matches'] == len(matches)
+
+    startups_by_user = {s.user_id: s for s in startups}
+    for match in Match.query.all():
+        expected = MatchingService._calculate_compatibility_score(investor, startups_by_user[match.startup_id])
+        assert match.compatibility_score == expected['overall_score']
+        assert match.industry_match_score == expected['industry_score']
+        assert match.algorithm_version == '1.0'
+        insight = MatchInsight.query.filter_by(match_id=match.id).one()
+        assert insight.industry_score == expected['industry_score']
+        assert insight.algorithm_confidence == expected['overall_score']
+
+
+def _count_queries(db, func):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return result, len(statements)
+
+
+def test_match_list_query_count_is_independent_of_page_size(app, db, client):
+    seed_marketplace(60, seed=3, investor_share=0.5, matches_per_investor=12)
+
+    investor = User.query.filter_by(user_type='investor').first()
+    startup = max(User.query.filter_by(user_type='startup'), key=lambda u: len(u.startup_matches))
+    assert len(startup.startup_matches) > 2
+
+    users = [(user.id, auth_headers(user), len(user.investor_matches or user.startup_matches))
+             for user in (investor, startup)]
+
+    for user_id, headers, total in users:
+        counts = set()
+        for limit in (1, 2, 12):
+            db.session.expunge_all()
+            response, count = _count_queries(
+                db, lambda: client.get(f'/api/matches/{user_id}?limit={limit}', headers=headers)
+            )
+            data = response.get_json()
+            assert response.status_code == 200
+            assert data['count'] == min(limit, total)
+            assert all('partner_profile' in match for match in data['matches'])
+            counts.add(count)
+        assert counts == {2}
+
+    card = data['matches'][0]['partner_profile']
+    assert set(card) == set(MatchingService.INVESTOR_CARD_FIELDS)
+    assert isinstance(card['preferred_industries'], list)
+
+
+def test_match_list_cursor_pages_cover_every_match_once(app, db, client):
+    seed_marketplace(120, seed=4, investor_share=0.5, matches_per_investor=30)
+    investor = User.query.filter_by(user_type='investor').first()
+    headers = auth_headers(investor)
+    # Ties on score must page by id
+    for match in Match.query.filter_by(investor_id=investor.id).limit(10):
+        match.compatibility_score = 0.5
+    db.session.commit()
+    expected = [m.id for m in Match.query.filter_by(investor_id=investor.id).order_by(
+        Match.compatibility_score.desc(), Match.id.desc())]
+
+    def page_through(query):
+        seen, cursor = [], None
+        while True:
+            url = f'/api/matches/{investor.id}?limit=7{query}' + (f'&cursor={cursor}' if cursor else '')
+            data = client.get(url, headers=headers).get_json()
+            seen += [m['id'] for m in data['matches']]
+            cursor = data['next_cursor']
+            assert data['has_more'] == (cursor is not None)
+            if not cursor:
+                return seen
+
+    assert page_through('') == expected
+
+    matches = {m.id: m for m in Match.query.filter_by(investor_id=investor.id)}
+    cutoff = sorted(m.created_at for m in matches.values())[len(matches) // 2]
+    filtered = page_through(f'&min_score=0.5&interest=pending&created_after={cutoff.isoformat()}')
+    assert filtered == [
+        match_id for match_id in expected
+        if matches[match_id].compatibility_score >= 0.5
+        and matches[match_id].investor_interest in (None, 'pending')
+        and matches[match_id].created_at >= cutoff
+    ]
+
+    assert client.get(f'/api/matches/{investor.id}?cursor=bogus', headers=headers).status_code == 400
+    assert client.get(f'/api/matches/{investor.id}?confidence=huge', headers=headers).status_code == 400
+
+
+def test_stats_and_analytics_are_one_aggregate_query(app, db, client):
+    seed_marketplace(80, seed=6, investor_share=0.4, matches_per_investor=12)
+    investor = User.query.filter_by(user_type='investor').first()
+    startup = max(User.query.filter_by(user_type='startup'), key=lambda u: len(u.startup_matches))
+    idle = make_user('idle@example.com', 'startup')
+    db.session.commit()
+
+    for user, role, own in ((investor, 'investor_id', 'investor_interest'),
+                            (startup, 'startup_id', 'startup_interest'),
+                            (idle, 'startup_id', 'startup_interest')):
+        matches = Match.query.filter(getattr(Match, role) == user.id).all()
+        total = len(matches)
+        interested = sum(getattr(m, own) == 'interested' for m in matches)
+        mutual = sum(m.is_mutual_match for m in matches)
+        headers = auth_headers(user)
+
+        stats, count = _count_queries(db, lambda: client.get('/api/matches/stats', headers=headers).get_json())
+        assert count == 1
+        assert stats == {
+            'total_matches': total,
+            'pending_matches': sum(m.status == 'pending' for m in matches),
+            'interested_matches': interested,
+            'mutual_matches': mutual,
+            'match_rate': round(mutual / total * 100, 1) if total else 0
+        }
+
+        analytics, count = _count_queries(
+            db, lambda: client.get('/api/matches/dashboard/match-analytics', headers=headers).get_json()
+        )
+        assert count == 1
+        overview = analytics['overview']
+        assert overview['total_matches'] == total
+        assert overview['viewed_matches'] == sum(m.status == 'viewed' for m in matches)
+        assert overview['high_quality_matches'] == sum(m.compatibility_score >= 0.8 for m in matches)
+        assert overview['avg_compatibility'] == (
+            round(sum(m.compatibility_score for m in matches) / total * 100, 1) if total else 0
+        )
+        responses = sum(getattr(m, own) in ('interested', 'not_interested') for m in matches)
+        assert overview['response_rate'] == (round(responses / total * 100, 1) if total else 0)
+        if role == 'investor_id':
+            reasons = {}
+            for m in matches:
+                reason = m.match_reasons_list[0] if m.match_reasons_list else None
+                reasons[reason] = reasons.get(reason, 0) + 1
+            breakdown = analytics['trends']['industry_breakdown']
+            assert {item['industry']: item['count'] for item in breakdown} == reasons
+        else:
+            assert overview['investor_interest_count'] == sum(m.investor_interest == 'interested' for m in matches)
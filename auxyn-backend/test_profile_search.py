@@ -0,0 +1,119 @@
+import pytest
+
+from conftest import auth_headers, make_user
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.services.profile_search import profile_search
+from app.services.seed_data import seed_marketplace
+
+
+@pytest.fixture(params=['fts5', 'memory'])
+def backend(request, app):
+    app.config['SEARCH_BACKEND'] = request.param
+    profile_search.init_app(app)
+    return request.param
+
+
+@pytest.fixture
+def profiles(app, db, backend):
+    founder = make_user('founder@example.com', 'startup')
+    db.session.add_all([
+        StartupProfile(user_id=founder.id, company_name='Ledgerly', tagline='Fintech bookkeeping for cafés',
+                       description='Automated ledgers and payroll for small restaurants. ' * 8,
+                       value_proposition='Close the books in minutes'),
+        StartupProfile(user_id=founder.id, company_name='Greenloop', tagline='Recycling logistics',
+                       description='Route planning for recyclers; our fintech partners handle payouts.'),
+        StartupProfile(user_id=founder.id, company_name='Fintrack', tagline='Expense analytics',
+                       description='Spend dashboards for finance teams.')
+    ])
+    investor = make_user('investor@example.com', 'investor')
+    db.session.add(InvestorProfile(user_id=investor.id, name='Dana Fischer', title='Partner', company='Northwind',
+                                   bio='Early backer of fintech and payroll companies.',
+                                   expertise_areas='["payments", "cafe operations"]'))
+    db.session.commit()
+    return auth_headers(investor)
+
+
+def _search(client, headers, query):
+    response = client.get(f'/api/search?{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_search_ranks_highlights_and_pages(app, db, client, profiles):
+    body = _search(client, profiles, 'q=fintech')
+    names = [result['name'] for result in body['results']]
+    # Headline hits outrank body hits; the investor matches through the bio
+    assert names[0] == 'Ledgerly' and set(names) == {'Ledgerly', 'Greenloop', 'Dana Fischer'}
+    assert body['total'] == 3 and not body['has_more']
+    assert body['results'][0]['highlights'] == {'headline': '<mark>Fintech</mark> bookkeeping for cafés'}
+    assert [result['score'] for result in body['results']] == sorted(
+        (result['score'] for result in body['results']), reverse=True
+    )
+
+    # Prefix terms, every word required, diacritics folded, long bodies cut to a snippet
+    assert {result['name'] for result in _search(client, profiles, 'q=fin*')['results']} == {
+        'Ledgerly', 'Greenloop', 'Fintrack', 'Dana Fischer'
+    }
+    assert [result['name'] for result in _search(client, profiles, 'q=fintech+payroll')['results']] == [
+        'Ledgerly', 'Dana Fischer'
+    ]
+    cafe = _search(client, profiles, 'q=cafe&type=investor')['results']
+    assert [result['type'] for result in cafe] == ['investor']
+    assert cafe[0]['highlights'] == {'keywords': 'payments, <mark>cafe</mark> operations'}
+    snippet = _search(client, profiles, 'q=restaurants')['results'][0]['highlights']['body']
+    assert snippet.endswith('…') and '<mark>restaurants</mark>' in snippet and snippet.count('Automated') == 4
+
+    first = _search(client, profiles, 'q=fin*&limit=3')
+    second = _search(client, profiles, 'q=fin*&limit=3&page=2')
+    assert first['has_more'] and not second['has_more'] and second['count'] == 1
+    assert {(result['type'], result['profile_id']) for result in first['results']}.isdisjoint(
+        (result['type'], result['profile_id']) for result in second['results'])
+
+    for query in ('q=', 'q=***', 'type=startup&q=a+b+c+d+e+f+g+h+i', 'q=fintech&type=fund'):
+        assert client.get(f'/api/search?{query}', headers=profiles).status_code == 400
+
+
+def test_profile_writes_keep_the_index_current(app, db, client, profiles):
+    profile = StartupProfile.query.filter_by(company_name='Greenloop').one()
+    profile.tagline = 'Circular packaging'
+    db.session.commit()
+    assert _search(client, profiles, 'q=recycling')['total'] == 0
+    assert _search(client, profiles, 'q=packaging')['results'][0]['profile_id'] == profile.id
+
+    db.session.delete(StartupProfile.query.filter_by(company_name='Fintrack').one())
+    db.session.commit()
+    assert _search(client, profiles, 'q=expense')['total'] == 0
+
+    # Rolled back writes never reach the index
+    profile.tagline = 'Quantum teleportation'
+    db.session.flush()
+    db.session.rollback()
+    assert _search(client, profiles, 'q=quantum')['total'] == 0
+    assert _search(client, profiles, 'q=packaging')['total'] == 1
+
+    # Core writes are picked up by the seeder's reindex and by a rebuild
+    seed_marketplace(20, seed=23, matches_per_investor=1)
+    assert _search(client, profiles, 'q=seeded')['total'] == StartupProfile.query.count() - 2
+    db.session.execute(db.update(StartupProfile).where(StartupProfile.id == profile.id).values(
+        tagline='Solar financing'))
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=['search', 'rebuild'])
+    assert 'Indexed' in result.output
+    assert _search(client, profiles, 'q=solar')['results'][0]['profile_id'] == profile.id
+
+
+def test_backends_rank_alike(app, db):
+    seed_marketplace(120, seed=24, investor_share=0.4, matches_per_investor=1)
+    queries = ['seeded', 'fund', 'startup 1*', 'investor', 'seed* 5*']
+    rankings = {}
+    for name in ('fts5', 'memory'):
+        app.config['SEARCH_BACKEND'] = name
+        profile_search.init_app(app)
+        rankings[name] = [
+            [(hit['type'], hit['profile_id'], hit['score']) for hit in profile_search.search(query, limit=30)[0]]
+            for query in queries
+        ]
+    for fts5, memory in zip(rankings['fts5'], rankings['memory']):
+        assert [hit[:2] for hit in fts5] == [hit[:2] for hit in memory]
+        assert [hit[2] for hit in fts5] == pytest.approx([hit[2] for hit in memory], rel=1e-3)
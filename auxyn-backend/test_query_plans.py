@@ -0,0 +1,119 @@
+"""Query-plan regression suite for the hot request paths.
+
+Every SELECT a request issues is captured and run through SQLite's
+EXPLAIN QUERY PLAN; a plan that scans a whole table or index (instead of
+searching one) fails the test, naming the request, the statement and the
+plan.
+"""
+import re
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from conftest import auth_headers
+from app.models.follow import Follow
+from app.models.match import Match
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.models.user import User
+from app.services.seed_data import seed_marketplace
+from app.services.startup_directory import StartupDirectory
+from app.services.startup_reviews import StartupReviews
+
+TABLE_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)\w+\b(?! VIRTUAL TABLE)')
+
+
+@pytest.fixture
+def marketplace(app, db):
+    seed_marketplace(80, seed=11, investor_share=0.4, matches_per_investor=10)
+    investor = User.query.filter_by(user_type='investor').first()
+    startup_user = User.query.join(Match, Match.startup_id == User.id).filter(User.user_type == 'startup').first()
+
+    # A match from today, so generation answers "recent matches exist" without running
+    match = Match.query.filter_by(investor_id=investor.id).first()
+    match.created_at = datetime.utcnow()
+
+    startups = [Startup(name=f'Startup {i}', category='fintech') for i in range(20)]
+    db.session.add_all(startups)
+    db.session.flush()
+    for startup in startups:
+        db.session.add(Rating(startup_id=startup.id, user_id=investor.id, rating=4))
+        db.session.add(Follow(startup_id=startup.id, user_id=startup_user.id))
+    db.session.commit()
+    return investor, startup_user, match, startups[0]
+
+
+def _requests(investor, startup_user, match, startup):
+    partner = match.startup_id
+    yield investor, 'get', f'/api/matches/{investor.id}', None
+    yield investor, 'get', f'/api/matches/{investor.id}?status=viewed&limit=3', None
+    yield investor, 'get', f'/api/matches/{investor.id}?min_score=0.4&interest=pending&created_after=2020-01-01', None
+    yield investor, 'get', '/api/matches/stats', None
+    yield investor, 'get', '/api/matches/dashboard/match-analytics', None
+    yield investor, 'get', f'/api/matches/{match.id}/details', None
+    yield investor, 'get', f'/api/matches/{match.id}/insights', None
+    yield investor, 'get', '/api/matches/dashboard/recommendations', None
+    yield investor, 'get', f'/api/matches/preview/{partner}', None
+    yield investor, 'post', '/api/matches/generate', {}
+    yield investor, 'get', '/api/users/investor', None
+    yield investor, 'get', '/api/users/preferences', None
+    yield startup_user, 'get', f'/api/matches/{startup_user.id}', None
+    yield startup_user, 'get', '/api/matches/stats', None
+    yield startup_user, 'get', '/api/matches/dashboard/match-analytics', None
+    yield startup_user, 'get', '/api/matches/dashboard/recommendations', None
+    yield startup_user, 'get', '/api/users/startup', None
+    yield investor, 'get', '/api/search?q=seeded+start*&type=startup', None
+    yield investor, 'get', '/api/startups?category=fintech&sort=rating', None
+    yield investor, 'get', '/api/startups?category=fintech&sort=top', None
+    cursor = StartupDirectory.encode_cursor(startup, 'followers')
+    yield investor, 'get', f'/api/startups?category=fintech&sort=followers&cursor={cursor}', None
+    yield investor, 'get', f'/api/startups/{startup.id}', None
+    yield investor, 'get', f'/api/startups/{startup.id}/ratings', None
+    cursor = StartupReviews.encode_cursor(Rating.query.filter_by(startup_id=startup.id).first())
+    yield investor, 'get', f'/api/startups/{startup.id}/ratings?cursor={cursor}&full_text=true', None
+    yield investor, 'get', f'/api/startups/{startup.id}/followers', None
+    yield investor, 'post', f'/api/startups/{startup.id}/rate', {'rating': 5}
+    yield investor, 'post', f'/api/startups/{startup.id}/follow', {}
+    yield investor, 'delete', f'/api/startups/{startup.id}/follow', None
+
+
+def _captured_selects(db, send):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = send()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return response, statements
+
+
+def _table_scans(db, statement, parameters):
+    with db.engine.connect() as conn:
+        plan = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    details = [row[-1] for row in plan]
+    return [detail for detail in details if TABLE_SCAN.match(detail)], details
+
+
+def test_hot_queries_use_indexes(app, db, client, marketplace):
+    failures = []
+    for user, method, url, body in _requests(*marketplace):
+        headers = auth_headers(user)
+        db.session.expire_all()  # Requests share the test's session; start each one cold
+        response, statements = _captured_selects(
+            db, lambda: getattr(client, method)(url, json=body, headers=headers)
+        )
+        assert response.status_code < 500, (method, url, response.get_json())
+        assert statements, (method, url)
+
+        for statement, parameters in statements:
+            scans, plan = _table_scans(db, statement, parameters)
+            if scans:
+                failures.append(f"{method.upper()} {url}\n  {' '.join(statement.split())}\n  plan: {plan}")
+
+    assert not failures, 'Full table scans:\n' + '\n'.join(failures)
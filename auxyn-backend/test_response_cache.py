@@ -0,0 +1,106 @@
+import random
+import time
+
+from sqlalchemy import event
+
+from conftest import auth_headers
+from app.services.response_cache import NullBackend, response_cache
+from app.services.seed_data import seed_marketplace
+from app.models.match import Match
+from app.models.user import User
+from app.services.matching_service import MatchingService
+from test_matching_service import _count_queries, _seed_marketplace
+
+DASHBOARD = ['/api/matches/stats', '/api/matches/dashboard/match-analytics', '/api/matches/dashboard/recommendations']
+
+
+def test_dashboard_responses_are_cached_and_invalidated(app, db, client):
+    seed_marketplace(40, seed=12, investor_share=0.5, matches_per_investor=5)
+    investor = User.query.filter_by(user_type='investor').first()
+    other = User.query.filter_by(user_type='investor').offset(1).first()
+    headers, other_headers = auth_headers(investor), auth_headers(other)
+
+    interested = MatchingService.match_statistics(investor.id)['interested']
+    for url in DASHBOARD:
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        second, count = _count_queries(db, lambda: client.get(url, headers=headers))
+        assert count == 0
+        assert second.get_json() == first.get_json()
+    assert client.get('/api/matches/stats', headers=other_headers).get_json()['total_matches'] == 5
+
+    # An interest change invalidates both participants, and nobody else
+    match = Match.query.filter_by(investor_id=investor.id, investor_interest=None).first()
+    match.set_investor_interest('interested')
+    assert response_cache.backend.get((investor.id, 'stats')) is None
+    assert response_cache.backend.get((match.startup_id, 'stats')) is None
+    assert response_cache.backend.get((other.id, 'stats')) is not None
+    stats = client.get('/api/matches/stats', headers=headers).get_json()
+    assert stats['interested_matches'] == interested + 1
+
+    # Rolled back writes keep the cache
+    match.set_investor_interest('not_interested')
+    client.get('/api/matches/stats', headers=headers)
+    match.investor_interest = 'interested'
+    db.session.flush()
+    db.session.rollback()
+    assert response_cache.backend.get((investor.id, 'stats')) is not None
+
+    stats = response_cache.stats()
+    assert stats['backend'] == 'MemoryBackend'
+    assert stats['endpoints']['stats'] == {'hits': 1, 'misses': 4, 'hit_ratio': 0.2}
+    assert stats['hits'] == 3 and stats['misses'] == 6
+    assert stats['hit_ratio'] == round(3 / 9, 4)
+    metrics = client.get('/api/metrics/response-cache', headers=headers).get_json()
+    assert metrics['invalidations'] == stats['invalidations'] == 4
+
+
+def test_profile_edits_generation_and_ttl_expiry(app, db, client):
+    investor_user, _, _ = _seed_marketplace(db, random.Random(4), 30)
+    headers = auth_headers(investor_user)
+
+    assert client.get('/api/matches/stats', headers=headers).get_json()['total_matches'] == 0
+    assert client.post('/api/matches/generate', json={}, headers=headers).status_code == 202
+    assert client.get('/api/matches/stats', headers=headers).get_json()['total_matches'] > 0
+
+    client.get('/api/matches/dashboard/recommendations', headers=headers)
+    response = client.put('/api/users/investor', json={'name': 'Renamed'}, headers=headers)
+    assert response.status_code == 200
+    assert response_cache.backend.get((investor_user.id, 'recommendations')) is None
+
+    app.config['RESPONSE_CACHE_TTL'] = 0.05
+    response_cache.init_app(app)
+    client.get('/api/matches/stats', headers=headers)
+    assert response_cache.backend.get((investor_user.id, 'stats')) is not None
+    time.sleep(0.06)
+    assert response_cache.backend.get((investor_user.id, 'stats')) is None
+
+    app.config['RESPONSE_CACHE_BACKEND'] = 'none'
+    response_cache.init_app(app)
+    assert isinstance(response_cache.backend, NullBackend)
+    for _ in range(2):
+        assert client.get('/api/matches/stats', headers=headers).status_code == 200
+    assert response_cache.stats()['hits'] == 0
+
+
+def test_invalidation_during_a_miss_is_not_overwritten(app, db, client):
+    seed_marketplace(20, seed=13, investor_share=0.5, matches_per_investor=3)
+    investor = User.query.filter_by(user_type='investor').first()
+    headers = auth_headers(investor)
+
+    # A commit elsewhere invalidates the user while the view is still computing
+    def invalidate_once(conn, cursor, statement, parameters, context, executemany):
+        if not invalidate_once.done:
+            invalidate_once.done = True
+            response_cache.invalidate([investor.id])
+    invalidate_once.done = False
+    event.listen(db.engine, 'before_cursor_execute', invalidate_once)
+    try:
+        assert client.get('/api/matches/stats', headers=headers).status_code == 200
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', invalidate_once)
+
+    assert invalidate_once.done
+    assert response_cache.backend.get((investor.id, 'stats')) is None
+    client.get('/api/matches/stats', headers=headers)
+    assert response_cache.backend.get((investor.id, 'stats')) is not None
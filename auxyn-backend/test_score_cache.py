@@ -0,0 +1,105 @@
+from conftest import auth_headers, make_user
+
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.services.matching_service import MatchingService
+from app.services.score_cache import ScoreCache, score_cache
+
+
+def test_lru_eviction_and_counters():
+    cache = ScoreCache(maxsize=2)
+    cache.put(('a',), {'overall_score': 0.1})
+    cache.put(('b',), {'overall_score': 0.2})
+    assert cache.get(('a',)) == {'overall_score': 0.1}  # 'a' is now most recent
+    cache.put(('c',), {'overall_score': 0.3})
+
+    assert cache.get(('b',)) is None
+    assert cache.get(('c',)) == {'overall_score': 0.3}
+    assert cache.stats() == {
+        'size': 2, 'max_size': 2, 'hits': 2, 'misses': 1, 'evictions': 1, 'hit_ratio': 0.6667
+    }
+
+
+def _pair(db):
+    investor_user = make_user('investor@example.com', 'investor')
+    startup_user = make_user('startup@example.com', 'startup')
+    investor = InvestorProfile(
+        user_id=investor_user.id, name='Investor', min_investment=100000, max_investment=1000000,
+        preferred_industries='["fintech"]', investment_stage='["seed"]'
+    )
+    startup = StartupProfile(
+        user_id=startup_user.id, company_name='Startup', industry='fintech',
+        funding_needed=500000, funding_stage='seed', headquarters='Texas', market_size='large'
+    )
+    db.session.add_all([investor, startup])
+    db.session.commit()
+    return investor_user, startup_user, investor, startup
+
+
+def test_preview_uses_cache_until_profile_changes(app, db, client):
+    investor_user, startup_user, investor, startup = _pair(db)
+    headers = auth_headers(investor_user)
+    url = f'/api/matches/preview/{startup_user.id}'
+
+    first = client.get(url, headers=headers).get_json()
+    second = client.get(url, headers=headers).get_json()
+    assert first == second
+    assert first['compatibility_score'] == \
+        MatchingService._calculate_compatibility_score(investor, startup)['overall_score']
+    assert (score_cache.hits, score_cache.misses) == (1, 1)
+
+    version = startup.version
+    client.put('/api/users/startup', json={'industry': 'retail'}, headers=auth_headers(startup_user))
+    assert startup.version == version + 1
+
+    updated = client.get(url, headers=headers).get_json()
+    assert updated['score_breakdown']['industry_score'] == 0.2
+    assert (score_cache.hits, score_cache.misses) == (1, 2)
+
+    stats = client.get('/api/metrics/score-cache', headers=headers).get_json()
+    assert stats['hits'] == 1 and stats['misses'] == 2 and stats['size'] == 2
+
+
+def test_generation_and_rescoring_read_through_the_cache(app, db):
+    investor_user, _, investor, _ = _pair(db)
+    for i in range(5):
+        user = make_user(f'founder{i}@example.com', 'startup')
+        db.session.add(StartupProfile(user_id=user.id, company_name=f'Startup {i}', industry='fintech',
+                                      funding_needed=400000, funding_stage='seed', headquarters='Texas'))
+    db.session.commit()
+    score_cache.clear()
+
+    first = MatchingService.generate_matches_for_user(investor_user.id, limit=2)
+    assert (score_cache.hits, score_cache.misses, score_cache.stats()['size']) == (0, 6, 6)
+
+    # The next run scans the four unmatched startups again, all from the cache
+    second = MatchingService.generate_matches_for_user(investor_user.id, limit=2)
+    assert (score_cache.hits, score_cache.misses) == (4, 6)
+    assert {match.startup_id for match in first}.isdisjoint(match.startup_id for match in second)
+
+    # Rescoring reads the cached pairs, and scores are identical either way
+    stored = {match.id: match.compatibility_score for match in first + second}
+    assert MatchingService.rescore_matches_for_profile(investor) == 4
+    assert (score_cache.hits, score_cache.misses) == (8, 6)
+    assert {match.id: match.compatibility_score for match in first + second} == stored
+
+    # An edited profile has a new version, so its pairs are scored afresh
+    investor.preferred_industries = '["retail"]'
+    db.session.commit()
+    MatchingService.rescore_matches_for_profile(investor)
+    assert score_cache.misses == 10
+    assert all(match.industry_match_score == 0.2 for match in first + second)
+
+
+def test_concurrent_profile_updates_both_apply(app, db, client):
+    _, startup_user, _, startup = _pair(db)
+    version = startup.version
+
+    # Another writer updates the row after this session loaded it
+    table = StartupProfile.__table__
+    db.session.connection().execute(table.update().where(table.c.id == startup.id).values(
+        tagline='Edited elsewhere', version=table.c.version + 1))
+    response = client.put('/api/users/startup', json={'industry': 'retail'}, headers=auth_headers(startup_user))
+    assert response.status_code == 200
+    db.session.refresh(startup)
+    assert startup.industry == 'retail' and startup.version == version + 2
@@ -0,0 +1,110 @@
+import json
+import os
+import random
+
+import pytest
+
+from app.models.match import Match
+from app.services.batch_scoring import StartupColumns, score_row
+from app.services.matching_service import MatchingService
+from app.services.scoring_registry import ScoringAlgorithm, DEFAULT_WEIGHTS, scoring_registry
+from test_matching_service import _investor, _startup, _seed_marketplace
+
+CONFIG_V2 = {
+    'active_version': '2.0',
+    'versions': {
+        '2.0': {
+            'weights': {
+                'industry_score': 0.5, 'funding_score': 0.2, 'geographic_score': 0.1,
+                'stage_score': 0.1, 'market_size_score': 0.1
+            },
+            'tables': {'tech_industries': ['technology'], 'market_size_scores': {'huge': 1.0}}
+        }
+    }
+}
+
+
+def _use_config(app, path):
+    app.config['SCORING_CONFIG_PATH'] = str(path)
+    app.config['SCORING_CONFIG_CHECK_SECONDS'] = 0
+    scoring_registry.init_app(app)
+
+
+def _write(path, config, mtime):
+    path.write_text(json.dumps(config))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_configured_version_scores_consistently(app, tmp_path):
+    path = tmp_path / 'scoring.json'
+    _write(path, CONFIG_V2, 1_000_000_000)
+    _use_config(app, path)
+
+    algorithm = scoring_registry.active()
+    assert algorithm.version == '2.0'
+    assert scoring_registry.versions() == ['1.0', '2.0']
+
+    rng = random.Random(9)
+    investors = [_investor(rng, i) for i in range(20)]
+    startups = [_startup(rng, 100 + i) for i in range(60)]
+    columns = StartupColumns(startups)
+    for investor in investors:
+        scores = columns.score(investor)
+        for idx, startup in enumerate(startups):
+            expected = MatchingService._calculate_compatibility_score(investor, startup)
+            assert score_row(scores, idx) == expected
+            components = sum(expected[name] * weight for name, weight in algorithm.weights)
+            assert abs(expected['overall_score'] - components) < 1e-12
+
+
+def test_hot_reload_swaps_and_survives_bad_config(app, db, tmp_path):
+    path = tmp_path / 'scoring.json'
+    _write(path, {'active_version': '1.0'}, 1_000_000_000)
+    _use_config(app, path)
+    investor_user, _, _ = _seed_marketplace(db, random.Random(3), 30)
+    assert scoring_registry.active().version == '1.0'
+
+    _write(path, CONFIG_V2, 2_000_000_000)
+    matches = MatchingService.generate_matches_for_user(investor_user.id, limit=3)
+    assert {m.algorithm_version for m in Match.query.all()} == {'2.0'}
+    assert len(matches) == 3
+
+    # A broken file is ignored until it changes again
+    path.write_text('{"active_version": "3.0"')
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    assert scoring_registry.active().version == '2.0'
+
+
+@pytest.mark.parametrize('weights', [
+    DEFAULT_WEIGHTS[:4],
+    DEFAULT_WEIGHTS + (('charisma_score', 0.1),),
+    (('industry_score', -0.3),) + DEFAULT_WEIGHTS[1:]
+])
+def test_invalid_algorithms_are_rejected(weights):
+    with pytest.raises(ValueError):
+        ScoringAlgorithm('x', weights)
+
+
+def test_versions_cannot_be_redefined(app, tmp_path):
+    path = tmp_path / 'scoring.json'
+    _write(path, CONFIG_V2, 1_000_000_000)
+    _use_config(app, path)
+
+    # Reloading the same definition is fine
+    _write(path, CONFIG_V2, 2_000_000_000)
+    assert scoring_registry.reload_if_changed()
+
+    # New weights under a loaded version, or for the built-in one, are refused
+    changed = json.loads(json.dumps(CONFIG_V2))
+    changed['versions']['2.0']['weights']['industry_score'] = 0.6
+    builtin = {'active_version': '1.0', 'versions': {'1.0': changed['versions']['2.0']}}
+    for mtime, config in ((3_000_000_000, changed), (4_000_000_000, builtin)):
+        _write(path, config, mtime)
+        assert not scoring_registry.reload_if_changed()
+        assert scoring_registry.active().weight_map['industry_score'] == 0.5
+
+    # Dropped versions stay loaded, so they cannot come back with new content either
+    _write(path, {'active_version': '1.0'}, 5_000_000_000)
+    assert scoring_registry.reload_if_changed() and scoring_registry.versions() == ['1.0', '2.0']
+    _write(path, changed, 6_000_000_000)
+    assert not scoring_registry.reload_if_changed() and scoring_registry.active().version == '1.0'
@@ -0,0 +1,46 @@
+from datetime import datetime
+from app.models.user import User
+from app.models.investor_profile import InvestorProfile
+from app.models.startup_profile import StartupProfile
+from app.models.match import Match
+from app.models.match_insight import MatchInsight
+from app.services.seed_data import seed_marketplace
+
+
+def _snapshot(db):
+    return {
+        'users': [tuple(row) for row in db.session.query(User.id, User.email, User.user_type).order_by(User.id)],
+        'investors': [tuple(row) for row in db.session.query(
+            InvestorProfile.user_id, InvestorProfile.preferred_industries, InvestorProfile.investment_stage,
+            InvestorProfile.min_investment, InvestorProfile.max_investment
+        ).order_by(InvestorProfile.id)],
+        'startups': [tuple(row) for row in db.session.query(
+            StartupProfile.user_id, StartupProfile.industry, StartupProfile.funding_stage,
+            StartupProfile.funding_needed, StartupProfile.headquarters
+        ).order_by(StartupProfile.id)],
+        'matches': [tuple(row) for row in db.session.query(
+            Match.investor_id, Match.startup_id, Match.compatibility_score,
+            Match.investor_interest, Match.startup_interest, Match.status, Match.created_at
+        ).order_by(Match.id)]
+    }
+
+
+def test_seed_is_reproducible(app, db):
+    now = datetime(2024, 1, 1)
+    summary = seed_marketplace(200, seed=7, now=now)
+    first = _snapshot(db)
+
+    assert summary['investors'] + summary['startups'] == 200
+    assert summary['matches'] == len(first['matches']) == summary['investors'] * 8
+    assert MatchInsight.query.count() == summary['matches']
+    assert {m[5] for m in first['matches']} >= {'pending', 'viewed'}
+
+    db.drop_all()
+    db.create_all()
+    seed_marketplace(200, seed=7, now=now)
+    assert _snapshot(db) == first
+
+    db.drop_all()
+    db.create_all()
+    seed_marketplace(200, seed=8, now=now)
+    assert _snapshot(db) != first
@@ -0,0 +1,102 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import auth_headers, make_user
+from app.models.startup import Startup
+from app.services.startup_directory import SORTS, StartupDirectory
+from test_query_plans import _captured_selects
+
+
+@pytest.fixture
+def directory(app, db):
+    rng = random.Random(22)
+    started = datetime(2026, 1, 1)
+    startups = []
+    for i in range(60):
+        rating_count = rng.choice([0, 0, 1, 2, 4])
+        rating_sum = sum(rng.randint(1, 5) for _ in range(rating_count))
+        startups.append(Startup(
+            name=f'Startup {i}', description='', category=rng.choice(['fintech', 'ai', 'health']),
+            # Repeated timestamps, averages and follower counts exercise the id tie-breaker
+            created_at=started + timedelta(hours=rng.randint(0, 10)),
+            rating_sum=rating_sum, rating_count=rating_count,
+            rating_avg=rating_sum / rating_count if rating_count else 0.0,
+            follower_count=rng.randint(0, 3)
+        ))
+    db.session.add_all(startups)
+    db.session.commit()
+    return auth_headers(make_user('browser@example.com', 'investor'))
+
+
+def _walk(client, headers, query, limit=7):
+    ids, cursor, pages = [], None, 0
+    while True:
+        url = f'/api/startups?limit={limit}&{query}' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url, headers=headers).get_json()
+        ids += [startup['id'] for startup in body['startups']]
+        pages += 1
+        assert body['has_more'] == (body['next_cursor'] is not None)
+        if not body['has_more']:
+            return ids, body['total'], pages
+        assert body['count'] == limit
+        cursor = body['next_cursor']
+
+
+def test_pages_cover_each_sort_and_category_in_order(app, db, client, directory):
+    for sort, column in SORTS.items():
+        for category in (None, 'fintech', 'ai'):
+            rows = Startup.query.filter(Startup.category == category) if category else Startup.query
+            expected = [startup.id for startup in sorted(
+                rows, key=lambda startup: (getattr(startup, column), startup.id), reverse=True
+            )]
+            query = f'sort={sort}' + (f'&category={category}' if category else '')
+            ids, total, pages = _walk(client, directory, query)
+            assert ids == expected, (sort, category)
+            assert total == len(expected) and pages == max(1, -(-len(expected) // 7))
+
+    # Newest first by default; NDJSON streams the rest of the same order from a cursor
+    first = client.get('/api/startups?limit=5', headers=directory).get_json()
+    newest = Startup.query.order_by(Startup.created_at.desc(), Startup.id.desc()).all()
+    assert [startup['id'] for startup in first['startups']] == [startup.id for startup in newest[:5]]
+    streamed = client.get(f"/api/startups?cursor={first['next_cursor']}",
+                          headers={**directory, 'Accept': 'application/x-ndjson'})
+    assert [int(line.split(b'"id":')[1].split(b',')[0]) for line in streamed.data.splitlines()] == [
+        startup.id for startup in newest[5:]
+    ]
+
+
+def test_invalid_sort_and_cursors_are_rejected(app, db, client, directory):
+    rating_cursor = client.get('/api/startups?sort=rating&limit=2', headers=directory).get_json()['next_cursor']
+    for query in ('sort=name', 'cursor=not-a-cursor', f'sort=followers&cursor={rating_cursor}', 'limit=x'):
+        response = client.get(f'/api/startups?{query}', headers=directory)
+        assert response.status_code == 400, query
+    response = client.get('/api/startups?sort=name', headers={**directory, 'Accept': 'application/x-ndjson'})
+    assert response.status_code == 400
+
+
+def test_totals_are_cached_until_the_ttl(app, db, client, directory):
+    total = client.get('/api/startups?category=ai', headers=directory).get_json()['total']
+    db.session.add(Startup(name='Late', category='ai'))
+    db.session.commit()
+    assert client.get('/api/startups?category=ai', headers=directory).get_json()['total'] == total
+
+    app.config['STARTUP_COUNT_TTL'] = 0
+    assert client.get('/api/startups?category=ai', headers=directory).get_json()['total'] == total + 1
+
+
+def test_pages_are_index_range_seeks(app, db, client, directory):
+    deep = Startup.query.order_by(Startup.id).offset(30).first()
+    for sort in SORTS:
+        cursor = StartupDirectory.encode_cursor(deep, sort)
+        for query in (f'sort={sort}', f'sort={sort}&cursor={cursor}',
+                      f'sort={sort}&category=ai', f'sort={sort}&category=ai&cursor={cursor}'):
+            _, statements = _captured_selects(db, lambda: client.get(f'/api/startups?{query}', headers=directory))
+            for statement, parameters in statements:
+                with db.engine.connect() as conn:
+                    plan = ' | '.join(row[-1] for row in conn.exec_driver_sql(
+                        f'EXPLAIN QUERY PLAN {statement}', parameters
+                    ))
+                # Rows come off the index in order: no sort step, and never the table itself
+                assert 'TEMP B-TREE' not in plan and 'INDEX' in plan, (query, plan)
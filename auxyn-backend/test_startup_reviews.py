@@ -0,0 +1,82 @@
+import pytest
+
+from conftest import auth_headers, make_user
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.services.startup_stats import startup_stats
+from test_matching_service import _count_queries
+
+
+@pytest.fixture
+def raters(app, db):
+    return [make_user(f'rater{i}@example.com', 'investor') for i in range(12)]
+
+
+def test_histogram_and_bayesian_rating_follow_writes(app, db, client, raters):
+    startups = [Startup(name=name, description='', category='ai') for name in ('Solo', 'Crowd', 'Unrated')]
+    db.session.add_all(startups)
+    db.session.commit()
+    solo, crowd, unrated = startups
+    assert unrated.rating_bayes == pytest.approx(3.0)
+
+    headers = [auth_headers(user) for user in raters]
+    assert client.post(f'/api/startups/{solo.id}/rate', json={'rating': 5}, headers=headers[0]).status_code == 201
+    for user_headers, rating in zip(headers, [5] * 9 + [4, 4, 2]):
+        assert client.post(f'/api/startups/{crowd.id}/rate', json={'rating': rating}, headers=user_headers).status_code == 201
+    # Re-rating moves the user's vote between histogram buckets
+    assert client.post(f'/api/startups/{crowd.id}/rate', json={'rating': 4}, headers=headers[11]).status_code == 201
+    assert startup_stats.reconcile(fix=False)['drift'] == []
+
+    db.session.expire_all()
+    assert crowd.rating_histogram == {'1': 0, '2': 0, '3': 0, '4': 3, '5': 9}
+    assert solo.rating_bayes == pytest.approx((5 * 3.0 + 5) / 6)
+    assert crowd.rating_bayes == pytest.approx((5 * 3.0 + 57) / 17)
+
+    # One five-star rating ranks above the crowd on the plain average, below it on the Bayesian one
+    by_rating = client.get('/api/startups?sort=rating', headers=headers[0]).get_json()['startups']
+    by_top = client.get('/api/startups?sort=top&limit=2', headers=headers[0]).get_json()
+    assert [startup['name'] for startup in by_rating[:2]] == ['Solo', 'Crowd']
+    assert [startup['name'] for startup in by_top['startups']] == ['Crowd', 'Solo']
+    last = client.get(f"/api/startups?sort=top&cursor={by_top['next_cursor']}", headers=headers[0]).get_json()
+    assert [startup['name'] for startup in last['startups']] == ['Unrated'] and not last['has_more']
+
+    # Core writes bypass the listener; reconcile repairs the histogram too
+    db.session.execute(db.update(Startup).where(Startup.id == crowd.id).values(stars_5=0))
+    db.session.commit()
+    report = startup_stats.reconcile()
+    db.session.commit()
+    assert [item['field'] for item in report['drift']] == ['stars_5']
+    assert startup_stats.reconcile(fix=False)['drift'] == []
+
+
+def test_reviews_page_newest_first_with_excerpts(app, db, client, raters):
+    startup = Startup(name='Reviewed', description='', category='ai')
+    db.session.add(startup)
+    db.session.commit()
+    headers = [auth_headers(user) for user in raters]
+    for number, user_headers in enumerate(headers):
+        review = {'rating': number % 5 + 1, 'review_text': f'Review {number} ' + 'x' * (number * 40)}
+        assert client.post(f'/api/startups/{startup.id}/rate', json=review, headers=user_headers).status_code == 201
+
+    db.session.expire_all()
+    response, count = _count_queries(db, lambda: client.get(f'/api/startups/{startup.id}/ratings?limit=5',
+                                                              headers=headers[0]))
+    body = response.get_json()
+    assert count == 2  # The startup row and one page of ratings
+    assert body['total_ratings'] == 12 and body['histogram'] == {'1': 3, '2': 3, '3': 2, '4': 2, '5': 2}
+    assert body['average_rating'] == round(33 / 12, 1)
+    assert body['bayesian_rating'] == round((5 * 3.0 + 33) / 17, 2)
+
+    reviews, cursor = body['ratings'], body['next_cursor']
+    while cursor:
+        page = client.get(f'/api/startups/{startup.id}/ratings?limit=5&cursor={cursor}', headers=headers[0]).get_json()
+        reviews += page['ratings']
+        cursor = page['next_cursor']
+    assert [review['review_text'].split()[1] for review in reviews] == [str(number) for number in range(11, -1, -1)]
+    assert all(len(review['review_text']) <= 280 for review in reviews)
+    assert [review['review_truncated'] for review in reviews] == [True] * 5 + [False] * 7
+
+    full = client.get(f'/api/startups/{startup.id}/ratings?limit=1&full_text=true', headers=headers[0]).get_json()
+    assert full['ratings'][0]['review_text'] == Rating.query.get(full['ratings'][0]['id']).review_text
+    assert not full['ratings'][0]['review_truncated']
+    assert client.get(f'/api/startups/{startup.id}/ratings?cursor=bogus', headers=headers[0]).status_code == 400
@@ -0,0 +1,73 @@
+from conftest import auth_headers, make_user
+from app.models.follow import Follow
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.services.startup_stats import startup_stats
+from test_matching_service import _count_queries
+
+
+def _assert_in_sync():
+    assert startup_stats.reconcile(fix=False)['drift'] == []
+
+
+def test_aggregates_follow_ratings_and_follows(app, db, client):
+    users = [make_user(f'user{i}@example.com', 'investor') for i in range(3)]
+    startups = [Startup(name=f'Startup {i}', description='', category='fintech') for i in range(2)]
+    db.session.add_all(startups)
+    db.session.commit()
+    startup_id = startups[0].id
+    headers = [auth_headers(user) for user in users]
+
+    for user_headers, rating in zip(headers, (5, 3, 4)):
+        assert client.post(f'/api/startups/{startup_id}/rate', json={'rating': rating}, headers=user_headers).status_code == 201
+    # Re-rating replaces the user's earlier rating
+    assert client.post(f'/api/startups/{startup_id}/rate', json={'rating': 1}, headers=headers[0]).status_code == 201
+    for user_headers in headers:
+        assert client.post(f'/api/startups/{startup_id}/follow', headers=user_headers).status_code == 201
+    assert client.delete(f'/api/startups/{startup_id}/follow', headers=headers[1]).status_code == 200
+    _assert_in_sync()
+
+    # Requests share the test's session; expire it so each one starts cold
+    db.session.expire_all()
+    response, count = _count_queries(db, lambda: client.get(f'/api/startups/{startup_id}', headers=headers[0]))
+    assert response.get_json()['rating'] == round(8 / 3, 1) and response.get_json()['followers'] == 2
+    assert count == 1
+    response, count = _count_queries(db, lambda: client.get('/api/startups?sort=followers', headers=headers[0]))
+    assert [startup['followers'] for startup in response.get_json()['startups']] == [2, 0]
+    assert count == 2  # The page and the (then cached) total
+    db.session.expire_all()
+    response, count = _count_queries(db, lambda: client.get(f'/api/startups/{startup_id}/followers', headers=headers[0]))
+    assert response.get_json()['follower_count'] == 2 and count == 1
+
+    # ORM edits, moves and deletes outside the routes, and rolled back writes
+    rating = Rating.query.filter_by(startup_id=startup_id).first()
+    rating.startup_id = startups[1].id
+    db.session.delete(Follow.query.filter_by(startup_id=startup_id).first())
+    db.session.commit()
+    _assert_in_sync()
+    db.session.add(Rating(startup_id=startup_id, user_id=users[0].id, rating=5))
+    db.session.flush()
+    db.session.rollback()
+    _assert_in_sync()
+
+
+def test_reconcile_command_repairs_drift(app, db):
+    user = make_user('rater@example.com', 'investor')
+    startup = Startup(name='Drifted', description='', category='ai')
+    db.session.add(startup)
+    db.session.flush()
+    db.session.add(Rating(startup_id=startup.id, user_id=user.id, rating=4))
+    db.session.commit()
+    db.session.execute(db.update(Startup).where(Startup.id == startup.id).values(follower_count=7, rating_sum=0))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['startup', 'reconcile-stats', '--dry-run'])
+    assert f'startup {startup.id} rating_sum: stored 0, expected 4' in result.output
+    assert f'startup {startup.id} follower_count: stored 7, expected 0' in result.output
+    assert '1 had drifted' in result.output
+
+    result = app.test_cli_runner().invoke(args=['startup', 'reconcile-stats'])
+    assert 'reconciled' in result.output
+    _assert_in_sync()
+    db.session.expire_all()
+    assert db.session.get(Startup, startup.id).to_dict()['rating'] == 4.0
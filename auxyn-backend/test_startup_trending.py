@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from conftest import auth_headers, make_user
+from app.models.follow import Follow
+from app.models.startup import Startup
+from app.models.trending_score import TrendingScore
+from app.services.startup_trending import startup_trending
+from test_matching_service import _count_queries
+from test_query_plans import _captured_selects, _table_scans
+
+
+def _stored():
+    return {score.startup_id: score.score_log for score in TrendingScore.query.all()}
+
+
+def test_trending_follows_decayed_events(app, db, client):
+    users = [make_user(f'fan{i}@example.com', 'investor') for i in range(4)]
+    startups = [Startup(name=name, description='', category='ai') for name in ('Faded', 'Followed', 'Rated', 'Quiet')]
+    db.session.add_all(startups)
+    db.session.commit()
+    faded, followed, rated, quiet = startups
+    headers = auth_headers(users[0])
+
+    # Three follows two half-lives ago are worth 0.75 of a fresh follow
+    four_days_ago = datetime.utcnow() - timedelta(hours=96)
+    db.session.add_all([Follow(user_id=user.id, startup_id=faded.id, created_at=four_days_ago) for user in users[1:]])
+    db.session.commit()
+    assert client.post(f'/api/startups/{followed.id}/follow', headers=headers).status_code == 201
+    assert client.post(f'/api/startups/{rated.id}/rate', json={'rating': 4}, headers=headers).status_code == 201
+
+    db.session.expire_all()
+    response, count = _count_queries(db, lambda: client.get('/api/startups/trending', headers=headers))
+    body = response.get_json()
+    assert count == 1
+    assert [startup['name'] for startup in body['startups']] == ['Rated', 'Followed', 'Faded']
+    assert [startup['trending_score'] for startup in body['startups']] == pytest.approx([2.0, 1.0, 0.75], abs=1e-3)
+    assert body['half_life_hours'] == 48.0
+    assert client.get('/api/startups/trending?limit=1', headers=headers).get_json()['count'] == 1
+
+    # Unfollowing takes the follow's weight back; rolled back follows never count
+    assert client.delete(f'/api/startups/{followed.id}/follow', headers=headers).status_code == 200
+    db.session.add(Follow(user_id=users[1].id, startup_id=quiet.id))
+    db.session.flush()
+    db.session.rollback()
+    db.session.delete(Follow.query.filter_by(startup_id=faded.id).first())
+    db.session.commit()
+    trending = client.get('/api/startups/trending', headers=headers).get_json()['startups']
+    assert [startup['name'] for startup in trending] == ['Rated', 'Faded']
+    assert trending[1]['trending_score'] == pytest.approx(0.5, abs=1e-3)
+
+    # A rebuild from history reproduces the incremental scores
+    incremental = _stored()
+    db.session.execute(db.delete(TrendingScore))
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=['startup', 'rebuild-trending'])
+    assert 'Scored 2 startups from 3 follows and ratings' in result.output
+    assert _stored() == pytest.approx(incremental, rel=1e-12)
+
+
+def test_trending_reads_the_top_of_the_index(app, db, client):
+    user = make_user('reader@example.com', 'investor')
+    db.session.add_all([Startup(name=f'Startup {i}', category='ai') for i in range(5)])
+    db.session.commit()
+    for startup in Startup.query.all():
+        db.session.add(Follow(user_id=user.id, startup_id=startup.id))
+    db.session.commit()
+
+    headers = auth_headers(user)
+    db.session.expire_all()
+    response, statements = _captured_selects(db, lambda: client.get('/api/startups/trending?limit=3', headers=headers))
+    assert response.get_json()['count'] == 3
+    (statement, parameters), = statements
+    _, plan = _table_scans(db, statement, parameters)
+    assert any('ix_trending_scores_score' in detail for detail in plan), plan
+
+
+def test_first_trending_row_tolerates_a_concurrent_creator(app, db):
+    user = make_user('first-fan@example.com', 'investor')
+    startup = Startup(name='Contested', category='ai')
+    db.session.add(startup)
+    db.session.commit()
+
+    # Another transaction scores the startup just before our first follow does
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO trending_scores') and not race.done:
+            race.done = True
+            cursor.execute('INSERT INTO trending_scores (startup_id, score_log) VALUES (?, ?)',
+                           (startup.id, startup_trending.term(Follow, datetime.utcnow())))
+    race.done = False
+    event.listen(db.engine, 'before_cursor_execute', race)
+    try:
+        db.session.add(Follow(user_id=user.id, startup_id=startup.id))
+        db.session.commit()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', race)
+
+    assert race.done
+    (_, score), = startup_trending.top()
+    assert score == pytest.approx(2.0, abs=1e-3)
+
+    # Removing the only event drops the row rather than leaving a placeholder
+    db.session.query(Follow).delete()
+    db.session.execute(db.delete(TrendingScore))
+    db.session.add(Follow(user_id=user.id, startup_id=startup.id))
+    db.session.commit()
+    db.session.delete(Follow.query.one())
+    db.session.commit()
+    assert _stored() == {}
+
+
+def test_rerating_is_not_a_new_trending_event(app, db, client):
+    user = make_user('critic@example.com', 'investor')
+    startup = Startup(name='Rerated', category='ai')
+    db.session.add(startup)
+    db.session.commit()
+    headers = auth_headers(user)
+
+    assert client.post(f'/api/startups/{startup.id}/rate', json={'rating': 2}, headers=headers).status_code == 201
+    rated = _stored()
+    assert client.post(f'/api/startups/{startup.id}/rate', json={'rating': 5}, headers=headers).status_code == 201
+
+    # The rating keeps its first time, and the score its single term
+    db.session.expire_all()
+    assert _stored() == rated
+    assert startup_trending.score(rated[startup.id]) == pytest.approx(2.0, abs=1e-3)
@@ -0,0 +1,111 @@
+import gzip
+import json
+import random
+import zlib
+
+from conftest import auth_headers
+from app.models.follow import Follow
+from app.models.rating import Rating
+from app.models.startup import Startup
+from app.models.user import User
+from app.services.matching_service import MatchingService
+from app.services.seed_data import seed_marketplace
+from test_matching_service import _count_queries, _seed_marketplace
+
+NDJSON = {'Accept': 'application/x-ndjson'}
+
+
+def _ndjson(data):
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+def _all_pages(client, url, headers):
+    matches, cursor = [], None
+    while True:
+        page = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=headers).get_json()
+        matches.extend(page['matches'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return matches
+
+
+def test_ndjson_match_list_streams_every_match(app, db, client):
+    seed_marketplace(60, seed=13, investor_share=0.3, matches_per_investor=35)
+    investor = User.query.filter_by(user_type='investor').first()
+    headers = auth_headers(investor)
+    url = f'/api/matches/{investor.id}?limit=10'
+
+    response, count = _count_queries(db, lambda: client.get(url, headers={**headers, **NDJSON}))
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.is_streamed
+    streamed = _ndjson(response.data)
+    assert len(streamed) == 35 and count <= 2
+    assert streamed == _all_pages(client, url, headers)
+    assert all('partner_profile' in match for match in streamed)
+
+    # Filters and cursors apply; batches join up without gaps
+    filtered = _ndjson(client.get(url + '&min_score=0.5', headers={**headers, **NDJSON}).data)
+    assert filtered == [match for match in streamed if match['compatibility_score'] >= 0.5]
+    page = client.get(url, headers=headers).get_json()
+    rest = _ndjson(client.get(url + f"&cursor={page['next_cursor']}", headers={**headers, **NDJSON}).data)
+    assert rest == streamed[10:]
+    batched = MatchingService.iter_matches(investor.id, batch_size=4)
+    assert [match.id for match in batched] == [match['id'] for match in streamed]
+
+    assert client.get(url + '&cursor=bogus', headers={**headers, **NDJSON}).status_code == 400
+    assert client.get(url, headers={**headers, 'Accept': '*/*'}).mimetype == 'application/json'
+
+
+def test_startup_list_stream_and_compression(app, db, client):
+    user = User(email='rater@example.com', user_type='investor')
+    db.session.add(user)
+    startups = [Startup(name=f'Startup {i}', description='x' * 80, category='fintech') for i in range(40)]
+    db.session.add_all(startups)
+    db.session.flush()
+    db.session.add_all([Rating(startup_id=startups[0].id, user_id=user.id, rating=r) for r in (4, 5)])
+    db.session.add(Follow(startup_id=startups[1].id, user_id=user.id))
+    db.session.commit()
+    headers = auth_headers(user)
+
+    response = client.get('/api/startups', headers=headers)
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    listed = response.get_json()['startups']
+    by_id = {startup['id']: startup for startup in listed}
+    assert by_id[startups[0].id]['rating'] == 4.5 and by_id[startups[1].id]['followers'] == 1
+    assert _ndjson(client.get('/api/startups', headers={**headers, **NDJSON}).data) == listed
+
+    # Buffered bodies above the threshold
+    response = client.get('/api/startups', headers={**headers, 'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['startups'] == listed
+    response = client.get('/api/startups', headers={**headers, 'Accept-Encoding': 'deflate, gzip;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'deflate'
+    assert json.loads(zlib.decompress(response.data))['startups'] == listed
+
+    # Streamed bodies are compressed as they are generated
+    response = client.get('/api/startups', headers={**headers, **NDJSON, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip' and 'Content-Length' not in response.headers
+    assert _ndjson(gzip.decompress(response.data)) == listed
+
+    # Each streamed chunk is flushed, so the first line decodes on its own
+    response = client.get('/api/startups', headers={**headers, **NDJSON, 'Accept-Encoding': 'gzip'}, buffered=False)
+    first = next(iter(response.response))
+    assert json.loads(zlib.decompressobj(31).decompress(first)) == listed[0]
+    response.close()
+
+    # Small bodies are sent as is
+    response = client.get(f'/api/startups/{startups[0].id}', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_compressed_responses_still_revalidate(app, db, client):
+    investor_user, _, _ = _seed_marketplace(db, random.Random(8), 2)
+    app.config['COMPRESS_MIN_SIZE'] = 0
+    headers = {**auth_headers(investor_user), 'Accept-Encoding': 'gzip'}
+
+    response = client.get('/api/users/investor', headers=headers)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].startswith('W/"')
+    revalidated = client.get('/api/users/investor', headers={**headers, 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
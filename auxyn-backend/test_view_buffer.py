@@ -0,0 +1,97 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import auth_headers
+from app.models.match import Match
+from app.models.user import User
+from app.services.match_counters import match_counters
+from app.services.response_cache import response_cache
+from app.services.seed_data import seed_marketplace
+from app.services.view_buffer import view_buffer
+
+
+@pytest.fixture
+def buffered(app, db):
+    app.config.update(VIEW_BUFFER_ENABLED=True, VIEW_BUFFER_FLUSH_SECONDS=3600, VIEW_BUFFER_FLUSH_SIZE=1000)
+    seed_marketplace(40, seed=16, investor_share=0.5, matches_per_investor=4)
+    db.session.execute(db.update(Match).values(status='pending', investor_viewed_at=None, startup_viewed_at=None))
+    match_counters.reconcile(fix=True)
+    db.session.commit()
+    yield
+    view_buffer.shutdown()
+
+
+def _row(db, match_id):
+    db.session.expire_all()
+    return db.session.get(Match, match_id)
+
+
+def test_views_are_coalesced_and_written_in_one_flush(app, db, client, buffered):
+    investor = User.query.filter_by(user_type='investor').first()
+    matches = Match.query.filter_by(investor_id=investor.id).order_by(Match.id).all()
+    match_ids = [match.id for match in matches]
+    startup = db.session.get(User, matches[0].startup_id)
+    headers = auth_headers(investor)
+    client.get('/api/matches/stats', headers=headers)
+
+    for _ in range(3):
+        for match_id in match_ids:
+            response = client.post(f'/api/matches/{match_id}/view', headers=headers)
+            assert response.status_code == 200
+            assert response.get_json()['match']['status'] == 'viewed'
+    assert client.post(f'/api/matches/{match_ids[0]}/view', headers=auth_headers(startup)).status_code == 200
+
+    # Nothing is written until the flush
+    assert _row(db, match_ids[0]).investor_viewed_at is None
+    assert view_buffer.stats()['pending'] == 5 and view_buffer.stats()['coalesced'] == 8
+
+    assert view_buffer.flush() == 5
+    for match_id in match_ids:
+        row = _row(db, match_id)
+        assert row.status == 'viewed' and row.investor_viewed_at is not None
+        assert row.last_interaction_at >= row.investor_viewed_at
+    assert _row(db, match_ids[0]).startup_viewed_at is not None
+    assert match_counters.reconcile(fix=False)['drift'] == []
+    assert client.get('/api/matches/stats', headers=headers).get_json()['pending_matches'] == 0
+    assert response_cache.stats()['invalidations'] >= 2
+
+    # A late event never moves timestamps backwards; statuses past pending stay put
+    latest = _row(db, match_ids[1]).investor_viewed_at
+    match = _row(db, match_ids[1])
+    match.set_investor_interest('interested')
+    view_buffer.record(match_ids[1], 'investor', latest - timedelta(hours=1))
+    view_buffer.flush()
+    row = _row(db, match_ids[1])
+    assert row.investor_viewed_at == latest and row.status == 'interested'
+    assert match_counters.reconcile(fix=False)['drift'] == []
+
+    stats = client.get('/api/metrics/view-buffer', headers=headers).get_json()
+    assert stats['written'] == 6 and stats['flushes'] == 2 and stats['pending'] == 0
+
+
+def test_size_trigger_bound_and_shutdown(app, db, buffered):
+    match_ids = [match_id for (match_id,) in db.session.query(Match.id).order_by(Match.id).limit(6)]
+
+    # Reaching the size trigger wakes the flush thread
+    app.config['VIEW_BUFFER_FLUSH_SIZE'] = 2
+    view_buffer.record(match_ids[0], 'investor')
+    view_buffer.record(match_ids[1], 'investor')
+    deadline = time.monotonic() + 5
+    while view_buffer.stats()['written'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert view_buffer.stats()['written'] == 2
+
+    # A full buffer is written by the recording caller
+    app.config.update(VIEW_BUFFER_FLUSH_SIZE=1000, VIEW_BUFFER_MAX_PENDING=2)
+    view_buffer.record(match_ids[2], 'startup')
+    view_buffer.record(match_ids[3], 'startup')
+    assert view_buffer.stats()['pending'] == 0 and view_buffer.stats()['flushes'] == 2
+
+    # Shutdown writes what is left
+    app.config['VIEW_BUFFER_MAX_PENDING'] = 1000
+    view_buffer.record(match_ids[4], 'investor', datetime(2030, 1, 1))
+    view_buffer.shutdown()
+    assert _row(db, match_ids[4]).investor_viewed_at == datetime(2030, 1, 1)
+    assert match_counters.reconcile(fix=False)['drift'] == []
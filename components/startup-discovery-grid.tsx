@@ -192,6 +192,8 @@ export const StartupDiscoveryGrid: React.FC<StartupDiscoveryGridProps> = ({
 }) => {
   const [startups, setStartups] = useState<StartupData[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [followingStartups, setFollowingStartups] = useState<Set<number>>(new Set());
   const [loadingActions, setLoadingActions] = useState<Set<number>>(new Set());
@@ -228,37 +230,9 @@ export const StartupDiscoveryGrid: React.FC<StartupDiscoveryGridProps> = ({
       setLoading(true);
       setError(null);
       
-      const startupsData = await startupAPI.getAll();
-      
-      // Transform backend data to match UI interface
-      const transformedStartups: StartupData[] = startupsData.map(startup => ({
-        ...startup,
-        industry: [startup.category], // Convert category to industry array
-        stage: "Seed", // Default stage
-        location: "San Francisco, CA", // Default location
-        foundedYear: 2022, // Default year
-        fundingNeeded: "$1M", // Default funding
-        equityOffered: "10%", // Default equity
-        currentValuation: "$5M", // Default valuation
-        teamSize: 8, // Default team size
-        revenue: "Pre-revenue", // Default revenue
-        growth: "N/A", // Default growth
-        customers: 0, // Default customers
-        businessModel: "SaaS", // Default business model
-        targetMarket: "Enterprise", // Default target market
-        verified: true, // Default verified
-        featured: false, // Default featured
-        trending: Math.random() > 0.5, // Random trending
-        lastActive: "2 hours ago", // Default last active
-        responseRate: Math.floor(Math.random() * 40) + 60, // Random response rate 60-100%
-        views: Math.floor(Math.random() * 1000) + 100, // Random views 100-1100
-        interests: Math.floor(Math.random() * 50) + 10, // Random interests 10-60
-        bookmarks: Math.floor(Math.random() * 30) + 5, // Random bookmarks 5-35
-        totalRatings: startup.rating ? Math.floor(Math.random() * 200) + 50 : 0, // Random total ratings if rated
-        following: false // Will be updated based on user's follow status
-      }));
-
-      setStartups(transformedStartups);
+      const page = await startupAPI.getAll();
+      setStartups(transformStartups(page.startups));
+      setNextCursor(page.next_cursor);
     } catch (error) {
       setError(handleApiError(error));
       console.error('Failed to load startups:', error);
@@ -267,6 +241,56 @@ export const StartupDiscoveryGrid: React.FC<StartupDiscoveryGridProps> = ({
     }
   };
 
+  const loadMoreStartups = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      
+      // Continue the directory after the last startup already shown
+      const page = await startupAPI.getAll(nextCursor);
+      setStartups(prev => [...prev, ...transformStartups(page.startups)]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      toast({
+        title: "Error",
+        description: handleApiError(error),
+        variant: "destructive",
+      });
+      console.error('Failed to load more startups:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Transform backend data to match UI interface
+  const transformStartups = (startupsData: Startup[]): StartupData[] =>
+    startupsData.map(startup => ({
+      ...startup,
+      industry: [startup.category], // Convert category to industry array
+      stage: "Seed", // Default stage
+      location: "San Francisco, CA", // Default location
+      foundedYear: 2022, // Default year
+      fundingNeeded: "$1M", // Default funding
+      equityOffered: "10%", // Default equity
+      currentValuation: "$5M", // Default valuation
+      teamSize: 8, // Default team size
+      revenue: "Pre-revenue", // Default revenue
+      growth: "N/A", // Default growth
+      customers: 0, // Default customers
+      businessModel: "SaaS", // Default business model
+      targetMarket: "Enterprise", // Default target market
+      verified: true, // Default verified
+      featured: false, // Default featured
+      trending: Math.random() > 0.5, // Random trending
+      lastActive: "2 hours ago", // Default last active
+      responseRate: Math.floor(Math.random() * 40) + 60, // Random response rate 60-100%
+      views: Math.floor(Math.random() * 1000) + 100, // Random views 100-1100
+      interests: Math.floor(Math.random() * 50) + 10, // Random interests 10-60
+      bookmarks: Math.floor(Math.random() * 30) + 5, // Random bookmarks 5-35
+      totalRatings: startup.rating ? Math.floor(Math.random() * 200) + 50 : 0, // Random total ratings if rated
+      following: false // Will be updated based on user's follow status
+    }));
+
   const handleFollow = async (startupId: number) => {
     if (!currentUser) {
       toast({
@@ -854,10 +878,10 @@ export const StartupDiscoveryGrid: React.FC<StartupDiscoveryGridProps> = ({
       )}
 
       {/* Load More Button */}
-      {sortedStartups.length > 0 && sortedStartups.length >= 9 && (
+      {sortedStartups.length > 0 && nextCursor && (
         <div className="text-center">
-          <Button variant="outline" size="lg">
-            Load More Startups
+          <Button variant="outline" size="lg" onClick={loadMoreStartups} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load More Startups"}
           </Button>
         </div>
       )}
@@ -23,6 +23,14 @@ export interface Startup {
   followers: number;
 }
 
+export interface StartupPage {
+  startups: Startup[];
+  count: number;
+  total: number;
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 export interface StartupRating {
   id: number;
   rating: number;
@@ -156,8 +164,13 @@ export const authAPI = {
 
 // Startup API
 export const startupAPI = {
-  getAll: async (): Promise<Startup[]> => {
-    return await apiRequest('/startups');
+  getAll: async (cursor?: string | null, limit?: number): Promise<StartupPage> => {
+    const params = new URLSearchParams();
+    if (cursor) params.append('cursor', cursor);
+    if (limit) params.append('limit', limit.toString());
+    
+    const query = params.toString() ? `?${params.toString()}` : '';
+    return await apiRequest(`/startups${query}`);
   },
 
   getById: async (id: number): Promise<Startup> => {
@@ -234,7 +247,7 @@ export const matchingAPI = {
   },
 
   getMatchDetails: async (matchId: number): Promise<any> => {
-    return await apiRequest(`/matches/${matchId}`);
+    return await apiRequest(`/matches/${matchId}/details`);
   },
 
   updateMatchInterest: async (matchId: number, interest: 'interested' | 'not_interested' | 'pending'): Promise<any> => {